@@ -0,0 +1,220 @@
+from argparse import ArgumentParser
+from collections import Counter
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from mastermind_codes import get_geometry
+from mastermind_log import read_games, player_kind_name
+
+
+OPENING_LENGTH = 2
+OPENINGS_CAPACITY = 1000
+TOP = 10
+
+
+class HeavyHitters:
+    """
+    Class HeavyHitters. Bounded approximate counter of the most frequent items (Misra-Gries summary).
+    Contains atributes:
+    :param capacity: amount of items kept after pruning
+    :type capacity: int
+
+    Every item seen more than total / (capacity + 1) times is kept and its count is
+    underestimated by at most that much. Summaries of different streams can be merged
+    """
+    def __init__(self, capacity=OPENINGS_CAPACITY):
+        self.capacity = capacity
+        self.counts = Counter()
+
+    def add(self, item, count=1):
+        self.counts[item] += count
+        if len(self.counts) > 2 * self.capacity:
+            self._prune()
+
+    def merge(self, other):
+        """
+        Adds other summary to this one
+        """
+        self.counts.update(other.counts)
+        if len(self.counts) > self.capacity:
+            self._prune()
+        return self
+
+    def _prune(self):
+        """
+        Subtracts count of the (capacity + 1)-th most frequent item from every item and forgets items left at zero
+        """
+        threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = Counter({item: count - threshold for item, count in self.counts.items() if count > threshold})
+
+    def most_common(self, amount=TOP):
+        return self.counts.most_common(amount)
+
+
+@dataclass
+class LogStats:
+    """
+    Class LogStats. Aggregated statistics of recorded games. Contains atributes:
+    :param games: amount of games
+    :type games: int
+    :param turns: amount of finished codebreaking sequences
+    :type turns: int
+    :param guesses: distribution of amounts of guesses needed to solve a code, by codebreaker's class
+    :type guesses: dict of Counter
+    :param unsolved: amount of codes not solved within the board, by codebreaker's class
+    :type unsolved: Counter
+    :param points: distribution of points given to codemakers
+    :type points: Counter
+    :param secret_turns: amount of turns played with every secret, by (row length, amount of colors, code)
+    :type secret_turns: Counter
+    :param secret_cost: sum of rows needed to solve every secret (rows + 1 if unsolved), keyed as secret_turns
+    :type secret_cost: Counter
+    :param openings: most common sequences of first OPENING_LENGTH guesses,
+        by (row length, amount of colors, codes)
+    :type openings: HeavyHitters
+
+    Memory does not grow with the amount of games: distributions are bounded by the board,
+    secrets by the code space and openings by OPENINGS_CAPACITY
+    """
+    games: int = 0
+    turns: int = 0
+    guesses: dict = field(default_factory=dict)
+    unsolved: Counter = field(default_factory=Counter)
+    points: Counter = field(default_factory=Counter)
+    secret_turns: Counter = field(default_factory=Counter)
+    secret_cost: Counter = field(default_factory=Counter)
+    openings: HeavyHitters = field(default_factory=HeavyHitters)
+
+    def add_game(self, game_log):
+        """
+        Adds statistics of one GameLog
+        """
+        self.games += 1
+        geometry = game_log.geometry
+        for turn in game_log.turns:
+            if turn.codemaker is None or turn.code is None:
+                continue
+            self.turns += 1
+            codebreaker = player_kind_name(turn.kinds[turn.codebreaker])
+            solved = bool(turn.feedbacks) and turn.feedbacks[-1] == geometry.solved
+            if solved:
+                self.guesses.setdefault(codebreaker, Counter())[len(turn.guesses)] += 1
+                cost = len(turn.guesses)
+            else:
+                self.unsolved[codebreaker] += 1
+                cost = game_log.amount_of_rows + 1
+            self.points[turn.points] += 1
+            secret = (*geometry.key, turn.code)
+            self.secret_turns[secret] += 1
+            self.secret_cost[secret] += cost
+            if len(turn.guesses) >= OPENING_LENGTH:
+                self.openings.add((*geometry.key, tuple(turn.guesses[:OPENING_LENGTH])))
+        return self
+
+    def merge(self, other):
+        """
+        Adds other statistics to these ones
+        """
+        self.games += other.games
+        self.turns += other.turns
+        for codebreaker, distribution in other.guesses.items():
+            self.guesses.setdefault(codebreaker, Counter()).update(distribution)
+        self.unsolved.update(other.unsolved)
+        self.points.update(other.points)
+        self.secret_turns.update(other.secret_turns)
+        self.secret_cost.update(other.secret_cost)
+        self.openings.merge(other.openings)
+        return self
+
+    def average_guesses(self, codebreaker):
+        """
+        Returns average amount of guesses needed by codebreaker's class to solve a code (None if it solved none)
+        """
+        distribution = self.guesses.get(codebreaker)
+        if not distribution:
+            return None
+        return sum(guesses * count for guesses, count in distribution.items()) / sum(distribution.values())
+
+    def hardest_secrets(self, amount=TOP):
+        """
+        Returns list of (geometry, colors, average cost, turns) of secrets which cost the most rows on average
+        """
+        average = {secret: self.secret_cost[secret] / turns for secret, turns in self.secret_turns.items()}
+        hardest = sorted(average, key=lambda secret: (-average[secret], -self.secret_turns[secret], secret))
+        result = []
+        for row_length, amount_of_colors, code in hardest[:amount]:
+            geometry = get_geometry(row_length, amount_of_colors)
+            secret = (row_length, amount_of_colors, code)
+            result.append((geometry, geometry.code_to_colors(code), average[secret], self.secret_turns[secret]))
+        return result
+
+    def common_openings(self, amount=TOP):
+        """
+        Returns list of (geometry, list of guesses' colors, approximate count) of the most common openings
+        """
+        result = []
+        for (row_length, amount_of_colors, codes), count in self.openings.most_common(amount):
+            geometry = get_geometry(row_length, amount_of_colors)
+            result.append((geometry, [geometry.code_to_colors(code) for code in codes], count))
+        return result
+
+
+def analyze_log(path):
+    """
+    Returns LogStats of every game of a log, read in one streaming pass
+    """
+    stats = LogStats()
+    for game_log in read_games(path):
+        stats.add_game(game_log)
+    return stats
+
+
+def analyze_logs(paths, processes=None):
+    """
+    Analyzes logs in worker processes (one log per task) and returns merged LogStats
+    """
+    result = LogStats()
+    if processes == 1 or len(paths) <= 1:
+        for path in paths:
+            result.merge(analyze_log(path))
+        return result
+    with Pool(processes) as pool:
+        for stats in pool.imap_unordered(analyze_log, paths):
+            result.merge(stats)
+    return result
+
+
+def format_report(stats, amount=TOP):
+    """
+    Returns text report of statistics
+    """
+    lines = [f'Games: {stats.games}, turns: {stats.turns}', '', 'Guesses to solve:']
+    for codebreaker in sorted(set(stats.guesses) | set(stats.unsolved)):
+        distribution = stats.guesses.get(codebreaker, Counter())
+        average = stats.average_guesses(codebreaker)
+        average = '-' if average is None else f'{average:.3f}'
+        histogram = ' '.join(f'{guesses}:{count}' for guesses, count in sorted(distribution.items()))
+        lines.append(f'  {codebreaker:10} avg {average:>7} unsolved {stats.unsolved[codebreaker]:<6} {histogram}')
+    lines.append('')
+    lines.append('Points per turn: ' + ' '.join(f'{points}:{count}' for points, count in sorted(stats.points.items())))
+    lines.append('')
+    lines.append('Hardest secrets:')
+    for geometry, colors, average, turns in stats.hardest_secrets(amount):
+        lines.append(f'  {geometry!r} {",".join(colors):40} avg {average:.2f} in {turns} turns')
+    lines.append('')
+    lines.append('Most common openings:')
+    for geometry, guesses, count in stats.common_openings(amount):
+        lines.append(f'  {geometry!r} {" / ".join(",".join(colors) for colors in guesses):60} {count}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = ArgumentParser(description='Computes statistics of recorded games')
+    parser.add_argument('paths', nargs='+', help='game logs')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--top', type=int, default=TOP, help='amount of listed secrets and openings')
+    arguments = parser.parse_args()
+    print(format_report(analyze_logs(arguments.paths, arguments.processes), arguments.top))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import random
+import sys
+from collections import deque
+from mastermind_classes import (
+    Game,
+    Player,
+    InvalidPegColorError,
+    InvalidAmountOfPegsError,
+    InvalidRoundsError,
+    InvalidGeometryError,
+    get_geometry
+)
+from mastermind_interface import InvalidGamemodeNumberError, select_gamemode
+
+
+class InvalidScriptError(Exception):
+    def __init__(self, message):
+        super().__init__(f'Invalid script: {message}')
+
+
+class ScriptedGame:
+    """
+    Class ScriptedGame. One game of a script. Contains atributes:
+    :param index: number of the game in the script (counted from 1)
+    :type index: int
+    :param header: words of the GAME line (gamemode, rounds, optional row length and amount of colors)
+    :type header: list
+    :param moves: colors of every code and guess players make, in order of play
+    :type moves: deque of lists
+    """
+    def __init__(self, index, header):
+        self.index = index
+        self.header = header
+        self.moves = deque()
+
+    def create_game(self):
+        """
+        Creates game described by the header
+        """
+        if len(self.header) not in (2, 4):
+            raise InvalidScriptError('GAME <gamemode 1-3> <rounds> [<row length> <amount of colors>]')
+        try:
+            gamemode = select_gamemode(int(self.header[0]))
+            rounds = int(self.header[1])
+            geometry = get_geometry(*map(int, self.header[2:4]))
+        except ValueError:
+            raise InvalidScriptError('gamemode, rounds and geometry have to be numbers')
+        return Game(gamemode, rounds, geometry=geometry)
+
+    def next_move(self, player):
+        if not self.moves:
+            raise InvalidScriptError(f'no colors left for {player}')
+        return self.moves.popleft()
+
+
+def read_script(lines):
+    """
+    Yields ScriptedGame for every game of a script. Every game starts with a line
+    'GAME <gamemode 1-3> <rounds> [<row length> <amount of colors>]', followed by a line of colors
+    (separated by spaces or commas) for every code and guess of a human player, in order of play.
+    Bots make their moves themselves. Empty lines and lines starting with '#' are skipped
+    """
+    scripted = None
+    for line in lines:
+        words = line.replace(',', ' ').split()
+        if not words or words[0].startswith('#'):
+            continue
+        if words[0].upper() == 'GAME':
+            if scripted is not None:
+                yield scripted
+            scripted = ScriptedGame(scripted.index + 1 if scripted is not None else 1, words[1:])
+        elif scripted is None:
+            raise InvalidScriptError('colors before the first GAME line')
+        else:
+            scripted.moves.append(words)
+    if scripted is not None:
+        yield scripted
+
+
+def play_scripted(scripted, seed=None):
+    """
+    Plays one scripted game without any prompts, clearing or waiting. Returns its result line:
+    '<game> <player 1 points> <player 2 points> <winner 1|2|TIE> <codemaker's points of every turn>'
+    or '<game> ERR <message>' if the script does not describe a valid game
+    """
+    if seed is not None:
+        random.seed(f'{seed}-{scripted.index}')
+    try:
+        game = scripted.create_game()
+
+        def get_code(player):
+            if type(player) == Player:
+                return player.code_pegs_colors(scripted.next_move(player))
+            return player.code_pegs_colors()
+
+        def get_guess(player):
+            if type(player) == Player:
+                return player.guess_pegs_colors(scripted.next_move(player))
+            return player.guess_pegs_colors()
+
+        result = game.play(get_code, get_guess)
+        if scripted.moves:
+            raise InvalidScriptError(f'{len(scripted.moves)} colors lines left after the game')
+    except (
+        InvalidScriptError,
+        InvalidGamemodeNumberError,
+        InvalidRoundsError,
+        InvalidGeometryError,
+        InvalidPegColorError,
+        InvalidAmountOfPegsError
+    ) as error:
+        return f'{scripted.index} ERR {error}'
+    player1, player2 = game.players_list
+    winner = 'TIE' if result.winner is None else game.players_list.index(result.winner) + 1
+    turns = ','.join(str(turn.points) for turn in result.turns)
+    return f'{scripted.index} {player1.points} {player2.points} {winner} {turns}'
+
+
+def play_script(lines, output=None, seed=None):
+    """
+    Plays every game of a script and writes one result line per game to output
+    (standard output by default). Returns amount of games which could not be played
+    """
+    output = sys.stdout if output is None else output
+    errors = 0
+    for scripted in read_script(lines):
+        line = play_scripted(scripted, seed)
+        if line.startswith(f'{scripted.index} ERR '):
+            errors += 1
+        output.write(line + '\n')
+    output.flush()
+    return errors
@@ -0,0 +1,260 @@
+import json
+import platform
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from mastermind_classes import Game, Gamemode, Row, Player, BotSmart
+from mastermind_codes import STANDARD, get_geometry, score_pairs
+from mastermind_solver import CandidateSet, SolverCache
+
+
+SEED = 2023
+MIN_DURATION = 0.3
+REPEATS = 3
+THRESHOLD = 0.1
+BENCHMARKS = []
+
+
+def benchmark(name, unit, higher_is_better=True, quick=True):
+    """
+    Registers function as a benchmark. The function gets a seeded random.Random and returns
+    (callable, amount of operations one call performs)
+    """
+    def register(function):
+        BENCHMARKS.append((name, unit, higher_is_better, quick, function))
+        return function
+    return register
+
+
+def measure(function, operations, min_duration=MIN_DURATION, repeats=REPEATS):
+    """
+    Returns the best (lowest) time of one operation of function in seconds
+    """
+    best = None
+    for _ in range(repeats):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            function()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_duration:
+                break
+        per_operation = elapsed / (calls * operations)
+        best = per_operation if best is None else min(best, per_operation)
+    return best
+
+
+def _random_colors(generator, geometry=STANDARD):
+    return geometry.code_to_colors(generator.randrange(geometry.codes_count))
+
+
+@benchmark('row_compare_pegs', 'scores/s')
+def _compare_pegs(generator):
+    pairs = [(Row(_random_colors(generator)), Row(_random_colors(generator))) for _ in range(256)]
+
+    def run():
+        for row, other_row in pairs:
+            row._compare_pegs(other_row)
+    return run, len(pairs)
+
+
+@benchmark('row_set_pegs', 'rows/s')
+def _set_pegs(generator):
+    codes = [_random_colors(generator) for _ in range(256)]
+    row = Row()
+
+    def run():
+        for colors in codes:
+            row.set_pegs(colors)
+    return run, len(codes)
+
+
+def _candidate_scoring(geometry):
+    def create(generator):
+        batch = geometry.batch(range(geometry.codes_count))
+        guesses = [generator.randrange(geometry.codes_count) for _ in range(8)]
+
+        def run():
+            for guess in guesses:
+                batch.score(guess)
+        return run, len(guesses) * geometry.codes_count
+    return create
+
+
+def _candidate_narrowing(geometry):
+    def create(generator):
+        secret = generator.randrange(geometry.codes_count)
+        guess = generator.randrange(geometry.codes_count)
+        candidates = CandidateSet(geometry)
+
+        def run():
+            candidates.reset()
+            candidates.narrow(guess, geometry.feedback(secret, guess))
+        return run, geometry.codes_count
+    return create
+
+
+def _pair_scoring(geometry):
+    def create(generator):
+        guesses = [generator.randrange(geometry.codes_count) for _ in range(4096)]
+        codes = [generator.randrange(geometry.codes_count) for _ in range(4096)]
+
+        def run():
+            score_pairs(guesses, codes, geometry)
+        return run, len(codes)
+    return create
+
+
+for _geometry, _quick in [(STANDARD, True), (get_geometry(5, 8), True), (get_geometry(6, 9), False)]:
+    _shape = f'{_geometry.row_length}x{len(_geometry.colors)}'
+    benchmark(f'candidate_scoring_{_shape}', 'scores/s', quick=_quick)(_candidate_scoring(_geometry))
+    benchmark(f'candidate_narrowing_{_shape}', 'codes/s', quick=_quick)(_candidate_narrowing(_geometry))
+    benchmark(f'pair_scoring_{_shape}', 'scores/s', quick=_quick)(_pair_scoring(_geometry))
+
+
+def _bot_guess_latency(turn):
+    def create(generator):
+        bots = []
+        for _ in range(16):
+            game = Game(Gamemode.PVE_SMART, 1)
+            bot = BotSmart('Bot Smart', game, cache=SolverCache(capacity=0))
+            game.players_list[1] = bot
+            game.coded_row.set_pegs(_random_colors(generator))
+            for row in game.rows_list[:turn - 1]:
+                row.set_pegs(bot.guess_pegs_colors())
+                row.compare_pegs(game.coded_row)
+            if not any(game.is_guessed(row) for row in game.rows_list):
+                bots.append(bot)
+
+        def run():
+            for bot in bots:
+                bot.guess_pegs_colors()
+        return run, len(bots)
+    return create
+
+
+for _turn in range(1, 5):
+    benchmark(f'bot_smart_guess_turn_{_turn}', 's', higher_is_better=False)(_bot_guess_latency(_turn))
+
+
+def _human_sources(generator):
+    """
+    Returns get_code and get_guess giving random colors in place of human input
+    """
+    def colors(player):
+        return _random_colors(generator)
+
+    def code(player):
+        return colors(player) if type(player) == Player else player.code_pegs_colors()
+
+    def guess(player):
+        return colors(player) if type(player) == Player else player.guess_pegs_colors()
+    return code, guess
+
+
+def _games(gamemode):
+    def create(generator):
+        game = Game(gamemode, 1)
+        get_code, get_guess = _human_sources(generator)
+
+        def run():
+            for player in game.players_list:
+                player.points = 0
+            game.play(get_code, get_guess)
+        return run, 1
+    return create
+
+
+for _gamemode in Gamemode:
+    benchmark(f'games_{_gamemode.name.lower()}', 'games/s')(_games(_gamemode))
+
+
+def run_benchmarks(quick=False, names=None, min_duration=MIN_DURATION, repeats=REPEATS):
+    """
+    Runs registered benchmarks (every one with its own fixed seed) and returns results dictionary
+    """
+    results = {}
+    for name, unit, higher_is_better, is_quick, create in BENCHMARKS:
+        if quick and not is_quick or names and name not in names:
+            continue
+        generator = random.Random(f'{SEED}-{name}')
+        random.seed(f'{SEED}-{name}')
+        function, operations = create(generator)
+        per_operation = measure(function, operations, min_duration, repeats)
+        value = 1 / per_operation if higher_is_better else per_operation
+        results[name] = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """
+    Compares two results dictionaries. Returns list of (name, baseline value, current value, change, is_regression),
+    change is relative (positive means better)
+    """
+    comparison = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        old = baseline['results'][name]['value']
+        new = result['value']
+        change = (new - old) / old if result['higher_is_better'] else (old - new) / old
+        comparison.append((name, old, new, change, change < -threshold))
+    return comparison
+
+
+def format_results(results):
+    """
+    Returns text table of results
+    """
+    lines = []
+    for name, result in results['results'].items():
+        if result['unit'] == 's':
+            lines.append(f'{name:32} {result["value"] * 1000:12.3f} ms')
+        else:
+            lines.append(f'{name:32} {result["value"]:12.0f} {result["unit"]}')
+    return '\n'.join(lines)
+
+
+def format_comparison(comparison):
+    """
+    Returns text table of comparison, regressions are flagged
+    """
+    lines = []
+    for name, old, new, change, is_regression in comparison:
+        flag = '  REGRESSION' if is_regression else ''
+        lines.append(f'{name:32} {old:14.6g} -> {new:14.6g} {change:+8.1%}{flag}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = ArgumentParser(description='Benchmarks scoring, guessing and full game throughput')
+    parser.add_argument('--quick', action='store_true', help='skip benchmarks of the biggest geometries')
+    parser.add_argument('--only', nargs='*', help='names of benchmarks to run')
+    parser.add_argument('--save', help='save results as JSON baseline')
+    parser.add_argument('--compare', help='compare results with JSON baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='relative slowdown flagged as regression')
+    parser.add_argument('--duration', type=float, default=MIN_DURATION, help='minimal duration of one repeat')
+    arguments = parser.parse_args()
+    results = run_benchmarks(arguments.quick, arguments.only, arguments.duration)
+    print(format_results(results))
+    if arguments.save:
+        with open(arguments.save, 'w') as file:
+            json.dump(results, file, indent=2)
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            baseline = json.load(file)
+        comparison = compare(baseline, results, arguments.threshold)
+        print('\nComparison with baseline:')
+        print(format_comparison(comparison))
+        if any(is_regression for *_, is_regression in comparison):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+from mastermind_codes import get_geometry
+from mastermind_solver import filter_candidates, minimax_guess
+
+
+BOOK_MAGIC = b'MMBOOK1\0'
+BOOK_HEADER = struct.Struct('<8sBBBxI')
+BOOK_DIRECTORY = os.environ.get('MASTERMIND_BOOK_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'books'))
+
+
+class InvalidBookError(Exception):
+    def __init__(self, path):
+        super().__init__(f'File {path} is not a valid opening book')
+
+
+def history_key(history):
+    """
+    Returns 64-bit key of a sequence of (guess, feedback) pairs
+    """
+    packed = b''.join(struct.pack('<IB', guess, guess_feedback) for guess, guess_feedback in history)
+    return int.from_bytes(blake2b(packed, digest_size=8).digest(), 'little')
+
+
+def book_path(geometry, directory=None):
+    """
+    Returns default path of the opening book of given geometry
+    """
+    directory = BOOK_DIRECTORY if directory is None else directory
+    return os.path.join(directory, f'book_{geometry.row_length}x{len(geometry.colors)}.bin')
+
+
+def _book_entries(geometry, depth):
+    """
+    Yields (history, guess) pairs of minimax decisions for every history shorter than depth
+    """
+    stack = [([], range(geometry.codes_count))]
+    while stack:
+        history, candidates = stack.pop()
+        guess = minimax_guess(candidates, geometry=geometry)
+        yield history, guess
+        if len(history) + 1 >= depth or len(candidates) == 1:
+            continue
+        for guess_feedback in geometry.feedbacks():
+            if guess_feedback == geometry.solved:
+                continue
+            narrowed = filter_candidates(candidates, guess, guess_feedback, geometry)
+            if len(narrowed) > 0:
+                stack.append((history + [(guess, guess_feedback)], narrowed))
+
+
+def build_book(geometry, path, depth=3):
+    """
+    Computes minimax guesses for the first depth moves of every game and saves them to a book file.
+    Returns amount of saved positions
+    """
+    entries = sorted((history_key(history), guess) for history, guess in _book_entries(geometry, depth))
+    keys = array('Q', (key for key, _ in entries))
+    guesses = array('I', (guess for _, guess in entries))
+    if sys.byteorder == 'big':
+        keys.byteswap()
+        guesses.byteswap()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(BOOK_HEADER.pack(BOOK_MAGIC, geometry.row_length, len(geometry.colors), depth, len(entries)))
+        file.write(keys.tobytes())
+        file.write(guesses.tobytes())
+    return len(entries)
+
+
+class OpeningBook:
+    """
+    Class OpeningBook. Read-only, memory-mapped table of guesses keyed by game history. Contains atributes:
+    :param path: path of the book file
+    :type path: string
+    :param geometry: geometry the book was built for
+    :type geometry: Geometry
+    :param depth: amount of moves the book covers
+    :type depth: int
+
+    The file is opened and mapped on first lookup
+    """
+    _defaults = {}
+
+    def __init__(self, path):
+        self.path = path
+        self._keys = None
+        self._guesses = None
+        self._geometry = None
+        self._depth = None
+
+    @classmethod
+    def default(cls, geometry):
+        """
+        Returns shared book of given geometry from BOOK_DIRECTORY (None if it was not built)
+        """
+        if geometry not in cls._defaults:
+            path = book_path(geometry)
+            cls._defaults[geometry] = cls(path) if os.path.exists(path) else None
+        return cls._defaults[geometry]
+
+    @property
+    def geometry(self):
+        self._load()
+        return self._geometry
+
+    @property
+    def depth(self):
+        self._load()
+        return self._depth
+
+    def __len__(self):
+        self._load()
+        return len(self._keys)
+
+    def _load(self):
+        """
+        Maps the book file into memory (only once). Keys are assigned last, as they mark the book loaded
+        """
+        if self._keys is not None:
+            return
+        with open(self.path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < BOOK_HEADER.size:
+            raise InvalidBookError(self.path)
+        magic, row_length, amount_of_colors, depth, count = BOOK_HEADER.unpack_from(mapped)
+        if magic != BOOK_MAGIC or len(mapped) != BOOK_HEADER.size + count * 12 or sys.byteorder == 'big':
+            raise InvalidBookError(self.path)
+        view = memoryview(mapped)
+        keys_end = BOOK_HEADER.size + count * 8
+        self._guesses = view[keys_end:].cast('I')
+        self._geometry = get_geometry(row_length, amount_of_colors)
+        self._depth = depth
+        self._keys = view[BOOK_HEADER.size:keys_end].cast('Q')
+
+    def guess(self, history):
+        """
+        Returns guess stored for given sequence of (guess, feedback) pairs (None if there is none)
+        """
+        self._load()
+        if len(history) >= self._depth:
+            return None
+        key = history_key(history)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._guesses[index]
+        return None
+
+
+def main():
+    from argparse import ArgumentParser
+    parser = ArgumentParser(description='Builds opening book of minimax guesses')
+    parser.add_argument('row_length', type=int, nargs='?', default=4)
+    parser.add_argument('amount_of_colors', type=int, nargs='?', default=4)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--output', default=None)
+    arguments = parser.parse_args()
+    geometry = get_geometry(arguments.row_length, arguments.amount_of_colors)
+    path = arguments.output or book_path(geometry)
+    count = build_book(geometry, path, arguments.depth)
+    print(f'Saved {count} positions to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,27 @@
-from colorama import Back
 import random
-from strenum import StrEnum
-from enum import Enum, auto
-
-
-ROW_LENGTH = 4
-
-
-def test_pegs_colors(colors):
+from enum import Enum, IntEnum, auto
+from functools import lru_cache
+from mastermind_codes import STANDARD, ROW_LENGTH
+from mastermind_codes import (  # noqa: F401 (re-exported for users of mastermind_classes)
+    ALL_COLORS,
+    InvalidGeometryError,
+    get_geometry,
+    score_guess,
+    score_pairs
+)
+from mastermind_solver import CandidateSet, SOLVER_CACHE, minimax_guess, entropy_guess, history_key
+from mastermind_metrics import METRICS
+
+
+def test_pegs_colors(colors, geometry=STANDARD):
     """
     Tests if given list of colors is correct
     """
     colors = [color.upper() for color in colors]
-    available_colors = ['RED', 'GREEN', 'YELLOW', 'BLUE']
-    if len(colors) != ROW_LENGTH:
-        raise InvalidAmountOfPegsError
-    if not all(color in available_colors for color in colors):
-        raise InvalidPegColorError
+    if len(colors) != geometry.row_length:
+        raise InvalidAmountOfPegsError(geometry.row_length)
+    if not all(color in geometry.color_indexes for color in colors):
+        raise InvalidPegColorError(geometry.colors)
 
 
 class InvalidGamemodeError(Exception):
@@ -25,8 +30,11 @@ class InvalidGamemodeError(Exception):
 
 
 class InvalidPegColorError(Exception):
-    def __init__(self):
-        super().__init__('Invalid peg color. Color has to be either Red, Green, Yellow or Blue')
+    def __init__(self, colors=None):
+        if colors is None or colors == STANDARD.colors:
+            super().__init__('Invalid peg color. Color has to be either Red, Green, Yellow or Blue')
+        else:
+            super().__init__(f'Invalid peg color. Color has to be one of: {", ".join(colors).title()}')
 
 
 class InvalidKeyPegColorError(Exception):
@@ -35,8 +43,8 @@ class InvalidKeyPegColorError(Exception):
 
 
 class InvalidPegIndexError(Exception):
-    def __init__(self):
-        super().__init__(f'Invalid peg index. Index has to be either in range 1 - {ROW_LENGTH}')
+    def __init__(self, row_length=ROW_LENGTH):
+        super().__init__(f'Invalid peg index. Index has to be either in range 1 - {row_length}')
 
 
 class InvalidRoundsError(Exception):
@@ -45,18 +53,70 @@ class InvalidRoundsError(Exception):
 
 
 class InvalidAmountOfPegsError(Exception):
+    def __init__(self, row_length=ROW_LENGTH):
+        super().__init__(f'There are {row_length} pegs in total')
+
+
+class IncorrectPlayerError(Exception):
     def __init__(self):
-        super().__init__(f'There are {ROW_LENGTH} pegs in total')
+        super().__init__('Chosen player does not take part in the game')
+
+
+class InvalidTurnStateError(Exception):
+    def __init__(self, state):
+        super().__init__(f'This move is not allowed when the turn is in state {state.name}')
+
+
+class Peg(IntEnum):
+    """
+    Colors of pegs and key pegs as small ints (values stored in board's buffer), BLACK is an empty peg
+    """
+    BLACK = 0
+    RED = 1
+    GREEN = 2
+    YELLOW = 3
+    BLUE = 4
+    MAGENTA = 5
+    ORANGE = 6
+    LIME = 7
+    GOLD = 8
+    SKY = 9
+    PINK = 10
+    WHITE = 11
+    CYAN = 12
+
 
+_PEGS = tuple(Peg)
 
-class Peg(StrEnum):
-    RED = f'{Back.RED} {Back.RESET}'
-    GREEN = f'{Back.GREEN} {Back.RESET}'
-    BLUE = f'{Back.BLUE} {Back.RESET}'
-    YELLOW = f'{Back.YELLOW} {Back.RESET}'
-    WHITE = f'{Back.WHITE} {Back.RESET}'
-    CYAN = f'{Back.CYAN} {Back.RESET}'
-    BLACK = ' '
+
+_PEG_NAMES = tuple(peg.name for peg in _PEGS)
+
+
+_COLOR_VALUES = {color: value for value, color in enumerate(_PEG_NAMES)}
+
+
+_KEY_VALUES = {color: _COLOR_VALUES[color] for color in ['WHITE', 'CYAN', 'BLACK']}
+
+
+_EMPTY = _COLOR_VALUES['BLACK']
+_WHITE = _COLOR_VALUES['WHITE']
+_CYAN = _COLOR_VALUES['CYAN']
+
+
+@lru_cache(maxsize=None)
+def _geometry_color_values(geometry):
+    """
+    Returns dictionary of peg values of colors available in geometry
+    """
+    return {color: _COLOR_VALUES[color] for color in geometry.colors}
+
+
+@lru_cache(maxsize=None)
+def _feedback_key_values(geometry, feedback):
+    """
+    Returns bytes of key peg values corresponding to packed feedback
+    """
+    return bytes(map(_COLOR_VALUES.__getitem__, geometry.feedback_to_key_colors(feedback)))
 
 
 class Gamemode(Enum):
@@ -65,6 +125,26 @@ class Gamemode(Enum):
     PVE_SMART = auto()
 
 
+class Strategy(Enum):
+    SIMPLE = auto()
+    MINIMAX = auto()
+    TREE = auto()
+    ENTROPY = auto()
+
+
+class TurnState(Enum):
+    CODE = auto()
+    GUESS = auto()
+    TURN_OVER = auto()
+    ROUND_OVER = auto()
+    GAME_OVER = auto()
+
+
+class Codemaker(Enum):
+    RANDOM = auto()
+    ADVERSARIAL = auto()
+
+
 class Player():
     """
     Class Player. Contains atributes:
@@ -72,10 +152,13 @@ class Player():
     :type points: int
     :param name: player's name
     :type name: string
+    :param geometry: geometry of the board player plays on
+    :type geometry: Geometry
     """
-    def __init__(self, name):
+    def __init__(self, name, geometry=STANDARD):
         self.points = 0
         self._name = name
+        self._geometry = geometry
 
     def __str__(self):
         return self._name
@@ -85,7 +168,7 @@ class Player():
         Creates list of colors based on given input string (as guess)
         """
         colors = input
-        test_pegs_colors(colors)
+        test_pegs_colors(colors, self._geometry)
         return colors
 
     def code_pegs_colors(self, input=None):
@@ -101,18 +184,14 @@ class Bot(Player):
         """
         Chooses color code (randomly)
         """
-        available_colors = ['RED', 'GREEN', 'YELLOW', 'BLUE']
-        colors = []
-        for _ in range(ROW_LENGTH):
-            colors.append(random.choice(available_colors))
-        return colors
+        return self._geometry.code_to_colors(random.randrange(self._geometry.codes_count))
 
     def guess_pegs_colors(self, input=None):
         """
         Creates list of random colors (as a guess)
         """
         colors = self._create_random_peg_colors()
-        test_pegs_colors(colors)
+        test_pegs_colors(colors, self._geometry)
         return colors
 
     def code_pegs_colors(self, input=None):
@@ -120,7 +199,7 @@ class Bot(Player):
         Creates list of random colors (as coding)
         """
         colors = self._create_random_peg_colors()
-        test_pegs_colors(colors)
+        test_pegs_colors(colors, self._geometry)
         return colors
 
 
@@ -133,26 +212,188 @@ class BotSmart(Bot):
     :type name: string
     :param game: game in which BotSmart is participating
     :type game: Game
+    :param strategy: algorithm used for guessing
+    :type strategy: Strategy
+    :param book: opening book consulted before minimax search (default book of game's geometry if None)
+    :type book: OpeningBook
+    :param tree: strategy tree walked with Strategy.TREE (default tree of game's geometry if None)
+    :type tree: StrategyTree
+    :param budget: time in seconds one guess of Strategy.ENTROPY may take (no limit if None)
+    :type budget: float
+    :param scorer: pool of processes scoring guesses of Strategy.ENTROPY (scored in this process if None)
+    :type scorer: GuessScorer
+    :param codemaker: how secrets are chosen
+    :type codemaker: Codemaker
+    :param hardness: index of secrets' hardness consulted with Codemaker.ADVERSARIAL
+        (default index of opponent's strategy if None)
+    :type hardness: HardnessIndex
+    :param cache: cache of guesses of Strategy.MINIMAX and Strategy.ENTROPY (without budget),
+        shared by bots with the same strategy and book (process-wide SOLVER_CACHE if None)
+    :type cache: SolverCache
     """
-    def __init__(self, name, game):
-        super().__init__(name)
+    def __init__(
+        self, name, game, strategy=Strategy.MINIMAX, book=None, tree=None, budget=None, scorer=None,
+        codemaker=Codemaker.RANDOM, hardness=None, cache=None
+    ):
+        super().__init__(name, game.geometry)
         self._game = game
+        self._strategy = strategy
+        self._book = book
+        self._tree = tree
+        self._budget = budget
+        self._scorer = scorer
+        self._codemaker = codemaker
+        self._hardness = hardness
+        self._cache = cache if cache is not None else SOLVER_CACHE
+        self._tree_node = None
+        self._tree_turn = None
+
+    @property
+    def strategy(self):
+        return self._strategy
+
+    @property
+    def codemaker(self):
+        return self._codemaker
+
+    def code_pegs_colors(self, input=None):
+        """
+        Creates list of colors (as coding). Adversarial bot picks one of the codes
+        the opponent's strategy needs the most guesses for, random code otherwise
+        """
+        if self.codemaker == Codemaker.ADVERSARIAL:
+            index = self._hardness_index()
+            if index is not None and index.geometry == self._geometry:
+                colors = self._geometry.code_to_colors(index.choose())
+                test_pegs_colors(colors, self._geometry)
+                return colors
+        return super().code_pegs_colors(input)
+
+    def _hardness_index(self):
+        """
+        Returns hardness index of the opponent's strategy (minimax for players and plain bots)
+        """
+        if self._hardness is not None:
+            return self._hardness
+        opponents = [player for player in self._game.players_list if player is not self]
+        strategy = Strategy.MINIMAX
+        if opponents and isinstance(opponents[0], BotSmart):
+            strategy = opponents[0].strategy
+        if strategy == Strategy.SIMPLE:
+            return None
+        from mastermind_hardness import HardnessIndex
+        return HardnessIndex.default(self._geometry, strategy.name.lower())
 
     def guess_pegs_colors(self, input=None):
         """
-        Chooses color code (with algorithm)
+        Chooses color code (with algorithm chosen by bot's strategy)
+        """
+        if self.strategy == Strategy.MINIMAX:
+            colors = self._geometry.code_to_colors(self._cached_guess(self._minimax_guess))
+        elif self.strategy == Strategy.TREE:
+            colors = self._geometry.code_to_colors(self._tree_guess())
+        elif self.strategy == Strategy.ENTROPY:
+            if self._budget is None:
+                guess = self._cached_guess(self._entropy_guess)
+            else:
+                guess = self._entropy_guess()
+            colors = self._geometry.code_to_colors(guess)
+        else:
+            colors = self._simple_guess()
+        test_pegs_colors(colors, self._geometry)
+        return colors
+
+    def _cached_guess(self, search):
+        """
+        Returns guess remembered for the board's history, otherwise the one found by search.
+        Guesses are remembered for canonical histories, so symmetric boards share them.
+        Bots with their own book remember guesses apart from the ones using the default book
+        """
+        from mastermind_symmetry import canonicalize
+        history, transform = canonicalize(self._game.candidates.history, self._geometry)
+        strategy = self.strategy.name if self._book is None else (self.strategy.name, self._book.path)
+        key = history_key(strategy, self._geometry, history)
+        return transform.invert(self._cache.guess(key, lambda: transform.apply(search())))
+
+    def _entropy_guess(self):
+        """
+        Chooses code leaving the least expected amount of codes, consistent with rows' key pegs
+        """
+        candidates = self._game.candidates.codes or range(self._geometry.codes_count)
+        return entropy_guess(
+            candidates, geometry=self._geometry, budget=self._budget, scorer=self._scorer,
+            history=self._game.candidates.history
+        )
+
+    def _minimax_guess(self):
+        """
+        Chooses code minimizing the worst case amount of codes left, consistent with rows' key pegs.
+        Opening book is consulted first
+        """
+        book = self._book
+        if book is None:
+            from mastermind_book import OpeningBook
+            book = OpeningBook.default(self._geometry)
+        if book is not None and book.geometry == self._geometry:
+            guess = book.guess(self._game.candidates.history)
+            if guess is not None:
+                return guess
+        candidates = self._game.candidates.codes or range(self._geometry.codes_count)
+        return minimax_guess(candidates, geometry=self._geometry, history=self._game.candidates.history)
+
+    def _tree_guess(self):
+        """
+        Follows strategy tree by the last row's key pegs (one lookup per guess).
+        Falls back to minimax search if there is no tree or the board left it
+        """
+        tree = self._tree
+        if tree is None:
+            from mastermind_tree import StrategyTree
+            tree = StrategyTree.default(self._geometry)
+        if tree is None or tree.geometry != self._geometry:
+            return self._minimax_guess()
+        rows = self._game.rows_list
+        turn = len(self._game.candidates.history)
+        node = self._tree_node
+        if turn == 0:
+            node = 0
+        elif self._tree_turn != turn - 1 or node is None or rows[turn - 1].code != tree.guess(node):
+            node = self._walk_tree(tree, rows[:turn])
+        else:
+            node = tree.child(node, rows[turn - 1].feedback)
+        self._tree_node = node
+        self._tree_turn = turn
+        if node is None:
+            return self._minimax_guess()
+        return tree.guess(node)
+
+    def _walk_tree(self, tree, rows):
+        """
+        Returns node of strategy tree reached by given compared rows (None if they left the tree)
+        """
+        node = 0
+        for row in rows:
+            if row.code != tree.guess(node):
+                return None
+            node = tree.child(node, row.feedback)
+            if node is None:
+                return None
+        return node
+
+    def _simple_guess(self):
         """
-        all_rows_colors = [row.colors for row in self._game.rows_list]
-        possible_colors = ['RED', 'GREEN', 'BLUE', 'YELLOW']
+        Tries every monochrome code, then variations of the coded row
+        """
+        all_rows_codes = {row.code for row in self._game.rows_list}
+        possible_colors = self._geometry.colors
         found = False
         for color in possible_colors:
-            colors = [color] * ROW_LENGTH
-            if colors not in all_rows_colors:
+            colors = [color] * self._geometry.row_length
+            if self._geometry.colors_to_code(colors) not in all_rows_codes:
                 found = True
                 break
         if not found:
-            colors = self.create_new_colors_variation(all_rows_colors)
-        test_pegs_colors(colors)
+            colors = self.create_new_colors_variation([row.colors for row in self._game.rows_list])
         return colors
 
     def create_new_colors_variation(self, rows_colors):
@@ -164,9 +405,76 @@ class BotSmart(Bot):
             random.shuffle(colors)
             if colors not in rows_colors:
                 break
+            if METRICS.enabled:
+                METRICS.count('shuffle_retries')
         return colors
 
 
+class _Result:
+    """
+    Base of result records: compares and prints them by their fields
+    """
+    __slots__ = ()
+    __hash__ = None
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class TurnResult(_Result):
+    """
+    Class TurnResult. Result of one codebreaking sequence. Contains atributes:
+    :param chosing_player: player who set the code (codemaker)
+    :type chosing_player: Player
+    :param guessing_player: player who tried to guess the code (codebreaker)
+    :type guessing_player: Player
+    :param code: colors of the coded row
+    :type code: list
+    :param guesses: colors of every guess, in order
+    :type guesses: list
+    :param key_colors: key pegs colors of every guess, in order
+    :type key_colors: list
+    :param points: points given to the codemaker
+    :type points: int
+    :param guessed: True if the code was guessed
+    :type guessed: bool
+    """
+    __slots__ = ('chosing_player', 'guessing_player', 'code', 'guesses', 'key_colors', 'points', 'guessed')
+
+    def __init__(self, chosing_player, guessing_player, code, guesses=None, key_colors=None, points=0, guessed=False):
+        self.chosing_player = chosing_player
+        self.guessing_player = guessing_player
+        self.code = code
+        self.guesses = [] if guesses is None else guesses
+        self.key_colors = [] if key_colors is None else key_colors
+        self.points = points
+        self.guessed = guessed
+
+
+class GameResult(_Result):
+    """
+    Class GameResult. Result of a whole game. Contains atributes:
+    :param turns: results of every turn, in order
+    :type turns: list of TurnResult
+    :param points: players' points after the game, by player's name
+    :type points: dict
+    :param winner: winning player (None if the game is tied)
+    :type winner: Player
+    """
+    __slots__ = ('turns', 'points', 'winner')
+
+    def __init__(self, turns, points, winner):
+        self.turns = turns
+        self.points = points
+        self.winner = winner
+
+
 class Row:
     """
     Class Row. Contains atributes:
@@ -175,155 +483,218 @@ class Row:
     :param key_pegs: colors of key_pegs
     :type pegs: list of Color objects
 
-    Takes a list of colors as an optional argument
+    Takes a list of colors, a game the row belongs to and board's geometry
+    (game's one by default) as optional arguments. Pegs and key pegs are stored as small
+    ints (0 is an empty peg) in a bytearray: row_length pegs followed by row_length key pegs
+    starting at offset. Rows of a game are views over the game's board buffer,
+    other rows get their own buffer
     """
-    def __init__(self, colors=None):
+    __slots__ = ('_game', '_geometry', '_buffer', '_offset', '_code', '_feedback')
+
+    def __init__(self, colors=None, game=None, geometry=None, buffer=None, offset=0):
+        self._game = game
+        if geometry is None:
+            geometry = game.geometry if game is not None else STANDARD
+        self._geometry = geometry
+        if buffer is None:
+            buffer = bytearray(2 * geometry.row_length)
+            offset = 0
+        self._buffer = buffer
+        self._offset = offset
         self.set_pegs(colors)
         self._set_key_pegs()
 
+    @property
+    def geometry(self):
+        return self._geometry
+
+    def _peg_values(self):
+        """
+        Returns copy of row's pegs values
+        """
+        return self._buffer[self._offset:self._offset + self._geometry.row_length]
+
+    def _key_peg_values(self):
+        """
+        Returns copy of row's key pegs values
+        """
+        start = self._offset + self._geometry.row_length
+        return self._buffer[start:start + self._geometry.row_length]
+
     @property
     def pegs(self):
         """
         Returns list of Pegs
         """
-        return self._pegs
+        return list(map(_PEGS.__getitem__, self._peg_values()))
 
     @property
     def colors(self):
         """
-        Returns list of color names corresponding to Pegs in self._pegs
+        Returns list of color names corresponding to row's pegs
         """
-        return list(map(self._peg_to_color, self._pegs))
+        return list(map(_PEG_NAMES.__getitem__, self._peg_values()))
+
+    @property
+    def code(self):
+        """
+        Returns row's color code packed into an integer (None if any peg is not set)
+        """
+        if self._code is None:
+            values = self._peg_values()
+            if _EMPTY not in values:
+                amount_of_colors = len(self._geometry.colors)
+                code = 0
+                for value in values:
+                    code = code * amount_of_colors + value - 1
+                self._code = code
+        return self._code
 
     @property
     def key_pegs(self):
         """
         Returns list of key Pegs
         """
-        return self._key_pegs
+        return list(map(_PEGS.__getitem__, self._key_peg_values()))
+
+    @property
+    def feedback(self):
+        """
+        Returns amounts of white and cyan key pegs packed into an integer
+        """
+        if self._feedback is None:
+            values = self._key_peg_values()
+            self._feedback = self._geometry.pack_feedback(values.count(_WHITE), values.count(_CYAN))
+        return self._feedback
 
     @property
     def key_colors(self):
         """
-        Returns list of color names corresponding key Pegs in self._key_pegs
+        Returns list of color names corresponding to row's key pegs
         """
-        return list(map(self._peg_to_color, self._key_pegs))
+        return list(map(_PEG_NAMES.__getitem__, self._key_peg_values()))
 
     def _color_to_peg(self, color):
         """
         Converts color name to Peg object
         """
-        converter = {
-            'BLACK': Peg.BLACK,
-            'WHITE': Peg.WHITE,
-            'RED': Peg.RED,
-            'GREEN': Peg.GREEN,
-            'BLUE': Peg.BLUE,
-            'YELLOW': Peg.YELLOW,
-            'CYAN': Peg.CYAN,
-        }
-        return converter[color]
+        return Peg[color]
 
     def _peg_to_color(self, peg):
         """
         Converts Peg object to color
         """
-        converter = {
-            Peg.BLACK: 'BLACK',
-            Peg.WHITE: 'WHITE',
-            Peg.RED: 'RED',
-            Peg.GREEN: 'GREEN',
-            Peg.BLUE: 'BLUE',
-            Peg.YELLOW: 'YELLOW',
-            Peg.CYAN: 'CYAN',
-        }
-        return converter[peg]
+        return peg.name
 
     def _set_peg(self, index, color):
         """
         Sets a color for peg pointed by index
         """
         color = color.upper()
-        available_colors = ['RED', 'GREEN', 'YELLOW', 'BLUE']
-        if index not in range(ROW_LENGTH):
-            raise InvalidPegIndexError
-        if color not in available_colors:
-            raise InvalidPegColorError
-        self._pegs[index] = self._color_to_peg(color)
+        if index not in range(self._geometry.row_length):
+            raise InvalidPegIndexError(self._geometry.row_length)
+        if color not in self._geometry.color_indexes:
+            raise InvalidPegColorError(self._geometry.colors)
+        self._buffer[self._offset + index] = _COLOR_VALUES[color]
+        self._code = None
 
     def __str__(self):
         """
-        Returns string representation of a row (part of the board)
+        Returns string representation of a row (part of the board).
+        The terminal presentation layer is imported only when a row is drawn
         """
-        code_string = ''
-        for peg in self._pegs:
-            code_string += f'|  {peg * 2}  |'
-        keys_string = ''
-        for key in self._key_pegs:
-            keys_string += f' {key}'
-        inside = code_string + keys_string + ' |'
-        border = '|' + '-' * ((ROW_LENGTH * 8) - 2) + '|' + '-' * (ROW_LENGTH * 2 + 1) + '|'
-        return f'{border}\n{inside}\n{border}'
+        from mastermind_render import render_row
+        return render_row(tuple(self.pegs), tuple(self.key_pegs))
 
     def set_pegs(self, colors=None):
         """
         Sets row's color code to a code given by list of colors
         """
-        self._pegs = [Peg.BLACK] * ROW_LENGTH
-        if colors is not None:
-            if len(colors) != ROW_LENGTH:
-                raise InvalidAmountOfPegsError
-            for index, color in enumerate(colors):
-                self._set_peg(index, color)
+        row_length = self._geometry.row_length
+        start = self._offset
+        self._code = None
+        if colors is None:
+            self._buffer[start:start + row_length] = bytes(row_length)
+            return
+        if len(colors) != row_length:
+            raise InvalidAmountOfPegsError(row_length)
+        color_values = _geometry_color_values(self._geometry)
+        try:
+            self._buffer[start:start + row_length] = bytes([color_values[color.upper()] for color in colors])
+        except KeyError:
+            raise InvalidPegColorError(self._geometry.colors)
+        game = self._game
+        if game is not None and game.recorder is not None:
+            game._row_set(self)
 
     def _compare_pegs(self, other_row):
         """
         Compares pegs' colors of two rows. Returns a list of key pegs colors based on comparation
         """
-        available_colors = ['RED', 'GREEN', 'YELLOW', 'BLUE', 'BLACK']
-        same_color_and_placement = 0
-        same_color = 0
-        for index in range(ROW_LENGTH):
-            if self._pegs[index] == other_row._pegs[index]:
-                same_color_and_placement += 1
-        for color in available_colors:
-            if color in self.colors and color in other_row.colors:
-                same_color += min(self.colors.count(color), other_row.colors.count(color))
+        return self._geometry.feedback_to_key_colors(self._compare_feedback(other_row))
+
+    def _compare_feedback(self, other_row):
+        """
+        Compares pegs' colors of two rows. Returns amounts of white and cyan key pegs packed into an integer
+        """
+        code = self.code
+        other_code = other_row.code
+        if code is not None and other_code is not None:
+            return self._geometry.feedback(other_code, code)
+        pegs = self._peg_values()
+        other_pegs = other_row._peg_values()
+        same_color_and_placement = sum(1 for peg, other_peg in zip(pegs, other_pegs) if peg == other_peg)
+        same_color = sum(min(pegs.count(peg), other_pegs.count(peg)) for peg in set(pegs))
         same_color_not_placement = same_color - same_color_and_placement
-        white_colors = ['WHITE'] * same_color_and_placement
-        cyan_colors = ['CYAN'] * same_color_not_placement
-        black_colors = ['BLACK'] * (ROW_LENGTH - same_color_and_placement - same_color_not_placement)
-        return white_colors + cyan_colors + black_colors
+        return self._geometry.pack_feedback(same_color_and_placement, same_color_not_placement)
 
     def _set_key_peg(self, index, color):
         """
         Sets a color for key peg pointed by index
         """
         color = color.upper()
-        available_colors = ['WHITE', 'CYAN', 'BLACK']
-        if index not in range(ROW_LENGTH):
-            raise InvalidPegIndexError
-        if color not in available_colors:
+        if index not in range(self._geometry.row_length):
+            raise InvalidPegIndexError(self._geometry.row_length)
+        if color not in _KEY_VALUES:
             raise InvalidKeyPegColorError
-        self._key_pegs[index] = self._color_to_peg(color)
+        self._buffer[self._offset + self._geometry.row_length + index] = _KEY_VALUES[color]
+        self._feedback = None
 
     def _set_key_pegs(self, key_colors=None):
         """
         Sets row's key pegs to colors given in list
         """
-        self._key_pegs = [Peg.BLACK] * ROW_LENGTH
+        row_length = self._geometry.row_length
+        values = bytes(row_length)
         if key_colors is not None:
-            if len(key_colors) != ROW_LENGTH:
-                raise InvalidAmountOfPegsError
-            for index, color in enumerate(key_colors):
-                self._set_key_peg(index, color)
+            if len(key_colors) != row_length:
+                raise InvalidAmountOfPegsError(row_length)
+            try:
+                values = bytes([_KEY_VALUES[color.upper()] for color in key_colors])
+            except KeyError:
+                raise InvalidKeyPegColorError
+        start = self._offset + row_length
+        self._buffer[start:start + row_length] = values
+        self._feedback = None
+
+    def _reset(self):
+        """
+        Forgets cached code and feedback (after row's buffer was cleared)
+        """
+        self._code = None
+        self._feedback = None
 
     def compare_pegs(self, other_row):
         """
         Compares row to other row and sets key pegs for the first one
         """
-        key_colors = self._compare_pegs(other_row)
-        self._set_key_pegs(key_colors)
+        row_feedback = self._compare_feedback(other_row)
+        row_length = self._geometry.row_length
+        start = self._offset + row_length
+        self._buffer[start:start + row_length] = _feedback_key_values(self._geometry, row_feedback)
+        self._feedback = row_feedback
+        if self._game is not None:
+            self._game._row_compared(self)
 
 
 class Game:
@@ -343,16 +714,52 @@ class Game:
 
     :param players_list: list of players
     :type players_list: list
+
+    :param candidates: codes consistent with key pegs of every compared row
+    :type candidates: CandidateSet
+
+    :param geometry: shape of the board (row length and colors)
+    :type geometry: Geometry
+
+    :param recorder: recorder every move is logged with (None if moves are not recorded)
+    :type recorder: GameRecorder
+
+    :param state: state of the current turn (which move is expected next)
+    :type state: TurnState
+
+    :param turn: result of the current (or the last finished) turn (None before the first turn)
+    :type turn: TurnResult
+
+    Turns are played move by move: start_turn, set_code, then submit_guess until the turn is over.
+    Every move returns the new state at once, so one thread may drive many games.
+    Coded row and every row of the board are views over one bytearray,
+    which is cleared in place when a new board is started
     """
-    def __init__(self, gamemode, rounds, amount_of_rows=10):
+    __slots__ = (
+        '_gamemode', '_rounds', '_amount_of_rows', '_geometry', '_board',
+        'coded_row', 'rows_list', 'candidates', 'players_list', 'recorder',
+        'state', 'turn', '_guesses_made', '_turns_played'
+    )
+
+    def __init__(self, gamemode, rounds, amount_of_rows=10, geometry=STANDARD, recorder=None):
         if rounds not in range(1, 11):
             raise InvalidRoundsError
         self._gamemode = gamemode
         self._rounds = int(rounds)
         self._amount_of_rows = amount_of_rows
-        self.coded_row = Row()
+        self._geometry = geometry
+        self._board = bytearray(2 * geometry.row_length * (amount_of_rows + 1))
+        self.recorder = recorder
+        self.coded_row = Row(game=self, buffer=self._board)
+        self.rows_list = self._create_rows(amount_of_rows)
+        self.candidates = CandidateSet(geometry)
+        self.state = TurnState.TURN_OVER
+        self.turn = None
+        self._guesses_made = 0
+        self._turns_played = 0
         self._create_players()
-        self.new_board()
+        if recorder is not None:
+            recorder.game(self)
 
     @property
     def rounds(self):
@@ -366,6 +773,10 @@ class Game:
     def gamemode(self):
         return self._gamemode
 
+    @property
+    def geometry(self):
+        return self._geometry
+
     def board(self):
         """
         Returns board of rows. Row with the lowest index (0) is on the bottom
@@ -374,32 +785,61 @@ class Game:
 
     def _create_rows(self, amount):
         """
-        Creates list of given amount of empty rows
+        Creates list of given amount of empty rows (views over game's board buffer)
         """
-        return [Row() for _ in range(amount)]
+        row_size = 2 * self._geometry.row_length
+        return [Row(game=self, buffer=self._board, offset=row_size * index) for index in range(1, amount + 1)]
 
     def _create_players(self):
         """
         Creates list of players based on game's gamemode
         """
-        player1 = Player('Player 1')
+        player1 = Player('Player 1', self.geometry)
         if self.gamemode == Gamemode.PVP:
-            player2 = Player('Player 2')
+            player2 = Player('Player 2', self.geometry)
         elif self.gamemode == Gamemode.PVE:
-            player2 = Bot('Bot')
+            player2 = Bot('Bot', self.geometry)
         elif self.gamemode == Gamemode.PVE_SMART:
             player2 = BotSmart('Bot Smart', self)
         else:
             raise InvalidGamemodeError
         self.players_list = [player1, player2]
 
+    def _row_index(self, row):
+        """
+        Returns index of a row of the board (-1 for the coded row)
+        """
+        return row._offset // (2 * self._geometry.row_length) - 1
+
+    def _row_set(self, row):
+        """
+        Records pegs set in a row of the game
+        """
+        index = self._row_index(row)
+        if index < 0:
+            self.recorder.code(row.code)
+        else:
+            self.recorder.guess(index, row.code)
+
+    def _row_compared(self, row):
+        """
+        Records row's feedback in game's candidates after its key pegs were set by comparing it to the coded row
+        """
+        if row is self.coded_row:
+            return
+        if self.recorder is not None:
+            self.recorder.feedback(self._row_index(row), row.feedback)
+        if row.code is not None:
+            self.candidates.record(row.code, row.feedback)
+
     def is_guessed(self, row):
         """
         Checks if given row is the same as coded row
         """
-        if row.pegs == self.coded_row.pegs:
-            return True
-        return False
+        code = row.code
+        if code is None:
+            return row.pegs == self.coded_row.pegs
+        return code == self.coded_row.code
 
     def player_give_points(self, player):
         """
@@ -415,6 +855,8 @@ class Game:
         else:
             points = winning_row + 1
             player.points += points
+        if self.recorder is not None:
+            self.recorder.points(self.players_list.index(player), points)
         return points
 
     def winner(self):
@@ -427,8 +869,123 @@ class Game:
         else:
             return (player1 if player1.points > player2.points else player2)
 
+    @property
+    def current_row(self):
+        """
+        Returns the last row guessed in the current turn (None before the first guess)
+        """
+        return self.rows_list[self._guesses_made - 1] if self._guesses_made else None
+
+    def _expect(self, state):
+        if self.state != state:
+            raise InvalidTurnStateError(self.state)
+
+    def start_turn(self, chosing_player=None, guessing_player=None):
+        """
+        Starts a turn on a new board and returns TurnState.CODE (the previous turn has to be over).
+        Without players, player 1 sets the code in the first turn of every round and player 2 in the second
+        """
+        if self.state in (TurnState.CODE, TurnState.GUESS):
+            raise InvalidTurnStateError(self.state)
+        if chosing_player is None or guessing_player is None:
+            player1, player2 = self.players_list
+            chosing_player, guessing_player = (player1, player2) if self._turns_played % 2 == 0 else (player2, player1)
+        if chosing_player not in self.players_list or guessing_player not in self.players_list:
+            raise IncorrectPlayerError
+        self.new_board()
+        self.turn = TurnResult(chosing_player, guessing_player, None)
+        self._guesses_made = 0
+        self.state = TurnState.CODE
+        return self.state
+
+    def set_code(self, colors):
+        """
+        Sets the coded row of the current turn and returns TurnState.GUESS
+        """
+        self._expect(TurnState.CODE)
+        self.coded_row.set_pegs(colors)
+        self.turn.code = self.coded_row.colors
+        self.state = TurnState.GUESS
+        return self.state
+
+    def submit_guess(self, colors):
+        """
+        Sets and compares the next row of the current turn. Returns TurnState.GUESS if the codebreaker
+        guesses again, otherwise gives points to the codemaker and returns the state after the turn
+        (TURN_OVER, ROUND_OVER after both players set the code or GAME_OVER after the last round)
+        """
+        self._expect(TurnState.GUESS)
+        row = self.rows_list[self._guesses_made]
+        row.set_pegs(colors)
+        row.compare_pegs(self.coded_row)
+        self._guesses_made += 1
+        turn = self.turn
+        turn.guesses.append(row.colors)
+        turn.key_colors.append(row.key_colors)
+        turn.guessed = self.is_guessed(row)
+        if turn.guessed or self._guesses_made == len(self.rows_list):
+            turn.points = self.player_give_points(turn.chosing_player)
+            self._turns_played += 1
+            if self._turns_played >= 2 * self.rounds:
+                self.state = TurnState.GAME_OVER
+            elif self._turns_played % 2 == 0:
+                self.state = TurnState.ROUND_OVER
+            else:
+                self.state = TurnState.TURN_OVER
+        return self.state
+
+    def play_turn(self, chosing_player, guessing_player, get_code=None, get_guess=None, on_guess=None):
+        """
+        Plays a turn of mastermind without any I/O and returns its TurnResult.
+        get_code and get_guess take a player and return colors, by default player's
+        code_pegs_colors and guess_pegs_colors are used. on_guess is called with every filled row
+        """
+        self.start_turn(chosing_player, guessing_player)
+        self.set_code(get_code(chosing_player) if get_code is not None else chosing_player.code_pegs_colors())
+        while self.state == TurnState.GUESS:
+            self.submit_guess(
+                get_guess(guessing_player) if get_guess is not None else guessing_player.guess_pegs_colors()
+            )
+            if on_guess is not None:
+                on_guess(self.current_row)
+        return self.turn
+
+    def play(self, get_code=None, get_guess=None, on_guess=None, on_turn=None):
+        """
+        Plays every round of the game without any I/O and returns its GameResult.
+        In every round both players set the code once. Players may be replaced
+        (e.g. with two bots) by assigning players_list before calling play.
+        on_turn is called with every TurnResult, other arguments are passed to play_turn
+        """
+        player1, player2 = self.players_list
+        turns = []
+        for _ in range(self.rounds):
+            for chosing_player, guessing_player in ((player1, player2), (player2, player1)):
+                turn = self.play_turn(chosing_player, guessing_player, get_code, get_guess, on_guess)
+                turns.append(turn)
+                if on_turn is not None:
+                    on_turn(turn)
+        points = {str(player): player.points for player in self.players_list}
+        return GameResult(turns, points, self.winner())
+
     def new_board(self):
         """
-        Creates new, empty board (resets piervous one)
+        Creates new, empty board (resets piervous one in place, coded row is kept)
         """
-        self.rows_list = self._create_rows(self.amount_of_rows)
+        board = self._board
+        row_size = 2 * self._geometry.row_length
+        board[row_size:] = bytes(len(board) - row_size)
+        for row in self.rows_list:
+            row._reset()
+        self.candidates.reset()
+        if self.recorder is not None:
+            self.recorder.board(self)
+
+
+METRICS.instrument(Row, 'set_pegs')
+METRICS.instrument(Row, 'compare_pegs')
+METRICS.instrument(BotSmart, 'guess_pegs_colors')
+METRICS.instrument(Game, 'play_turn', span=True)
+METRICS.instrument(Game, 'start_turn')
+METRICS.instrument(Game, 'set_code')
+METRICS.instrument(Game, 'submit_guess')
@@ -0,0 +1,396 @@
+from array import array
+from functools import lru_cache
+from operator import itemgetter
+from mastermind_metrics import METRICS
+
+
+ALL_COLORS = ['RED', 'GREEN', 'YELLOW', 'BLUE', 'MAGENTA', 'ORANGE', 'LIME', 'GOLD', 'SKY', 'PINK']
+MAX_ROW_LENGTH = 8
+MAX_CODES = 9 ** 6
+TABLE_LIMIT = 1296
+
+
+class InvalidGeometryError(Exception):
+    def __init__(self):
+        super().__init__(
+            f'Invalid geometry. Row length has to be in range 1 - {MAX_ROW_LENGTH} '
+            f'and amount of colors in range 2 - {len(ALL_COLORS)}, '
+            f'with at most {MAX_CODES} possible codes'
+        )
+
+
+class InvalidBatchLengthError(Exception):
+    def __init__(self):
+        super().__init__('Batches scored in pairs have to contain the same amount of codes')
+
+
+def _equal_table(value):
+    """
+    Returns translation table mapping value to 1 and every other byte to 0
+    """
+    return bytes(1 if byte == value else 0 for byte in range(256))
+
+
+def _min_table(value):
+    """
+    Returns translation table mapping every byte to min(byte, value)
+    """
+    return bytes(min(byte, value) for byte in range(256))
+
+
+def _pair_min_table():
+    """
+    Returns translation table mapping byte a * (MAX_ROW_LENGTH + 1) + b to min(a, b)
+    """
+    return bytes(min(divmod(byte, MAX_ROW_LENGTH + 1)) for byte in range(256))
+
+
+def _gather(sequence, codes):
+    """
+    Returns bytes with items of sequence pointed by codes
+    """
+    if len(codes) == 0:
+        return b''
+    if len(codes) == 1:
+        return bytes((sequence[codes[0]],))
+    return bytes(itemgetter(*codes)(sequence))
+
+
+class Geometry:
+    """
+    Class Geometry. Shape of the board. Contains atributes:
+    :param row_length: amount of pegs in a row
+    :type row_length: int
+    :param colors: names of colors pegs may have
+    :type colors: list of strings
+    :param codes_count: amount of possible color codes
+    :type codes_count: int
+
+    Codes are packed into integers (base len(colors), first peg is the most significant digit).
+    Feedback (amounts of white and cyan key pegs) is packed into one small integer.
+    Use get_geometry to share one instance (and its precomputed data) between games
+    """
+    def __init__(self, row_length=4, amount_of_colors=4):
+        if row_length not in range(1, MAX_ROW_LENGTH + 1) or amount_of_colors not in range(2, len(ALL_COLORS) + 1):
+            raise InvalidGeometryError
+        if amount_of_colors ** row_length > MAX_CODES:
+            raise InvalidGeometryError
+        self.row_length = row_length
+        self.colors = ALL_COLORS[:amount_of_colors]
+        self.codes_count = amount_of_colors ** row_length
+        self.color_indexes = {color: index for index, color in enumerate(self.colors)}
+        self.solved = self.pack_feedback(row_length, 0)
+        self._table = None
+        self._full_batch = None
+        self._columns = None
+        self._matrix = None
+        self._white_table = bytes(byte // (row_length + 1) for byte in range(256))
+        self._cyan_table = bytes(byte % (row_length + 1) for byte in range(256))
+
+    def __repr__(self):
+        return f'Geometry({self.row_length}, {len(self.colors)})'
+
+    def __eq__(self, other):
+        return isinstance(other, Geometry) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __reduce__(self):
+        return (get_geometry, self.key)
+
+    @property
+    def key(self):
+        """
+        Returns (row_length, amount of colors) pair identifying the geometry
+        """
+        return (self.row_length, len(self.colors))
+
+    def colors_to_code(self, colors):
+        """
+        Packs list of color names into an integer
+        """
+        code = 0
+        for color in colors:
+            code = code * len(self.colors) + self.color_indexes[color.upper()]
+        return code
+
+    def code_to_colors(self, code):
+        """
+        Unpacks integer code into a list of color names
+        """
+        return [self.colors[index] for index in self.code_to_digits(code)]
+
+    def code_to_digits(self, code):
+        """
+        Unpacks integer code into a tuple of color indexes
+        """
+        digits = []
+        for _ in range(self.row_length):
+            code, index = divmod(code, len(self.colors))
+            digits.append(index)
+        digits.reverse()
+        return tuple(digits)
+
+    def pack_feedback(self, white, cyan):
+        """
+        Packs amounts of white and cyan key pegs into one small integer
+        """
+        return white * (self.row_length + 1) + cyan
+
+    def unpack_feedback(self, feedback):
+        """
+        Returns (white, cyan) amounts of key pegs packed in feedback
+        """
+        return divmod(feedback, self.row_length + 1)
+
+    def feedbacks(self):
+        """
+        Returns list of every possible packed feedback
+        """
+        return [
+            self.pack_feedback(white, cyan)
+            for white in range(self.row_length + 1)
+            for cyan in range(self.row_length + 1 - white)
+        ]
+
+    def feedback_to_key_colors(self, feedback):
+        """
+        Returns list of key pegs colors corresponding to packed feedback
+        """
+        white, cyan = self.unpack_feedback(feedback)
+        return ['WHITE'] * white + ['CYAN'] * cyan + ['BLACK'] * (self.row_length - white - cyan)
+
+    def has_table(self):
+        """
+        Checks if code space is small enough to keep feedback of every (secret, guess) pair
+        """
+        return self.codes_count <= TABLE_LIMIT
+
+    def feedback_table(self):
+        """
+        Returns table of packed feedbacks of every (secret, guess) pair.
+        Feedback of a pair is stored under index secret * codes_count + guess.
+        The table is computed once, on first use (only for geometries with has_table)
+        """
+        if self._table is None:
+            if not self.has_table():
+                raise InvalidGeometryError
+            batch = CodeBatch(self, range(self.codes_count), use_table=False)
+            self._table = b''.join(batch.score(code) for code in range(self.codes_count))
+        return self._table
+
+    def use_matrix(self, matrix):
+        """
+        Makes full feedback rows (of guesses compared to every code) read from given FeedbackMatrix
+        instead of being computed (None computes them again)
+        """
+        self._matrix = matrix
+
+    def feedback(self, secret, guess):
+        """
+        Returns packed feedback of guess compared to secret (both as integer codes)
+        """
+        if self.has_table():
+            return self.feedback_table()[secret * self.codes_count + guess]
+        return _score_digits(self, self.code_to_digits(secret), self.code_to_digits(guess))
+
+    def feedback_row(self, guess):
+        """
+        Returns bytes with packed feedbacks of guess compared to every code (indexed by code)
+        """
+        if self.has_table():
+            return self.feedback_table()[guess * self.codes_count:(guess + 1) * self.codes_count]
+        return self.batch(range(self.codes_count)).score(guess)
+
+    def split_feedbacks(self, feedbacks):
+        """
+        Returns arrays of white and cyan key pegs amounts of bytes with packed feedbacks
+        """
+        return array('B', feedbacks.translate(self._white_table)), array('B', feedbacks.translate(self._cyan_table))
+
+    def batch(self, codes):
+        """
+        Returns CodeBatch of given codes (batch of all codes is shared)
+        """
+        if isinstance(codes, range) and len(codes) == self.codes_count:
+            if self._full_batch is None:
+                self._full_batch = CodeBatch(self, codes)
+            return self._full_batch
+        return CodeBatch(self, codes)
+
+    def _full_columns(self):
+        """
+        Returns list of bytes, one per peg position, with color index of the peg of every code.
+        The list is assigned once it is complete, so threads never see a part of it
+        """
+        if self._columns is None:
+            base = len(self.colors)
+            columns = []
+            for position in range(self.row_length):
+                block = base ** (self.row_length - 1 - position)
+                column = b''.join(bytes((digit,)) * block for digit in range(base))
+                columns.append(column * (base ** position))
+            self._columns = columns
+        return self._columns
+
+    def _code_columns(self, codes):
+        """
+        Returns list of bytes, one per peg position, with color index of the peg of every given code
+        """
+        base = len(self.colors)
+        columns = []
+        for position in range(self.row_length):
+            block = base ** (self.row_length - 1 - position)
+            columns.append(bytes([code // block % base for code in codes]))
+        return columns
+
+
+class CodeBatch:
+    """
+    Class CodeBatch. Sequence of codes of one geometry, scored against a guess all at once.
+    Contains atributes:
+    :param geometry: geometry of codes
+    :type geometry: Geometry
+    :param codes: codes in the batch
+    :type codes: sequence of int
+
+    Small geometries read feedbacks from the precomputed table. Bigger ones keep one byte
+    per code for every peg position and color, and score with bytes.translate and big
+    integer arithmetic where every byte is one code's lane (no per-code Python loop).
+    If geometry uses a feedback matrix file, batches read its rows instead (lanes are
+    built only when the matrix is not used any more)
+    """
+    def __init__(self, geometry, codes, use_table=None):
+        self.geometry = geometry
+        self.codes = codes
+        self._full = isinstance(codes, range) and len(codes) == geometry.codes_count
+        self._use_table = geometry.has_table() if use_table is None else use_table
+        self._use_matrix = use_table is None
+        self._columns = None
+        if self._use_table or (self._use_matrix and geometry._matrix is not None):
+            return
+        self._build_lanes()
+
+    def _build_lanes(self):
+        """
+        Keeps one byte per code for every peg position and the amount of every color in every code
+        """
+        geometry = self.geometry
+        codes = self.codes
+        if self._full:
+            columns = geometry._full_columns()
+        elif geometry._columns is not None:
+            columns = [_gather(column, codes) for column in geometry._columns]
+        else:
+            columns = geometry._code_columns(codes)
+        counts = []
+        for color in range(len(geometry.colors)):
+            table = _equal_table(color)
+            lanes = sum(int.from_bytes(column.translate(table), 'little') for column in columns)
+            counts.append(lanes.to_bytes(len(codes), 'little'))
+        self._counts = counts
+        self._columns = columns
+
+    def __len__(self):
+        return len(self.codes)
+
+    def score(self, guess):
+        """
+        Returns bytes with packed feedbacks of guess compared to every code in the batch
+        """
+        if METRICS.enabled:
+            METRICS.count('scores_computed', len(self.codes))
+        geometry = self.geometry
+        if self._use_table:
+            row = geometry.feedback_row(guess)
+            return row if self._full else _gather(row, self.codes)
+        if self._use_matrix and geometry._matrix is not None:
+            row = geometry._matrix.row(guess)
+            return row if self._full else _gather(row, self.codes)
+        if self._columns is None:
+            self._build_lanes()
+        digits = geometry.code_to_digits(guess)
+        white = 0
+        for column, digit in zip(self._columns, digits):
+            white += int.from_bytes(column.translate(_EQUAL_TABLES[digit]), 'little')
+        same_color = 0
+        for color in set(digits):
+            counts = self._counts[color].translate(_MIN_TABLES[digits.count(color)])
+            same_color += int.from_bytes(counts, 'little')
+        return (white * geometry.row_length + same_color).to_bytes(len(self.codes), 'little')
+
+    def score_pairs(self, other):
+        """
+        Returns bytes with packed feedbacks of every code compared to the code at the same index of other batch.
+        Both batches have to score without the table (use_table=False)
+        """
+        size = len(self.codes)
+        if len(other.codes) != size:
+            raise InvalidBatchLengthError
+        white = 0
+        for column, other_column in zip(self._columns, other._columns):
+            different = int.from_bytes(column, 'little') ^ int.from_bytes(other_column, 'little')
+            white += int.from_bytes(different.to_bytes(size, 'little').translate(_EQUAL_TABLES[0]), 'little')
+        same_color = 0
+        for counts, other_counts in zip(self._counts, other._counts):
+            pairs = int.from_bytes(counts, 'little') * (MAX_ROW_LENGTH + 1) + int.from_bytes(other_counts, 'little')
+            same_color += int.from_bytes(pairs.to_bytes(size, 'little').translate(_PAIR_MIN_TABLE), 'little')
+        return (white * self.geometry.row_length + same_color).to_bytes(size, 'little')
+
+
+_EQUAL_TABLES = [_equal_table(value) for value in range(len(ALL_COLORS))]
+_MIN_TABLES = [_min_table(value) for value in range(MAX_ROW_LENGTH + 1)]
+_PAIR_MIN_TABLE = _pair_min_table()
+
+
+def _score_digits(geometry, secret_digits, guess_digits):
+    """
+    Computes packed feedback of two codes given as tuples of color indexes
+    """
+    white = sum(1 for secret, guess in zip(secret_digits, guess_digits) if secret == guess)
+    same_color = 0
+    for color in set(guess_digits):
+        same_color += min(secret_digits.count(color), guess_digits.count(color))
+    return geometry.pack_feedback(white, same_color - white)
+
+
+@lru_cache(maxsize=None)
+def get_geometry(row_length=4, amount_of_colors=4):
+    """
+    Returns shared Geometry instance of given shape
+    """
+    return Geometry(row_length, amount_of_colors)
+
+
+STANDARD = get_geometry()
+ROW_LENGTH = STANDARD.row_length
+COLORS = STANDARD.colors
+CODES_COUNT = STANDARD.codes_count
+COLOR_INDEXES = STANDARD.color_indexes
+SOLVED = STANDARD.solved
+colors_to_code = STANDARD.colors_to_code
+code_to_colors = STANDARD.code_to_colors
+code_to_digits = STANDARD.code_to_digits
+pack_feedback = STANDARD.pack_feedback
+unpack_feedback = STANDARD.unpack_feedback
+feedback_to_key_colors = STANDARD.feedback_to_key_colors
+feedback_table = STANDARD.feedback_table
+feedback = STANDARD.feedback
+
+
+def score_guess(guess, codes, geometry=STANDARD):
+    """
+    Compares guess to every code in codes at once.
+    Returns arrays of amounts of white and cyan key pegs (one item per code)
+    """
+    return geometry.split_feedbacks(geometry.batch(codes).score(guess))
+
+
+def score_pairs(guesses, codes, geometry=STANDARD):
+    """
+    Compares every guess to the code at the same index of codes at once.
+    Returns arrays of amounts of white and cyan key pegs (one item per pair)
+    """
+    batch = CodeBatch(geometry, guesses, use_table=False)
+    return geometry.split_feedbacks(batch.score_pairs(CodeBatch(geometry, codes, use_table=False)))
@@ -0,0 +1,248 @@
+import random
+import time
+from argparse import ArgumentParser
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from mastermind_classes import Game, Gamemode, Player, Bot, BotSmart, Strategy
+from mastermind_codes import STANDARD, get_geometry
+from mastermind_tournament import PlayerSpec
+
+
+SPLIT_TURN = 2
+CHUNK_SIZE = 2000
+DETERMINISTIC_STRATEGIES = (Strategy.MINIMAX, Strategy.TREE, Strategy.ENTROPY)
+
+
+@dataclass
+class Evaluation:
+    """
+    Class Evaluation. Results of a codebreaker played against every secret. Contains atributes:
+    :param amount_of_rows: amount of rows of the board
+    :type amount_of_rows: int
+    :param secrets: amount of secrets played against
+    :type secrets: int
+    :param guesses: amount of secrets solved with every amount of guesses
+    :type guesses: Counter
+    :param unsolved: amount of secrets not solved within the board
+    :type unsolved: int
+    :param points: amount of secrets which gave the codemaker every amount of points
+    :type points: Counter
+    """
+    amount_of_rows: int = 10
+    secrets: int = 0
+    guesses: Counter = field(default_factory=Counter)
+    unsolved: int = 0
+    points: Counter = field(default_factory=Counter)
+
+    def add(self, guesses, amount=1, points=None):
+        """
+        Adds amount of secrets solved with given amount of guesses (None if they were not solved).
+        Codemaker's points are counted as in Game.player_give_points if not given
+        """
+        self.secrets += amount
+        if guesses is None:
+            self.unsolved += amount
+        else:
+            self.guesses[guesses] += amount
+        if points is None:
+            points = self.amount_of_rows + 1 if guesses is None else guesses
+        self.points[points] += amount
+
+    def merge(self, other):
+        """
+        Adds other evaluation to this one
+        """
+        self.secrets += other.secrets
+        self.guesses.update(other.guesses)
+        self.unsolved += other.unsolved
+        self.points.update(other.points)
+        return self
+
+    @property
+    def average(self):
+        """
+        Returns average amount of guesses needed to solve a secret (None if none was solved)
+        """
+        solved = sum(self.guesses.values())
+        return sum(guesses * count for guesses, count in self.guesses.items()) / solved if solved else None
+
+    @property
+    def worst_case(self):
+        """
+        Returns the highest amount of guesses a solved secret needed (None if none was solved)
+        """
+        return max(self.guesses) if self.guesses else None
+
+    @property
+    def average_points(self):
+        return sum(points * count for points, count in self.points.items()) / self.secrets if self.secrets else None
+
+
+def is_deterministic(spec):
+    """
+    Checks if player's guesses depend only on the board's history (so every history is searched once)
+    """
+    return (
+        issubclass(spec.player_class, BotSmart)
+        and spec.kwargs.get('strategy', Strategy.MINIMAX) in DETERMINISTIC_STRATEGIES
+        and spec.kwargs.get('budget') is None
+    )
+
+
+def _create_game(spec, geometry, amount_of_rows):
+    """
+    Creates game in which codebreaker created from spec plays against a codemaker
+    """
+    game = Game(Gamemode.PVE, 1, amount_of_rows, geometry)
+    codemaker = Player('Codemaker', geometry)
+    codebreaker = spec.create(game)
+    game.players_list = [codemaker, codebreaker]
+    return game, codemaker, codebreaker
+
+
+def _walk(game, codebreaker, turn, evaluation, split_turn=None, tasks=None):
+    """
+    Asks codebreaker for a guess after the board's history and splits candidates by its feedback.
+    Every group of candidates is searched on its own (its first code is set as the coded row),
+    groups reaching split_turn are appended to tasks instead
+    """
+    geometry = game.geometry
+    candidates = game.candidates
+    codes, history = candidates.codes, candidates.history[:]
+    row = game.rows_list[turn]
+    row.set_pegs(codebreaker.guess_pegs_colors())
+    groups = {}
+    for code, guess_feedback in zip(codes, geometry.batch(codes).score(row.code)):
+        groups.setdefault(guess_feedback, array('I')).append(code)
+    for guess_feedback, group in groups.items():
+        if guess_feedback == geometry.solved:
+            evaluation.add(turn + 1, len(group))
+        elif turn + 1 == game.amount_of_rows:
+            evaluation.add(None, len(group))
+        else:
+            game.coded_row.set_pegs(geometry.code_to_colors(group[0]))
+            candidates.reset(group, history)
+            row.compare_pegs(game.coded_row)
+            if turn + 1 == split_turn:
+                tasks.append((candidates.history[:], group))
+            else:
+                _walk(game, codebreaker, turn + 1, evaluation, split_turn, tasks)
+    candidates.reset(codes, history)
+    row.set_pegs(None)
+
+
+def _walk_task(task):
+    """
+    Searches every secret of a group of candidates reached by a history of (guess, feedback) pairs
+    """
+    spec, geometry, amount_of_rows, history, codes = task
+    game, _, codebreaker = _create_game(spec, geometry, amount_of_rows)
+    game.coded_row.set_pegs(geometry.code_to_colors(codes[0]))
+    for turn, (guess, _) in enumerate(history):
+        game.candidates.reset(codes, history[:turn])
+        game.rows_list[turn].set_pegs(geometry.code_to_colors(guess))
+        game.rows_list[turn].compare_pegs(game.coded_row)
+    evaluation = Evaluation(amount_of_rows)
+    _walk(game, codebreaker, len(history), evaluation)
+    return evaluation
+
+
+def _play_chunk(task):
+    """
+    Plays one game against every secret of a range of codes (random is seeded for the chunk)
+    """
+    spec, geometry, amount_of_rows, start, stop, seed = task
+    random.seed(seed)
+    game, codemaker, codebreaker = _create_game(spec, geometry, amount_of_rows)
+    evaluation = Evaluation(amount_of_rows)
+    for secret in range(start, stop):
+        colors = geometry.code_to_colors(secret)
+        turn = game.play_turn(codemaker, codebreaker, get_code=lambda player: colors)
+        evaluation.add(len(turn.guesses) if turn.guessed else None, 1, turn.points)
+    return evaluation
+
+
+def evaluate(spec, geometry=STANDARD, amount_of_rows=10, processes=None, chunk_size=CHUNK_SIZE, seed=0):
+    """
+    Plays codebreaker made from spec against every possible secret and returns Evaluation.
+    Players whose guesses depend only on the board's history are searched through their decision tree
+    (one guess per distinct history), the tree is split into subtrees at SPLIT_TURN for worker processes.
+    Other players play one game per secret, in chunks of codes with their own seeds
+    """
+    result = Evaluation(amount_of_rows)
+    if is_deterministic(spec):
+        game, _, codebreaker = _create_game(spec, geometry, amount_of_rows)
+        if processes == 1:
+            _walk(game, codebreaker, 0, result)
+            return result
+        tasks = []
+        _walk(game, codebreaker, 0, result, min(SPLIT_TURN, amount_of_rows), tasks)
+        tasks = [(spec, geometry, amount_of_rows, history, codes) for history, codes in tasks]
+        tasks.sort(key=lambda task: -len(task[-1]))
+        worker, chunks = _walk_task, tasks
+    else:
+        chunks = [
+            (spec, geometry, amount_of_rows, start, min(start + chunk_size, geometry.codes_count), f'{seed}-{start}')
+            for start in range(0, geometry.codes_count, chunk_size)
+        ]
+        if processes == 1:
+            for chunk in chunks:
+                result.merge(_play_chunk(chunk))
+            return result
+        worker = _play_chunk
+    if geometry.has_table():
+        geometry.feedback_table()
+    with Pool(processes) as pool:
+        for evaluation in pool.imap_unordered(worker, chunks):
+            result.merge(evaluation)
+    return result
+
+
+def format_evaluation(name, geometry, evaluation):
+    """
+    Returns text report of an evaluation
+    """
+    average = '-' if evaluation.average is None else f'{evaluation.average:.4f}'
+    histogram = ' '.join(f'{guesses}:{count}' for guesses, count in sorted(evaluation.guesses.items()))
+    points = ' '.join(f'{points}:{count}' for points, count in sorted(evaluation.points.items()))
+    return '\n'.join([
+        f'{name} on {geometry!r} with {evaluation.amount_of_rows} rows, {evaluation.secrets} secrets',
+        f'  average {average} guesses, worst case {evaluation.worst_case}, unsolved {evaluation.unsolved}',
+        f'  guesses: {histogram}',
+        f'  codemaker points: average {evaluation.average_points:.4f}, {points}'
+    ])
+
+
+PLAYERS = {
+    'random': PlayerSpec(Bot, 'Bot'),
+    'simple': PlayerSpec(BotSmart, 'Simple', strategy=Strategy.SIMPLE),
+    'minimax': PlayerSpec(BotSmart, 'Minimax', strategy=Strategy.MINIMAX),
+    'entropy': PlayerSpec(BotSmart, 'Entropy', strategy=Strategy.ENTROPY),
+    'tree': PlayerSpec(BotSmart, 'Tree', strategy=Strategy.TREE)
+}
+
+
+def main():
+    parser = ArgumentParser(description='Plays codebreakers against every possible secret')
+    parser.add_argument('players', nargs='*', default=['minimax'], help=f'codebreakers: {", ".join(PLAYERS)}')
+    parser.add_argument('--row-length', type=int, default=4)
+    parser.add_argument('--colors', type=int, default=4, help='amount of colors')
+    parser.add_argument('--rows', type=int, default=10, help='amount of rows of the board')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args()
+    unknown = [name for name in arguments.players if name not in PLAYERS]
+    if unknown:
+        parser.error(f'unknown codebreakers: {", ".join(unknown)}')
+    geometry = get_geometry(arguments.row_length, arguments.colors)
+    for name in arguments.players:
+        start = time.perf_counter()
+        evaluation = evaluate(PLAYERS[name], geometry, arguments.rows, arguments.processes, seed=arguments.seed)
+        print(format_evaluation(name, geometry, evaluation))
+        print(f'  evaluated in {time.perf_counter() - start:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
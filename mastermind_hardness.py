@@ -0,0 +1,203 @@
+import os
+import random
+import struct
+import time
+from argparse import ArgumentParser
+from array import array
+from mastermind_book import BOOK_DIRECTORY
+from mastermind_codes import get_geometry
+from mastermind_solver import minimax_guess, entropy_guess
+from mastermind_tree import StrategyTree
+
+
+HARDNESS_MAGIC = b'MMHARD1\0'
+HARDNESS_HEADER = struct.Struct('<8sBB16sxxI')
+SOLVERS = {'minimax': minimax_guess, 'entropy': entropy_guess}
+STRATEGIES = [*SOLVERS, 'tree']
+
+
+class InvalidHardnessIndexError(Exception):
+    def __init__(self, path):
+        super().__init__(f'File {path} is not a valid hardness index')
+
+
+class UnknownStrategyError(Exception):
+    def __init__(self, strategy):
+        super().__init__(f'Hardness index can not be built for strategy {strategy}, use one of: {", ".join(STRATEGIES)}')
+
+
+def hardness_path(geometry, strategy, directory=None):
+    """
+    Returns default path of the hardness index of given geometry and strategy
+    """
+    directory = BOOK_DIRECTORY if directory is None else directory
+    return os.path.join(directory, f'hardness_{geometry.row_length}x{len(geometry.colors)}_{strategy}.bin')
+
+
+def _solver_guesses_to_solve(geometry, solver):
+    """
+    Returns bytearray with amount of guesses solver needs for every secret.
+    Solver's guess depends only on candidates, so it is chosen once for every set of candidates
+    """
+    guesses_to_solve = bytearray(geometry.codes_count)
+    stack = [(range(geometry.codes_count), 1)]
+    while stack:
+        candidates, turn = stack.pop()
+        guess = solver(candidates, geometry=geometry)
+        partitions = {}
+        for code, guess_feedback in zip(candidates, geometry.batch(candidates).score(guess)):
+            if guess_feedback == geometry.solved:
+                guesses_to_solve[code] = min(turn, 255)
+            else:
+                partitions.setdefault(guess_feedback, array('I')).append(code)
+        stack.extend((partition, turn + 1) for partition in partitions.values())
+    return guesses_to_solve
+
+
+def _tree_guesses_to_solve(tree):
+    """
+    Returns bytearray with amount of guesses the strategy tree needs for every secret
+    """
+    geometry = tree.geometry
+    guesses_to_solve = bytearray(geometry.codes_count)
+    stack = [(range(geometry.codes_count), 0, 1)]
+    while stack:
+        candidates, node, turn = stack.pop()
+        guess = tree.guess(node)
+        partitions = {}
+        for code, guess_feedback in zip(candidates, geometry.batch(candidates).score(guess)):
+            if guess_feedback == geometry.solved:
+                guesses_to_solve[code] = turn
+            else:
+                partitions.setdefault(guess_feedback, array('I')).append(code)
+        for guess_feedback, partition in partitions.items():
+            stack.append((partition, tree.child(node, guess_feedback), turn + 1))
+    return guesses_to_solve
+
+
+def guesses_to_solve(geometry, strategy='minimax', tree=None):
+    """
+    Runs strategy against every possible secret. Returns bytearray with amount of guesses needed, indexed by code
+    """
+    if strategy == 'tree':
+        tree = tree if tree is not None else StrategyTree.default(geometry)
+        if tree is None:
+            tree = StrategyTree.build(geometry)
+        return _tree_guesses_to_solve(tree)
+    if strategy not in SOLVERS:
+        raise UnknownStrategyError(strategy)
+    return _solver_guesses_to_solve(geometry, SOLVERS[strategy])
+
+
+def build_hardness_index(geometry, path, strategy='minimax'):
+    """
+    Computes guesses-to-solve of every secret and saves them to an index file. Returns the hardest amount of guesses
+    """
+    counts = guesses_to_solve(geometry, strategy)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(HARDNESS_HEADER.pack(
+            HARDNESS_MAGIC, geometry.row_length, len(geometry.colors), strategy.encode(), geometry.codes_count
+        ))
+        file.write(counts)
+    return max(counts)
+
+
+class HardnessIndex:
+    """
+    Class HardnessIndex. Amount of guesses a strategy needs to solve every secret. Contains atributes:
+    :param path: path of the index file
+    :type path: string
+    :param geometry: geometry the index was built for
+    :type geometry: Geometry
+    :param strategy: name of the strategy the index was built for
+    :type strategy: string
+    :param hardest: codes which need the most guesses
+    :type hardest: array of int
+
+    The file is read once, on first use
+    """
+    _defaults = {}
+
+    def __init__(self, path):
+        self.path = path
+        self._counts = None
+
+    @classmethod
+    def default(cls, geometry, strategy):
+        """
+        Returns shared index of given geometry and strategy from BOOK_DIRECTORY (None if it was not built)
+        """
+        key = (geometry, strategy)
+        if key not in cls._defaults:
+            path = hardness_path(geometry, strategy)
+            cls._defaults[key] = cls(path) if os.path.exists(path) else None
+        return cls._defaults[key]
+
+    @property
+    def geometry(self):
+        self._load()
+        return self._geometry
+
+    @property
+    def strategy(self):
+        self._load()
+        return self._strategy
+
+    @property
+    def hardest(self):
+        self._load()
+        return self._hardest
+
+    def _load(self):
+        if self._counts is not None:
+            return
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        if len(data) < HARDNESS_HEADER.size:
+            raise InvalidHardnessIndexError(self.path)
+        magic, row_length, amount_of_colors, strategy, count = HARDNESS_HEADER.unpack_from(data)
+        if magic != HARDNESS_MAGIC or len(data) != HARDNESS_HEADER.size + count:
+            raise InvalidHardnessIndexError(self.path)
+        self._geometry = get_geometry(row_length, amount_of_colors)
+        self._strategy = strategy.rstrip(b'\0').decode()
+        counts = data[HARDNESS_HEADER.size:]
+        hardest = max(counts)
+        self._hardest = array('I', (code for code, guesses in enumerate(counts) if guesses == hardest))
+        self._counts = counts
+
+    def guesses(self, code):
+        """
+        Returns amount of guesses the strategy needs to solve code
+        """
+        self._load()
+        return self._counts[code]
+
+    def choose(self):
+        """
+        Returns random code among the hardest ones
+        """
+        self._load()
+        return self._hardest[random.randrange(len(self._hardest))]
+
+
+def main():
+    parser = ArgumentParser(description='Builds index of guesses a strategy needs to solve every secret')
+    parser.add_argument('row_length', type=int, nargs='?', default=4)
+    parser.add_argument('amount_of_colors', type=int, nargs='?', default=4)
+    parser.add_argument('--strategy', choices=STRATEGIES, default='minimax')
+    parser.add_argument('--output', default=None)
+    arguments = parser.parse_args()
+    geometry = get_geometry(arguments.row_length, arguments.amount_of_colors)
+    path = arguments.output or hardness_path(geometry, arguments.strategy)
+    start = time.perf_counter()
+    hardest = build_hardness_index(geometry, path, arguments.strategy)
+    index = HardnessIndex(path)
+    print(f'Saved index to {path} in {time.perf_counter() - start:.1f} s')
+    print(f'{len(index.hardest)} codes need {hardest} guesses')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,13 @@
-import os
 import time
-from mastermind_classes import Player, Gamemode
+from mastermind_classes import Player, Gamemode, TurnState, STANDARD
 from mastermind_classes import (
     InvalidPegColorError,
     InvalidAmountOfPegsError,
     InvalidRoundsError,
     test_pegs_colors
 )
-
-
-ROW_LENGTH = 4
+from mastermind_metrics import METRICS
+from mastermind_render import BoardRenderer, clear
 
 
 class InvalidGamemodeNumberError(Exception):
@@ -17,22 +15,7 @@ class InvalidGamemodeNumberError(Exception):
         super().__init__('Invalid gamemode number. Number has to be either 1, 2 or 3')
 
 
-class IncorrectPlayerError(Exception):
-    def __init__(self):
-        super().__init__('Chosen player does not take part in the game')
-
-
-def clear():
-    """
-    Uses correct clear command corresponding to user's OS
-    """
-    if os.name == 'posix':
-        os.system('clear')
-    else:
-        os.system('cls')
-
-
-def get_colors_from_user():
+def get_colors_from_user(geometry=STANDARD):
     """
     Tries to get colors of pegs from user input, handles possible errors
     """
@@ -40,11 +23,14 @@ def get_colors_from_user():
     while True:
         try:
             colors = input().split(' ')
-            test_pegs_colors(colors)
+            test_pegs_colors(colors, geometry)
         except InvalidPegColorError:
-            print('You have to choose between Red Green Blue or Yellow\n')
+            if geometry.colors == STANDARD.colors:
+                print('You have to choose between Red Green Blue or Yellow\n')
+            else:
+                print(f'You have to choose between {" ".join(geometry.colors).title()}\n')
         except InvalidAmountOfPegsError:
-            print(f'You have to pick exactly {ROW_LENGTH} colors\n')
+            print(f'You have to pick exactly {geometry.row_length} colors\n')
         else:
             break
     return colors
@@ -58,24 +44,24 @@ def print_board(game):
         print(row)
 
 
-def get_color_code(chosing_player):
+def get_color_code(chosing_player, geometry=STANDARD):
     """
     Gets color code based on type of player
     """
     if type(chosing_player) == Player:
         print(f'{chosing_player}\nSet the color code:\n')
-        player_input = get_colors_from_user()
+        player_input = get_colors_from_user(geometry)
         return chosing_player.code_pegs_colors(player_input)
     return chosing_player.code_pegs_colors()
 
 
-def get_color_guess(guessing_player):
+def get_color_guess(guessing_player, geometry=STANDARD):
     """
     Gets color guess based on type of player
     """
     if type(guessing_player) == Player:
         print(f'{guessing_player}\nTry to guess the color code:\n')
-        player_input = get_colors_from_user()
+        player_input = get_colors_from_user(geometry)
         return guessing_player.guess_pegs_colors(player_input)
     return guessing_player.guess_pegs_colors()
 
@@ -84,31 +70,20 @@ def play_turn(game, chosing_player, guessing_player):
     """
     Plays a turn of mastermind
     """
+    renderer = BoardRenderer()
     clear()
-    if chosing_player not in game.players_list or guessing_player not in game.players_list:
-        raise IncorrectPlayerError
-    game.new_board()
-    color_code = get_color_code(chosing_player)
-    game.coded_row.set_pegs(color_code)
-    round_status = 'Lost'
-    for row in game.rows_list:
-        clear()
-        print_board(game)
-        print('')
-        guess = get_color_guess(guessing_player)
-        row.set_pegs(guess)
-        row.compare_pegs(game.coded_row)
-        if type(guessing_player) != Player:
-            time.sleep(0.5)
-        if game.is_guessed(row):
-            round_status = 'Won'
-            break
-    clear()
-    print_board(game)
-    print('')
-    points_given = game.player_give_points(chosing_player)
+    with METRICS.span('Game.play_turn'):
+        game.start_turn(chosing_player, guessing_player)
+        game.set_code(get_color_code(chosing_player, game.geometry))
+        while game.state == TurnState.GUESS:
+            renderer.draw(game)
+            game.submit_guess(get_color_guess(guessing_player, game.geometry))
+            if type(guessing_player) != Player:
+                time.sleep(0.5)
+    renderer.draw(game)
+    points_given = game.turn.points
     point_or_points = 'point' if points_given == 1 else 'points'
-    if round_status == 'Won':
+    if game.turn.guessed:
         print(f'{guessing_player} guessed the code! {chosing_player} gets {points_given} {point_or_points}\n')
     else:
         print(f'CODED ROW:\n{game.coded_row}\n')
@@ -0,0 +1,188 @@
+import struct
+from dataclasses import dataclass, field
+from enum import IntEnum
+from mastermind_codes import get_geometry
+
+
+RECORD = struct.Struct('<BBI')
+BUFFER_SIZE = 1 << 16
+READ_RECORDS = 1 << 14
+PLAYER_KINDS = ['Player', 'Bot', 'BotSmart']
+UNKNOWN_KIND = 255
+
+
+class Record(IntEnum):
+    """
+    Kinds of log records. Every record is RECORD.size bytes: kind, argument and value
+    """
+    GAME = 1        # argument: amount of rows, value: row length << 8 | amount of colors
+    BOARD = 2       # argument: unused, value: kind of player 1 << 8 | kind of player 2
+    CODE = 3        # argument: unused, value: packed code of the coded row
+    GUESS = 4       # argument: row index, value: packed code of the guess
+    FEEDBACK = 5    # argument: row index, value: packed feedback of the guess
+    POINTS = 6      # argument: index of the codemaker, value: points given
+
+
+class InvalidLogError(Exception):
+    def __init__(self, path):
+        super().__init__(f'File {path} is not a valid game log')
+
+
+def player_kind(player):
+    """
+    Returns number of player's class stored in the log
+    """
+    name = type(player).__name__
+    return PLAYER_KINDS.index(name) if name in PLAYER_KINDS else UNKNOWN_KIND
+
+
+def player_kind_name(kind):
+    """
+    Returns name of player's class of number stored in the log
+    """
+    return PLAYER_KINDS[kind] if kind < len(PLAYER_KINDS) else 'Unknown'
+
+
+class GameRecorder:
+    """
+    Class GameRecorder. Appends binary records of every move of games to a log file. Contains atributes:
+    :param path: path of the log file
+    :type path: string
+
+    Writes are buffered, so records reach the file when the buffer is full or the recorder
+    is closed. One recorder is meant to record one game at a time (games follow each other in the log)
+    """
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        self.path = path
+        self._file = open(path, 'ab', buffering=buffer_size)
+        self._pack = RECORD.pack
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def flush(self):
+        self._file.flush()
+
+    def write(self, kind, argument, value):
+        self._file.write(self._pack(kind, argument, value))
+
+    def game(self, game):
+        geometry = game.geometry
+        self.write(Record.GAME, game.amount_of_rows, geometry.row_length << 8 | len(geometry.colors))
+
+    def board(self, game):
+        player1, player2 = game.players_list
+        self.write(Record.BOARD, 0, player_kind(player1) << 8 | player_kind(player2))
+
+    def code(self, code):
+        self.write(Record.CODE, 0, code)
+
+    def guess(self, index, code):
+        self.write(Record.GUESS, index, code)
+
+    def feedback(self, index, row_feedback):
+        self.write(Record.FEEDBACK, index, row_feedback)
+
+    def points(self, player_index, points):
+        self.write(Record.POINTS, player_index, points)
+
+
+@dataclass
+class TurnLog:
+    """
+    Class TurnLog. One codebreaking sequence read from the log. Contains atributes:
+    :param kinds: kinds of both players (numbers of PLAYER_KINDS)
+    :type kinds: tuple
+    :param code: packed code of the coded row (None if it was not set)
+    :type code: int
+    :param guesses: packed codes of guesses, in order
+    :type guesses: list
+    :param feedbacks: packed feedbacks of guesses, in order
+    :type feedbacks: list
+    :param codemaker: index of the player who was given points (None if the turn was not finished)
+    :type codemaker: int
+    :param points: points given to the codemaker
+    :type points: int
+    """
+    kinds: tuple
+    code: int = None
+    guesses: list = field(default_factory=list)
+    feedbacks: list = field(default_factory=list)
+    codemaker: int = None
+    points: int = 0
+
+    @property
+    def codebreaker(self):
+        return None if self.codemaker is None else 1 - self.codemaker
+
+
+@dataclass
+class GameLog:
+    """
+    Class GameLog. One game read from the log. Contains atributes:
+    :param geometry: geometry of the board
+    :type geometry: Geometry
+    :param amount_of_rows: amount of rows of the board
+    :type amount_of_rows: int
+    :param turns: codebreaking sequences, in order
+    :type turns: list of TurnLog
+    """
+    geometry: object
+    amount_of_rows: int
+    turns: list = field(default_factory=list)
+
+
+def read_records(path, records_per_read=READ_RECORDS):
+    """
+    Yields (kind, argument, value) tuples of every record of the log.
+    The file is read in chunks, so memory use does not depend on log's size
+    """
+    chunk_size = records_per_read * RECORD.size
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            if len(chunk) % RECORD.size:
+                raise InvalidLogError(path)
+            yield from RECORD.iter_unpack(chunk)
+
+
+def read_games(path, records_per_read=READ_RECORDS):
+    """
+    Yields GameLog of every game of the log, one game in memory at a time
+    """
+    game = None
+    turn = None
+    for kind, argument, value in read_records(path, records_per_read):
+        if kind == Record.GAME:
+            if game is not None:
+                yield game
+            game = GameLog(get_geometry(value >> 8, value & 0xFF), argument)
+            turn = None
+        elif game is None:
+            continue
+        elif kind == Record.BOARD:
+            turn = TurnLog((value >> 8, value & 0xFF))
+            game.turns.append(turn)
+        elif turn is None:
+            continue
+        elif kind == Record.CODE:
+            turn.code = value
+        elif kind == Record.GUESS:
+            turn.guesses.append(value)
+        elif kind == Record.FEEDBACK:
+            turn.feedbacks.append(value)
+        elif kind == Record.POINTS:
+            turn.codemaker = argument
+            turn.points = value
+        else:
+            raise InvalidLogError(path)
+    if game is not None:
+        yield game
@@ -1,4 +1,7 @@
+import sys
+from argparse import ArgumentParser
 from mastermind_classes import Game
+from mastermind_batch import play_script
 from mastermind_interface import (
     play_turn,
     print_points,
@@ -10,7 +13,7 @@ from mastermind_interface import (
 )
 
 
-def main():
+def play_interactive():
     clear()
     print_rules()
     input('Press enter to continue ')
@@ -38,5 +41,29 @@ def main():
     return
 
 
+def play_batch(path, seed=None):
+    """
+    Plays games scripted in a file ('-' for standard input) and prints one result line per game
+    """
+    if path == '-':
+        return play_script(sys.stdin, seed=seed)
+    with open(path) as file:
+        return play_script(file, seed=seed)
+
+
+def main():
+    parser = ArgumentParser(description='Mastermind')
+    parser.add_argument(
+        '--batch', metavar='PATH', default=None,
+        help='plays games scripted in a file ("-" for standard input) without prompts'
+    )
+    parser.add_argument('--seed', type=int, default=None, help="seed of bots' random moves in batch mode")
+    arguments = parser.parse_args()
+    if arguments.batch is None:
+        play_interactive()
+    elif play_batch(arguments.batch, arguments.seed):
+        sys.exit(1)
+
+
 if __name__ == '__main__':
     main()
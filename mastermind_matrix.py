@@ -0,0 +1,227 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from argparse import ArgumentParser
+from multiprocessing import Pool
+from mastermind_book import BOOK_DIRECTORY
+from mastermind_codes import CodeBatch, get_geometry
+
+
+MATRIX_MAGIC = b'MMFEED1\0'
+MATRIX_HEADER = struct.Struct('<8sBBxxII')
+TILE_BYTES = 1 << 18
+
+
+class InvalidMatrixError(Exception):
+    def __init__(self, path):
+        super().__init__(f'File {path} is not a valid feedback matrix')
+
+
+def matrix_path(geometry, directory=None):
+    """
+    Returns default path of the feedback matrix of given geometry
+    """
+    directory = BOOK_DIRECTORY if directory is None else directory
+    return os.path.join(directory, f'feedback_{geometry.row_length}x{len(geometry.colors)}.bin')
+
+
+class FeedbackMatrix:
+    """
+    Class FeedbackMatrix. Feedback of every guess compared to every code, memory-mapped from a file. Contains atributes:
+    :param geometry: geometry of the codes
+    :type geometry: Geometry
+    :param path: path of the matrix file
+    :type path: string
+    :param tile_rows: amount of guesses (rows) computed together as one tile
+    :type tile_rows: int
+
+    Row of a guess holds one packed feedback byte per code. The file is created sparse and tiles
+    are computed on first use (or ahead by build), so only rows solvers touch take memory and disk
+    (matrix of every geometry fits in a file, even though 6x8 and bigger ones would not fit in memory).
+    A tile is marked built in the header after its rows are written, so other processes and later
+    runs reuse it
+    """
+    def __init__(self, geometry, path=None, tile_rows=None):
+        self.geometry = geometry
+        self.path = matrix_path(geometry) if path is None else path
+        self._batch = None
+        self._map = None
+        if not os.path.exists(self.path):
+            self._create(tile_rows)
+        self._file = open(self.path, 'r+b')
+        try:
+            self._open()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _layout(self, tile_rows):
+        tiles_count = -(-self.geometry.codes_count // tile_rows)
+        data_offset = -(-(MATRIX_HEADER.size + tiles_count) // mmap.PAGESIZE) * mmap.PAGESIZE
+        return tiles_count, data_offset
+
+    def _create(self, tile_rows):
+        """
+        Creates empty (sparse) matrix file unless another process already did. The file is prepared
+        under a temporary name and linked into place complete, so a half-created file is never opened
+        (and an existing one is never replaced)
+        """
+        codes_count = self.geometry.codes_count
+        tile_rows = max(1, TILE_BYTES // codes_count) if tile_rows is None else tile_rows
+        tiles_count, data_offset = self._layout(tile_rows)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temporary, 'wb') as file:
+                file.write(MATRIX_HEADER.pack(
+                    MATRIX_MAGIC, self.geometry.row_length, len(self.geometry.colors), tile_rows, tiles_count
+                ))
+                file.truncate(data_offset + codes_count * codes_count)
+            os.link(temporary, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def _open(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size < MATRIX_HEADER.size:
+            raise InvalidMatrixError(self.path)
+        magic, row_length, amount_of_colors, tile_rows, tiles_count = MATRIX_HEADER.unpack(
+            self._file.read(MATRIX_HEADER.size)
+        )
+        if magic != MATRIX_MAGIC or (row_length, amount_of_colors) != (
+            self.geometry.row_length, len(self.geometry.colors)
+        ) or not tile_rows:
+            raise InvalidMatrixError(self.path)
+        self.tile_rows = tile_rows
+        self._tiles_count, self._data_offset = self._layout(tile_rows)
+        codes_count = self.geometry.codes_count
+        if tiles_count != self._tiles_count or size != self._data_offset + codes_count * codes_count:
+            raise InvalidMatrixError(self.path)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        """
+        Writes built tiles to the file and unmaps it (detaching it from the geometry)
+        """
+        if self._map is None:
+            return
+        if self.geometry._matrix is self:
+            self.geometry.use_matrix(None)
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+        self._map = None
+
+    def attach(self):
+        """
+        Makes batches of geometry's codes (and so solvers) read feedbacks from this matrix. Returns the matrix
+        """
+        self.geometry.use_matrix(self)
+        return self
+
+    @property
+    def tiles_count(self):
+        return self._tiles_count
+
+    def is_built(self, tile):
+        return self._map[MATRIX_HEADER.size + tile] != 0
+
+    def missing_tiles(self):
+        """
+        Returns list of tiles which were not built yet
+        """
+        flags = self._map[MATRIX_HEADER.size:MATRIX_HEADER.size + self._tiles_count]
+        return [tile for tile, flag in enumerate(flags) if not flag]
+
+    def row(self, guess):
+        """
+        Returns bytes with packed feedback of guess compared to every code (indexed by code)
+        """
+        tile = guess // self.tile_rows
+        if not self.is_built(tile):
+            self.build_tile(tile)
+        start = self._data_offset + guess * self.geometry.codes_count
+        return self._map[start:start + self.geometry.codes_count]
+
+    def build_tile(self, tile):
+        """
+        Computes rows of every guess of the tile, writes them and marks the tile built
+        """
+        codes_count = self.geometry.codes_count
+        if self._batch is None:
+            self._batch = CodeBatch(self.geometry, range(codes_count), use_table=False)
+        first = tile * self.tile_rows
+        last = min(first + self.tile_rows, codes_count)
+        start = self._data_offset + first * codes_count
+        self._map[start:start + (last - first) * codes_count] = b''.join(
+            self._batch.score(guess) for guess in range(first, last)
+        )
+        self._map[MATRIX_HEADER.size + tile] = 1
+
+    def build(self, tiles=None, processes=None):
+        """
+        Builds given tiles (every missing one by default), in parallel unless processes is 1.
+        Returns amount of tiles built
+        """
+        tiles = self.missing_tiles() if tiles is None else [tile for tile in tiles if not self.is_built(tile)]
+        if processes == 1 or len(tiles) < 2:
+            for tile in tiles:
+                self.build_tile(tile)
+            return len(tiles)
+        self._map.flush()
+        arguments = (self.geometry.row_length, len(self.geometry.colors), self.path)
+        with Pool(processes, initializer=_open_worker_matrix, initargs=arguments) as pool:
+            for _ in pool.imap_unordered(_build_worker_tile, tiles):
+                pass
+        return len(tiles)
+
+
+_worker_matrix = None
+
+
+def _open_worker_matrix(row_length, amount_of_colors, path):
+    global _worker_matrix
+    _worker_matrix = FeedbackMatrix(get_geometry(row_length, amount_of_colors), path)
+
+
+def _build_worker_tile(tile):
+    _worker_matrix.build_tile(tile)
+    _worker_matrix._map.flush()
+    return tile
+
+
+def main():
+    parser = ArgumentParser(description='Builds tiles of the memory-mapped feedback matrix of a geometry')
+    parser.add_argument('row_length', type=int, nargs='?', default=5)
+    parser.add_argument('amount_of_colors', type=int, nargs='?', default=8)
+    amount = parser.add_mutually_exclusive_group(required=True)
+    amount.add_argument('--tiles', type=int, help='builds the first TILES tiles')
+    amount.add_argument('--all', action='store_true', help='builds every tile (the whole matrix)')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--output', default=None)
+    arguments = parser.parse_args()
+    geometry = get_geometry(arguments.row_length, arguments.amount_of_colors)
+    start = time.perf_counter()
+    with FeedbackMatrix(geometry, arguments.output) as matrix:
+        tiles = None if arguments.all else range(min(arguments.tiles, matrix.tiles_count))
+        built = matrix.build(tiles, arguments.processes)
+        missing = len(matrix.missing_tiles())
+        print(f'Built {built} tiles of {matrix.path} in {time.perf_counter() - start:.1f} s')
+        print(f'{matrix.tiles_count - missing} of {matrix.tiles_count} tiles ({matrix.tile_rows} rows each) are built')
+
+
+if __name__ == '__main__':
+    main()
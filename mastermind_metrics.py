@@ -0,0 +1,238 @@
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+
+SPANS_LIMIT = 1000
+PERCENTILES = (50, 90, 99)
+
+
+class Histogram:
+    """
+    Class Histogram. Latencies of calls in power of two buckets (bucket n holds calls shorter than 2 ** n us).
+    Contains atributes:
+    :param count: amount of calls
+    :type count: int
+    :param total: sum of durations in seconds
+    :type total: float
+    :param minimum: the shortest duration in seconds
+    :type minimum: float
+    :param maximum: the longest duration in seconds
+    :type maximum: float
+    :param buckets: amount of calls in every bucket
+    :type buckets: Counter
+    """
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.buckets = Counter()
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if self.minimum is None or seconds < self.minimum:
+            self.minimum = seconds
+        if self.maximum is None or seconds > self.maximum:
+            self.maximum = seconds
+        self.buckets[int(seconds * 1000000).bit_length()] += 1
+
+    def percentile(self, percent):
+        """
+        Returns upper bound (in seconds) of the bucket holding given percentile of calls
+        """
+        if not self.count:
+            return None
+        needed = self.count * percent / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= needed:
+                return min((1 << bucket) / 1000000, self.maximum)
+        return self.maximum
+
+    def snapshot(self):
+        result = {
+            'count': self.count,
+            'total': self.total,
+            'min': self.minimum,
+            'max': self.maximum,
+            'mean': self.total / self.count if self.count else None
+        }
+        for percent in PERCENTILES:
+            result[f'p{percent}'] = self.percentile(percent)
+        return result
+
+
+class _Span:
+    """
+    Context manager timing one span and recording it in metrics
+    """
+    __slots__ = ('_metrics', '_name', '_start')
+
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._metrics._finish_span(self._name, self._start, time.perf_counter())
+        return False
+
+
+_NULL_SPAN = nullcontext()
+
+
+class Metrics:
+    """
+    Class Metrics. Counters, latency histograms and recent spans. Contains atributes:
+    :param enabled: True if anything is measured
+    :type enabled: bool
+    :param counters: counted events, by name
+    :type counters: Counter
+    :param timers: latency histograms, by name
+    :type timers: dict of Histogram
+    :param spans: the latest SPANS_LIMIT spans as (name, start, duration) tuples
+    :type spans: deque
+
+    Call sites check enabled before counting, so disabled metrics cost one attribute lookup.
+    Functions registered with instrument are wrapped only while metrics are enabled
+    """
+    def __init__(self):
+        self.enabled = False
+        self._instrumented = []
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets every measurement
+        """
+        self.counters = Counter()
+        self.timers = {}
+        self.spans = deque(maxlen=SPANS_LIMIT)
+
+    def enable(self):
+        """
+        Starts measuring and wraps every instrumented function with a timer
+        """
+        if not self.enabled:
+            self.enabled = True
+            for target in self._instrumented:
+                self._wrap(*target)
+
+    def disable(self):
+        """
+        Stops measuring and restores instrumented functions (measurements are kept)
+        """
+        if self.enabled:
+            self.enabled = False
+            for owner, attribute, _, _ in self._instrumented:
+                setattr(owner, attribute, owner.__dict__[attribute].__wrapped__)
+
+    def instrument(self, owner, attribute, name=None, span=False):
+        """
+        Registers function (or method) stored as owner's attribute to be timed while metrics are enabled.
+        Calls of functions registered with span=True are also recorded as spans
+        """
+        target = (owner, attribute, name or f'{owner.__name__}.{attribute}', span)
+        self._instrumented.append(target)
+        if self.enabled:
+            self._wrap(*target)
+
+    def _wrap(self, owner, attribute, name, span):
+        function = owner.__dict__[attribute]
+        observe = self._finish_span if span else self._observe
+        clock = time.perf_counter
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(name, start, clock())
+        setattr(owner, attribute, timed)
+
+    def _observe(self, name, start, end):
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Histogram()
+        timer.add(end - start)
+
+    def _finish_span(self, name, start, end):
+        self._observe(name, start, end)
+        self.spans.append((name, start, end - start))
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def span(self, name):
+        """
+        Returns context manager recording a span (shared no-op one if metrics are disabled)
+        """
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def snapshot(self):
+        """
+        Returns dictionary with counters, timers' statistics and recent spans
+        """
+        return {
+            'counters': dict(self.counters),
+            'timers': {name: timer.snapshot() for name, timer in sorted(self.timers.items())},
+            'spans': [{'name': name, 'start': start, 'duration': duration} for name, start, duration in self.spans]
+        }
+
+    def report(self):
+        """
+        Returns text report of counters and timers
+        """
+        lines = ['Counters:']
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'  {name:36} {value:>12}')
+        lines.append('Timers (us):')
+        lines.append(f'  {"name":36} {"count":>9} {"mean":>10} {"p50":>10} {"p90":>10} {"p99":>10} {"max":>10}')
+        for name, timer in sorted(self.timers.items()):
+            statistics = timer.snapshot()
+            values = ' '.join(
+                f'{statistics[key] * 1000000:10.1f}' for key in ['mean', 'p50', 'p90', 'p99', 'max']
+            )
+            lines.append(f'  {name:36} {timer.count:>9} {values}')
+        return '\n'.join(lines)
+
+
+METRICS = Metrics()
+
+
+@contextmanager
+def profile_game(path=None):
+    """
+    Captures full cProfile profile of everything run inside (e.g. a single game).
+    Yields the profiler, the profile is saved to path if given
+    """
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path is not None:
+            profiler.dump_stats(path)
+
+
+def profile_report(profiler, limit=20, sort='cumulative'):
+    """
+    Returns text table of the most expensive functions of a profile
+    """
+    import io
+    import pstats
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
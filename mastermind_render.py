@@ -0,0 +1,152 @@
+import os
+import shutil
+import sys
+from functools import lru_cache
+from colorama import Back
+from mastermind_metrics import METRICS
+
+
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+CLEAR_BELOW = '\x1b[J'
+ROW_HEIGHT = 3
+PROMPT_LINES = 6
+
+
+if os.name == 'nt':
+    import colorama
+    if hasattr(colorama, 'just_fix_windows_console'):
+        colorama.just_fix_windows_console()
+    else:
+        colorama.init()
+
+
+PEG_BACKGROUNDS = {
+    'RED': Back.RED,
+    'GREEN': Back.GREEN,
+    'YELLOW': Back.YELLOW,
+    'BLUE': Back.BLUE,
+    'MAGENTA': Back.MAGENTA,
+    'ORANGE': Back.LIGHTRED_EX,
+    'LIME': Back.LIGHTGREEN_EX,
+    'GOLD': Back.LIGHTYELLOW_EX,
+    'SKY': Back.LIGHTBLUE_EX,
+    'PINK': Back.LIGHTMAGENTA_EX,
+    'WHITE': Back.WHITE,
+    'CYAN': Back.CYAN
+}
+
+
+def peg_string(peg):
+    """
+    Returns ANSI string of one peg (a space on peg's color background, a plain space for empty peg)
+    """
+    if peg.name not in PEG_BACKGROUNDS:
+        return ' '
+    return f'{PEG_BACKGROUNDS[peg.name]} {Back.RESET}'
+
+
+def move_to(line):
+    """
+    Returns ANSI sequence moving cursor to the beginning of given line (counted from 1)
+    """
+    return f'\x1b[{line};1H'
+
+
+def row_width(row_length):
+    """
+    Returns amount of columns a rendered row of given length takes
+    """
+    return row_length * 10 + 2
+
+
+@lru_cache(maxsize=4096)
+def render_row(pegs, key_pegs):
+    """
+    Returns string representation of a row with given pegs and key pegs (tuples of Pegs)
+    """
+    code_string = ''.join([f'|  {peg_string(peg) * 2}  |' for peg in pegs])
+    keys_string = ''.join([f' {peg_string(key)}' for key in key_pegs])
+    border = '|' + '-' * ((len(pegs) * 8) - 2) + '|' + '-' * (len(pegs) * 2 + 1) + '|'
+    return f'{border}\n{code_string}{keys_string} |\n{border}'
+
+
+def write(text, stream=None):
+    """
+    Writes text to stream (standard output by default) with one write call and flushes it
+    """
+    stream = sys.stdout if stream is None else stream
+    stream.write(text)
+    stream.flush()
+
+
+def clear(stream=None):
+    """
+    Clears the terminal with ANSI sequence (no subprocess)
+    """
+    write(CLEAR_SCREEN, stream)
+
+
+class BoardRenderer:
+    """
+    Class BoardRenderer. Draws game's board at the top of the terminal.
+    Remembers what every row on screen shows and redraws only the rows which changed
+    since the previous frame. Everything below the board is cleared with every frame.
+    Board which does not fit the terminal (with PROMPT_LINES below it) is redrawn whole,
+    as the terminal scrolls and rows are not on the lines they were drawn at.
+    Contains atributes:
+    :param stream: stream frames are written to (standard output if None)
+    :type stream: file
+    :param terminal_size: size the board has to fit in (size of the terminal checked with every frame if None)
+    :type terminal_size: os.terminal_size
+    """
+    def __init__(self, stream=None, terminal_size=None):
+        self.stream = stream
+        self.terminal_size = terminal_size
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Forgets what is on screen, so the next frame redraws everything
+        """
+        self._drawn = []
+
+    def fits(self, game):
+        """
+        Checks if game's board and prompts below it fit the terminal
+        """
+        columns, lines = self.terminal_size or shutil.get_terminal_size()
+        height = len(game.rows_list) * ROW_HEIGHT + 1 + PROMPT_LINES
+        return height <= lines and row_width(game.geometry.row_length) <= columns
+
+    def render(self, game):
+        """
+        Returns ANSI text of the next frame and remembers it as drawn
+        """
+        rows = [(tuple(row.pegs), tuple(row.key_pegs)) for row in game.board()]
+        parts = []
+        if not self.fits(game):
+            self._drawn = []
+            return CLEAR_SCREEN + '\n'.join([render_row(*state) for state in rows]) + '\n'
+        if len(rows) != len(self._drawn):
+            parts.append(CLEAR_SCREEN)
+            parts.append('\n'.join([render_row(*state) for state in rows]))
+        else:
+            for index, (state, drawn_state) in enumerate(zip(rows, self._drawn)):
+                if state != drawn_state:
+                    parts.append(move_to(index * ROW_HEIGHT + 1))
+                    parts.append(render_row(*state))
+        parts.append(move_to(len(rows) * ROW_HEIGHT + 1))
+        parts.append(CLEAR_BELOW)
+        parts.append('\n')
+        self._drawn = rows
+        return ''.join(parts)
+
+    def draw(self, game):
+        """
+        Writes the next frame with a single write call
+        """
+        write(self.render(game), self.stream)
+
+
+METRICS.instrument(BoardRenderer, 'render')
+METRICS.instrument(BoardRenderer, 'draw')
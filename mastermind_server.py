@@ -0,0 +1,265 @@
+import asyncio
+from argparse import ArgumentParser
+from mastermind_metrics import METRICS
+from mastermind_classes import (
+    Game,
+    Gamemode,
+    Player,
+    TurnState,
+    InvalidPegColorError,
+    InvalidAmountOfPegsError,
+    InvalidRoundsError,
+    InvalidGeometryError,
+    get_geometry,
+    test_pegs_colors
+)
+
+
+BACKLOG = 1024
+MAX_SERVER_CODES = 8 ** 5
+GAMEMODES = {'1': Gamemode.PVP, '2': Gamemode.PVE, '3': Gamemode.PVE_SMART}
+
+
+class SessionClosedError(Exception):
+    def __init__(self):
+        super().__init__('Client closed the session')
+
+
+class GeometryTooLargeError(Exception):
+    def __init__(self):
+        super().__init__(f'Server plays geometries with at most {MAX_SERVER_CODES} possible codes')
+
+
+class InvalidLineError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class Session:
+    """
+    Class Session. One client connection playing games, one Game at a time. Contains atributes:
+    :param reader: stream the client's lines are read from
+    :type reader: asyncio.StreamReader
+    :param writer: stream lines are sent to
+    :type writer: asyncio.StreamWriter
+    :param game: game played in the session (None before NEW command)
+    :type game: Game
+
+    Protocol is line based, words are separated by spaces. Client sends
+    'NEW <gamemode 1-3> <rounds> [<row length> <amount of colors>]', colors when asked and 'QUIT'.
+    Server answers with:
+    'CODE <player>' / 'GUESS <player> <row>' asking the player (1 or 2) for colors,
+    'ROW <row> <colors separated by commas> <white> <cyan>' after every guess,
+    'TURN <codemaker> <codebreaker> WON|LOST <points> <code>' after every codebreaking sequence,
+    'POINTS <player 1 points> <player 2 points>' after every round,
+    'END <winner>|TIE' after the game and 'ERR <message>' after an invalid line.
+    Bots' moves are computed in the default executor, so they do not stall other sessions
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.game = None
+
+    def send(self, *words):
+        """
+        Queues line made of words (without waiting for the client)
+        """
+        self.writer.write((' '.join(map(str, words)) + '\n').encode())
+
+    async def receive(self):
+        """
+        Sends queued lines and returns list of words of the next client's line.
+        Raises InvalidLineError if the line is too long (it is skipped) or not valid UTF-8
+        """
+        await self.writer.drain()
+        try:
+            line = await self.reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as error:
+            line = error.partial
+        except asyncio.LimitOverrunError:
+            await self._skip_line()
+            raise InvalidLineError('Line is too long')
+        if not line:
+            raise SessionClosedError
+        try:
+            words = line.decode().split()
+        except UnicodeDecodeError:
+            raise InvalidLineError('Line is not valid UTF-8')
+        if words and words[0].upper() == 'QUIT':
+            raise SessionClosedError
+        return words
+
+    async def _skip_line(self):
+        """
+        Discards the rest of a line longer than the stream's limit
+        """
+        while True:
+            try:
+                await self.reader.readuntil(b'\n')
+                return
+            except asyncio.LimitOverrunError as error:
+                await self.reader.readexactly(error.consumed)
+            except asyncio.IncompleteReadError:
+                raise SessionClosedError
+
+    async def run(self):
+        """
+        Plays games until the client quits
+        """
+        self.send('HELLO', 'MASTERMIND')
+        try:
+            while True:
+                try:
+                    words = await self.receive()
+                except InvalidLineError as error:
+                    self.send('ERR', error)
+                    continue
+                if not words:
+                    continue
+                if words[0].upper() != 'NEW':
+                    self.send('ERR', 'Unknown command')
+                    continue
+                game = self._create_game(words[1:])
+                if game is not None:
+                    await self.play_game(game)
+        except (SessionClosedError, ConnectionError):
+            pass
+        finally:
+            self.writer.close()
+
+    def _create_game(self, arguments):
+        """
+        Creates game from NEW command arguments, sends ERR if they are invalid
+        """
+        try:
+            gamemode = GAMEMODES[arguments[0]]
+            rounds = int(arguments[1])
+            geometry = get_geometry(*map(int, arguments[2:4]))
+            if geometry.codes_count > MAX_SERVER_CODES:
+                raise GeometryTooLargeError
+            return Game(gamemode, rounds, geometry=geometry)
+        except (IndexError, KeyError, ValueError, TypeError):
+            self.send('ERR', 'Usage: NEW <gamemode 1-3> <rounds> [<row length> <amount of colors>]')
+        except (InvalidRoundsError, InvalidGeometryError, GeometryTooLargeError) as error:
+            self.send('ERR', error)
+        return None
+
+    async def play_game(self, game):
+        """
+        Drives game's turns until the last round is over
+        """
+        self.game = game
+        player1, player2 = game.players_list
+        state = None
+        while state != TurnState.GAME_OVER:
+            state = await self.play_turn()
+            if state != TurnState.TURN_OVER:
+                self.send('POINTS', player1.points, player2.points)
+        winner = game.winner()
+        self.send('END', 'TIE' if winner is None else game.players_list.index(winner) + 1)
+
+    async def get_colors(self, player, request, *words):
+        """
+        Returns colors of a code or a guess. Humans are asked (until they send correct colors), bots decide at once
+        """
+        if type(player) != Player:
+            move = player.code_pegs_colors if request == 'CODE' else player.guess_pegs_colors
+            return await asyncio.get_running_loop().run_in_executor(None, move)
+        while True:
+            self.send(request, self.game.players_list.index(player) + 1, *words)
+            try:
+                colors = await self.receive()
+                test_pegs_colors(colors, self.game.geometry)
+            except (InvalidLineError, InvalidPegColorError, InvalidAmountOfPegsError) as error:
+                self.send('ERR', error)
+            else:
+                return colors
+
+    async def play_turn(self):
+        """
+        Plays the next codebreaking sequence of the game and returns the state after it
+        """
+        game = self.game
+        with METRICS.span('Session.play_turn'):
+            game.start_turn()
+            turn = game.turn
+            game.set_code(await self.get_colors(turn.chosing_player, 'CODE'))
+            state = TurnState.GUESS
+            while state == TurnState.GUESS:
+                index = len(turn.guesses) + 1
+                state = game.submit_guess(await self.get_colors(turn.guessing_player, 'GUESS', index))
+                white, cyan = game.geometry.unpack_feedback(game.current_row.feedback)
+                self.send('ROW', index, ','.join(game.current_row.colors), white, cyan)
+        self.send(
+            'TURN',
+            game.players_list.index(turn.chosing_player) + 1,
+            game.players_list.index(turn.guessing_player) + 1,
+            'WON' if turn.guessed else 'LOST',
+            turn.points,
+            ','.join(turn.code)
+        )
+        return state
+
+
+async def handle_session(reader, writer):
+    await Session(reader, writer).run()
+
+
+async def start_server(host='127.0.0.1', port=0, path=None, backlog=BACKLOG):
+    """
+    Starts server on TCP host and port (or Unix socket path) and returns asyncio.Server.
+    backlog is the amount of connections waiting to be accepted (asyncio default of 100 stalls big bursts)
+    """
+    if path is not None:
+        return await asyncio.start_unix_server(handle_session, path, backlog=backlog)
+    return await asyncio.start_server(handle_session, host, port, backlog=backlog)
+
+
+class Client:
+    """
+    Class Client. Minimal client of the server, used for tests and scripted sessions
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=None, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def send(self, *words):
+        self.writer.write((' '.join(map(str, words)) + '\n').encode())
+        await self.writer.drain()
+
+    async def receive(self):
+        """
+        Returns list of words of the next server's line (empty list if connection was closed)
+        """
+        return (await self.reader.readline()).decode().split()
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(host, port, path):
+    server = await start_server(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = ArgumentParser(description='Mastermind server, one game per connection')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='path of Unix socket to listen on instead of TCP')
+    arguments = parser.parse_args()
+    asyncio.run(serve(arguments.host, arguments.port, arguments.unix))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,417 @@
+import random
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict
+from itertools import compress
+from math import log2
+from mastermind_codes import STANDARD
+from mastermind_metrics import METRICS
+
+
+MAX_SCORED_CANDIDATES = 2000
+MAX_SCORED_GUESSES = 1500
+MAX_SCORED_PAIRS = 500000
+ENTROPY_CHUNK = 64
+ENTROPY_SCORED_PAIRS = 3000000
+CACHE_CAPACITY = 65536
+
+
+def feedback_row(guess, geometry=STANDARD):
+    """
+    Returns bytes with packed feedbacks of guess compared to every code (indexed by code)
+    """
+    return geometry.feedback_row(guess)
+
+
+def score_candidates(guess, candidates, geometry=STANDARD):
+    """
+    Returns sequence of packed feedbacks of guess compared to every code in candidates
+    """
+    return geometry.batch(candidates).score(guess)
+
+
+def filter_candidates(candidates, guess, guess_feedback, geometry=STANDARD):
+    """
+    Returns array of candidates which give guess_feedback when compared to guess
+    """
+    scores = score_candidates(guess, candidates, geometry)
+    return array('I', compress(candidates, map(guess_feedback.__eq__, scores)))
+
+
+def consistent_codes(history, geometry=STANDARD):
+    """
+    Returns list of codes consistent with every (guess, feedback) pair in history
+    """
+    candidates = range(geometry.codes_count)
+    for guess, guess_feedback in history:
+        candidates = filter_candidates(candidates, guess, guess_feedback, geometry)
+    return list(candidates)
+
+
+def partition_sizes(guess, candidates, geometry=STANDARD):
+    """
+    Returns Counter of candidates amount for every feedback guess may get
+    """
+    return Counter(score_candidates(guess, candidates, geometry))
+
+
+def _sample(codes, amount, seed):
+    """
+    Returns sorted list of at most amount codes, chosen deterministically (global random is not used)
+    """
+    if len(codes) <= amount:
+        return list(codes)
+    return sorted(random.Random(seed).sample(codes, amount))
+
+
+def _guess_pool(candidates, amount, geometry):
+    """
+    Returns guesses worth scoring: every code if there are at most amount of them,
+    otherwise a deterministic sample made of candidates and other codes
+    """
+    if geometry.codes_count <= amount:
+        return range(geometry.codes_count)
+    pool = _sample(candidates, amount // 2, len(candidates))
+    pool += _sample(range(geometry.codes_count), amount - len(pool), geometry.codes_count)
+    return sorted(set(pool))
+
+
+def minimax_guess(candidates, guesses=None, geometry=STANDARD, history=None):
+    """
+    Chooses guess (Knuth's algorithm) minimizing the size of the largest feedback partition of candidates.
+    Ties are broken in favour of guesses which are still candidates, then of the lowest code.
+    In big code spaces partitions are estimated on a sample of at most MAX_SCORED_CANDIDATES
+    candidates, and at most MAX_SCORED_GUESSES guesses and MAX_SCORED_PAIRS (guess, candidate) pairs are scored.
+    If history candidates come from is given, guesses symmetric to a lower one are not scored
+    """
+    if len(candidates) == 1:
+        return candidates[0]
+    scored = _sample(candidates, MAX_SCORED_CANDIDATES, len(candidates))
+    batch = geometry.batch(candidates if len(scored) == len(candidates) else scored)
+    if guesses is None:
+        amount = max(1, min(MAX_SCORED_GUESSES, MAX_SCORED_PAIRS // len(scored)))
+        guesses = _guess_pool(candidates, amount, geometry)
+        if history is not None:
+            from mastermind_symmetry import prune_symmetric_guesses
+            guesses = prune_symmetric_guesses(guesses, history, geometry)
+    candidates_set = candidates if isinstance(candidates, range) else set(candidates)
+    best_guess = None
+    best_key = None
+    for guess in guesses:
+        worst_case = max(Counter(batch.score(guess)).values())
+        key = (worst_case, guess not in candidates_set, guess)
+        if best_key is None or key < best_key:
+            best_guess = guess
+            best_key = key
+    return best_guess
+
+
+def _entropy_key(batch, guess, is_candidate):
+    """
+    Returns sorting key of guess (lower is better): sum of s * log2(s) over sizes s of feedback partitions
+    (the lower, the higher expected information), then guesses which are candidates, then the lowest code.
+    Sizes are summed in sorted order, so guesses splitting candidates the same way get equal keys
+    """
+    cost = sum(size * log2(size) for size in sorted(Counter(batch.score(guess)).values()))
+    return (cost, not is_candidate, guess)
+
+
+def _best_entropy_key(batch, guesses, flags, deadline=None):
+    """
+    Returns the best key of guesses (flags tell which are candidates). After deadline
+    (time.time() value) no more guesses are scored, but at least one always is
+    """
+    best_key = None
+    for guess, is_candidate in zip(guesses, flags):
+        if deadline is not None and best_key is not None and time.time() > deadline:
+            break
+        key = _entropy_key(batch, guess, is_candidate)
+        if best_key is None or key < best_key:
+            best_key = key
+    return best_key
+
+
+def entropy_guess(candidates, guesses=None, geometry=STANDARD, budget=None, scorer=None, history=None):
+    """
+    Chooses guess maximizing expected information gained (entropy of feedback partition of candidates).
+    Ties are broken in favour of guesses which are still candidates, then of the lowest code.
+    Candidates and guesses are sampled as in minimax_guess (but up to ENTROPY_SCORED_PAIRS pairs
+    are scored), candidates are scored first.
+    budget is the time in seconds the choice may take (best guess scored so far is returned then),
+    scorer (GuessScorer) scores chunks of guesses in worker processes,
+    history is used to skip symmetric guesses as in minimax_guess
+    """
+    if len(candidates) == 1:
+        return candidates[0]
+    deadline = None if budget is None else time.time() + budget
+    scored = _sample(candidates, MAX_SCORED_CANDIDATES, len(candidates))
+    candidates_set = candidates if isinstance(candidates, range) else set(candidates)
+    if guesses is None:
+        amount = max(1, min(MAX_SCORED_GUESSES, ENTROPY_SCORED_PAIRS // len(scored)))
+        pool = _guess_pool(candidates, amount, geometry)
+        if history is not None:
+            from mastermind_symmetry import prune_symmetric_guesses
+            pool = prune_symmetric_guesses(pool, history, geometry)
+        guesses = [guess for guess in pool if guess in candidates_set]
+        guesses += [guess for guess in pool if guess not in candidates_set]
+    flags = bytes(guess in candidates_set for guess in guesses)
+    if scorer is not None:
+        return scorer.best_key(geometry, scored, guesses, flags, deadline)[2]
+    batch = geometry.batch(candidates if len(scored) == len(candidates) else scored)
+    return _best_entropy_key(batch, guesses, flags, deadline)[2]
+
+
+_WORKER = {}
+
+
+def _init_scorer_worker(scored, guesses, flags):
+    """
+    Remembers shared arrays in a worker process of GuessScorer
+    """
+    _WORKER.update(scored=scored, guesses=guesses, flags=flags, move=None, batch=None)
+
+
+def _score_guesses_chunk(task):
+    """
+    Returns the best entropy key of a chunk of shared guesses. Batch of shared scored codes
+    is built once per move in every worker
+    """
+    geometry, move, amount, start, stop, deadline = task
+    if _WORKER['move'] != move:
+        codes = array('I')
+        codes.frombytes(memoryview(_WORKER['scored']).cast('B')[:amount * codes.itemsize])
+        _WORKER['batch'] = geometry.batch(codes)
+        _WORKER['move'] = move
+    guesses = _WORKER['guesses'][start:stop]
+    flags = _WORKER['flags'][start:stop]
+    return _best_entropy_key(_WORKER['batch'], guesses, flags, deadline)
+
+
+class GuessScorer:
+    """
+    Class GuessScorer. Pool of worker processes scoring guesses of entropy_guess in chunks. Contains atributes:
+    :param processes: amount of worker processes (amount of CPUs if None)
+    :type processes: int
+    :param chunk_size: amount of guesses scored by one task
+    :type chunk_size: int
+
+    Scored codes, guesses and candidate flags of a move are written to shared read-only arrays
+    (allocated once, for MAX_SCORED_CANDIDATES codes and MAX_SCORED_GUESSES guesses),
+    tasks only carry their bounds. Use as a context manager or call close
+    """
+    def __init__(self, processes=None, chunk_size=ENTROPY_CHUNK):
+        from multiprocessing import Pool
+        from multiprocessing.sharedctypes import RawArray
+        self.chunk_size = chunk_size
+        self._scored = RawArray('I', MAX_SCORED_CANDIDATES)
+        self._guesses = RawArray('I', MAX_SCORED_GUESSES)
+        self._flags = RawArray('B', MAX_SCORED_GUESSES)
+        self._pool = Pool(processes, _init_scorer_worker, (self._scored, self._guesses, self._flags))
+        self._move = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._pool.terminate()
+        self._pool.join()
+
+    def best_key(self, geometry, scored, guesses, flags, deadline=None):
+        """
+        Returns the best entropy key of guesses against scored codes (at most MAX_SCORED_CANDIDATES of them).
+        Guesses are scored in windows of MAX_SCORED_GUESSES
+        """
+        self._move += 1
+        self._scored[:len(scored)] = scored
+        best_key = None
+        capacity = len(self._guesses)
+        for offset in range(0, len(guesses), capacity):
+            window = guesses[offset:offset + capacity]
+            self._guesses[:len(window)] = window
+            self._flags[:len(window)] = flags[offset:offset + capacity]
+            tasks = [
+                (geometry, self._move, len(scored), start, min(start + self.chunk_size, len(window)), deadline)
+                for start in range(0, len(window), self.chunk_size)
+            ]
+            for key in self._pool.map(_score_guesses_chunk, tasks):
+                if best_key is None or key < best_key:
+                    best_key = key
+            if deadline is not None and time.time() > deadline:
+                break
+        return best_key
+
+
+def history_key(strategy, geometry, history):
+    """
+    Returns canonical key of a board history (list of (guess, feedback) pairs). Order of rows
+    does not change codes left, so pairs are sorted and packed into bytes
+    """
+    packed = array('I')
+    for guess, guess_feedback in sorted(history):
+        packed.append(guess)
+        packed.append(guess_feedback)
+    return (strategy, geometry, packed.tobytes())
+
+
+class SolverCache:
+    """
+    Class SolverCache. Guesses chosen for board histories, shared by every game of a process. Contains atributes:
+    :param capacity: amount of remembered guesses (the least recently used ones are evicted, nothing is kept if 0)
+    :type capacity: int
+    :param hits: amount of lookups answered from the cache
+    :type hits: int
+    :param misses: amount of lookups which had to compute the guess
+    :type misses: int
+    :param evictions: amount of evicted guesses
+    :type evictions: int
+
+    Every access holds a lock, so threads and asyncio tasks may share the cache.
+    Guesses are computed outside the lock (two threads missing the same key both compute it)
+    """
+    def __init__(self, capacity=CACHE_CAPACITY):
+        self.capacity = capacity
+        self._guesses = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._guesses)
+
+    def get(self, key):
+        """
+        Returns guess remembered for key (None if there is none)
+        """
+        with self._lock:
+            guess = self._guesses.get(key)
+            if guess is None:
+                self.misses += 1
+            else:
+                self._guesses.move_to_end(key)
+                self.hits += 1
+        if METRICS.enabled:
+            METRICS.count('solver_cache_misses' if guess is None else 'solver_cache_hits')
+        return guess
+
+    def put(self, key, guess):
+        """
+        Remembers guess for key, evicts the least recently used guesses over capacity
+        """
+        with self._lock:
+            self._guesses[key] = guess
+            self._guesses.move_to_end(key)
+            evicted = 0
+            while len(self._guesses) > self.capacity:
+                self._guesses.popitem(last=False)
+                evicted += 1
+            self.evictions += evicted
+        if evicted and METRICS.enabled:
+            METRICS.count('solver_cache_evictions', evicted)
+
+    def guess(self, key, search):
+        """
+        Returns guess remembered for key, otherwise calls search and remembers its guess
+        """
+        guess = self.get(key)
+        if guess is None:
+            guess = search()
+            self.put(key, guess)
+        return guess
+
+    def clear(self):
+        """
+        Forgets every guess and resets counters
+        """
+        with self._lock:
+            self._guesses.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._guesses),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+SOLVER_CACHE = SolverCache()
+
+
+class CandidateSet:
+    """
+    Class CandidateSet. Set of codes consistent with every feedback given so far. Contains atributes:
+    :param codes: codes still possible to be the coded one (range or array of packed codes)
+    :type codes: sequence of int
+    :param history: list of (guess, feedback) pairs the set was narrowed by
+    :type history: list
+    :param geometry: geometry of codes
+    :type geometry: Geometry
+
+    Pairs added with record are applied when codes are read next, so games nobody asks
+    for candidates (e.g. player versus player) never filter them
+    """
+    def __init__(self, geometry=STANDARD):
+        self.geometry = geometry
+        self.reset()
+
+    @property
+    def codes(self):
+        self._apply()
+        return self._codes
+
+    @property
+    def history(self):
+        return self._history
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        return iter(self.codes)
+
+    def __contains__(self, code):
+        return code in self.codes
+
+    def reset(self, codes=None, history=()):
+        """
+        Makes every code possible again (or restores given codes narrowed by given history)
+        """
+        self._codes = range(self.geometry.codes_count) if codes is None else codes
+        self._history = list(history)
+        self._pending = 0
+
+    def record(self, guess, guess_feedback):
+        """
+        Adds (guess, feedback) pair to history, codes inconsistent with it are removed when codes are read next
+        """
+        self._history.append((guess, guess_feedback))
+        self._pending += 1
+
+    def narrow(self, guess, guess_feedback):
+        """
+        Removes codes inconsistent with guess getting guess_feedback. Returns amount of removed codes
+        """
+        amount = len(self.codes)
+        self.record(guess, guess_feedback)
+        return amount - len(self.codes)
+
+    def _apply(self):
+        """
+        Removes codes inconsistent with recorded pairs which were not applied yet
+        """
+        if not self._pending:
+            return
+        amount = len(self._codes)
+        for guess, guess_feedback in self._history[-self._pending:]:
+            self._codes = filter_candidates(self._codes, guess, guess_feedback, self.geometry)
+        self._pending = 0
+        if METRICS.enabled:
+            METRICS.count('candidates_pruned', amount - len(self._codes))
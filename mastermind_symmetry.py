@@ -0,0 +1,193 @@
+from collections import Counter
+from functools import lru_cache
+from itertools import permutations, product
+from math import factorial
+from mastermind_codes import STANDARD
+
+
+MAX_PERMUTATIONS = 720
+SYMMETRY_LIMIT = 2000000
+DIGITS_LIMIT = 65536
+
+
+def digits_to_code(digits, geometry=STANDARD):
+    """
+    Packs tuple of color indexes into an integer
+    """
+    code = 0
+    for digit in digits:
+        code = code * len(geometry.colors) + digit
+    return code
+
+
+@lru_cache(maxsize=None)
+def _digits_table(geometry):
+    """
+    Returns list of digits of every code (product yields them in the order of packed codes)
+    """
+    return list(product(range(len(geometry.colors)), repeat=geometry.row_length))
+
+
+def _code_to_digits(geometry):
+    """
+    Returns function unpacking codes into digits (table lookup in small code spaces)
+    """
+    if geometry.codes_count <= DIGITS_LIMIT:
+        return _digits_table(geometry).__getitem__
+    return geometry.code_to_digits
+
+
+class Transform:
+    """
+    Class Transform. Symmetry of the game: permutation of peg positions and renaming of colors. Contains atributes:
+    :param geometry: geometry of transformed codes
+    :type geometry: Geometry
+    :param positions: position every peg of a transformed code is taken from
+    :type positions: tuple of int
+    :param colors: index of the color every color index is renamed to
+    :type colors: tuple of int
+
+    Feedback of two codes does not change when both are transformed the same way
+    """
+    __slots__ = ('geometry', 'positions', 'colors')
+
+    def __init__(self, geometry, positions, colors):
+        self.geometry = geometry
+        self.positions = tuple(positions)
+        self.colors = tuple(colors)
+
+    @classmethod
+    def identity(cls, geometry=STANDARD):
+        return cls(geometry, range(geometry.row_length), range(len(geometry.colors)))
+
+    def __eq__(self, other):
+        return isinstance(other, Transform) and (self.geometry, self.positions, self.colors) == (
+            other.geometry, other.positions, other.colors
+        )
+
+    def __hash__(self):
+        return hash((self.geometry, self.positions, self.colors))
+
+    def apply(self, code):
+        digits = self.geometry.code_to_digits(code)
+        return digits_to_code([self.colors[digits[position]] for position in self.positions], self.geometry)
+
+    def inverse(self):
+        positions = [0] * len(self.positions)
+        for index, position in enumerate(self.positions):
+            positions[position] = index
+        colors = [0] * len(self.colors)
+        for color, renamed in enumerate(self.colors):
+            colors[renamed] = color
+        return Transform(self.geometry, positions, colors)
+
+    def invert(self, code):
+        """
+        Returns code which apply maps to given code
+        """
+        return self.inverse().apply(code)
+
+
+def _searchable(geometry):
+    """
+    Checks if every permutation of positions may be tried
+    """
+    return factorial(geometry.row_length) <= MAX_PERMUTATIONS
+
+
+def canonicalize(history, geometry=STANDARD):
+    """
+    Returns (canonical history, Transform mapping history to it). Canonical history is the lowest one
+    (comparing codes of guesses in order) among histories symmetric to the given one, so symmetric
+    histories of (guess, feedback) pairs share it. Geometries with more than MAX_PERMUTATIONS
+    permutations of positions are not reduced (identity transform is returned)
+    """
+    if not history or not _searchable(geometry):
+        return list(history), Transform.identity(geometry)
+    guesses = [geometry.code_to_digits(guess) for guess, _ in history]
+    best = None
+    for positions in permutations(range(geometry.row_length)):
+        renamed = {}
+        sequence = []
+        for digits in guesses:
+            for position in positions:
+                color = renamed.setdefault(digits[position], len(renamed))
+                sequence.append(color)
+        if best is None or sequence < best[0]:
+            best = (sequence, positions, renamed)
+    _, positions, renamed = best
+    for color in range(len(geometry.colors)):
+        renamed.setdefault(color, len(renamed))
+    transform = Transform(geometry, positions, [renamed[color] for color in range(len(geometry.colors))])
+    return [(transform.apply(guess), guess_feedback) for guess, guess_feedback in history], transform
+
+
+def _stabilizer(guesses, geometry):
+    """
+    Returns list of (positions, colors mapping) pairs of transforms keeping every guess (tuple of digits) in place.
+    Only colors used by guesses are mapped, the others may be renamed freely
+    """
+    result = []
+    for positions in permutations(range(geometry.row_length)):
+        mapping = {}
+        for digits in guesses:
+            if any(mapping.setdefault(digits[position], digits[index]) != digits[index]
+                   for index, position in enumerate(positions)):
+                break
+        else:
+            if len(set(mapping.values())) == len(mapping):
+                result.append((positions, mapping))
+    return result
+
+
+def _class_key(digits, stabilizer, amount_of_colors):
+    """
+    Returns the lowest image of digits under transforms of stabilizer, free colors named by first appearance
+    """
+    best = None
+    for positions, mapping in stabilizer:
+        free = {}
+        image = tuple(
+            mapping[digits[position]] if digits[position] in mapping
+            else free.setdefault(digits[position], amount_of_colors + len(free))
+            for position in positions
+        )
+        if best is None or image < best:
+            best = image
+    return best
+
+
+def prune_symmetric_guesses(guesses, history, geometry=STANDARD):
+    """
+    Returns list of guesses without the ones symmetric to an earlier guess under transforms keeping
+    every guess of history in place (such guesses split candidates the same way, so the first one of
+    every class is enough). Guesses are returned unchanged if it would take more than SYMMETRY_LIMIT
+    transforms or the game has no symmetry left
+    """
+    code_to_digits = _code_to_digits(geometry)
+    if not history:
+        seen = set()
+        result = []
+        for guess in guesses:
+            key = tuple(sorted(Counter(code_to_digits(guess)).values()))
+            if key not in seen:
+                seen.add(key)
+                result.append(guess)
+        return result
+    if not _searchable(geometry):
+        return guesses
+    history_guesses = [geometry.code_to_digits(guess) for guess, _ in history]
+    stabilizer = _stabilizer(history_guesses, geometry)
+    used_colors = len(stabilizer[0][1])
+    if len(stabilizer) == 1 and len(geometry.colors) - used_colors < 2:
+        return guesses
+    if len(guesses) * len(stabilizer) > SYMMETRY_LIMIT:
+        return guesses
+    seen = set()
+    result = []
+    for guess in guesses:
+        key = _class_key(code_to_digits(guess), stabilizer, len(geometry.colors))
+        if key not in seen:
+            seen.add(key)
+            result.append(guess)
+    return result
@@ -0,0 +1,174 @@
+import random
+from dataclasses import dataclass, field
+from itertools import combinations
+from multiprocessing import Pool
+from mastermind_classes import Game, Gamemode, BotSmart
+from mastermind_codes import STANDARD
+
+
+class InvalidPlayersNamesError(Exception):
+    def __init__(self):
+        super().__init__("Players taking part in a tournament have to have unique names")
+
+
+class PlayerSpec:
+    """
+    Class PlayerSpec. Picklable recipe of a player, used to create players inside worker processes.
+    Contains atributes:
+    :param player_class: Player subclass to create (BotSmart subclasses get the game, others game's geometry)
+    :type player_class: type
+    :param name: player's name
+    :type name: string
+    :param kwargs: additional arguments passed to player_class
+    :type kwargs: dict
+    """
+    def __init__(self, player_class, name, **kwargs):
+        self.player_class = player_class
+        self.name = name
+        self.kwargs = kwargs
+
+    def create(self, game):
+        """
+        Creates player taking part in given game
+        """
+        if issubclass(self.player_class, BotSmart):
+            return self.player_class(self.name, game, **self.kwargs)
+        return self.player_class(self.name, game.geometry, **self.kwargs)
+
+
+@dataclass
+class TournamentResult:
+    """
+    Class TournamentResult. Merged results of many games. Contains atributes:
+    :param games: amount of played games
+    :type games: int
+    :param points: sum of players' points, by player's name
+    :type points: dict
+    :param wins: amount of won games, by player's name
+    :type wins: dict
+    :param ties: amount of tied games
+    :type ties: int
+    """
+    games: int = 0
+    points: dict = field(default_factory=dict)
+    wins: dict = field(default_factory=dict)
+    ties: int = 0
+
+    def merge(self, other):
+        """
+        Adds other result to this one
+        """
+        self.games += other.games
+        self.ties += other.ties
+        for name, points in other.points.items():
+            self.points[name] = self.points.get(name, 0) + points
+        for name, wins in other.wins.items():
+            self.wins[name] = self.wins.get(name, 0) + wins
+        return self
+
+    def ranking(self):
+        """
+        Returns players' names sorted from the one with the most wins
+        """
+        return sorted(self.wins, key=lambda name: (-self.wins[name], -self.points[name], name))
+
+
+def _chunk_seed(seed, chunk_index):
+    """
+    Returns seed of given chunk, independent of which worker plays it
+    """
+    return f'{seed}-{chunk_index}'
+
+
+def play_games(spec1, spec2, games, rounds=1, amount_of_rows=10, seed=None, geometry=STANDARD):
+    """
+    Plays given amount of games between two players in this process and returns TournamentResult
+    """
+    if spec1.name == spec2.name:
+        raise InvalidPlayersNamesError
+    if seed is not None:
+        random.seed(seed)
+    game = Game(Gamemode.PVE, rounds, amount_of_rows, geometry)
+    player1 = spec1.create(game)
+    player2 = spec2.create(game)
+    game.players_list = [player1, player2]
+    result = TournamentResult(points={spec1.name: 0, spec2.name: 0}, wins={spec1.name: 0, spec2.name: 0})
+    for _ in range(games):
+        player1.points = 0
+        player2.points = 0
+        winner = game.play().winner
+        result.points[spec1.name] += player1.points
+        result.points[spec2.name] += player2.points
+        if winner is None:
+            result.ties += 1
+        else:
+            result.wins[str(winner)] += 1
+    result.games = games
+    return result
+
+
+def _play_chunk(arguments):
+    spec1, spec2, games, rounds, amount_of_rows, seed, geometry = arguments
+    return play_games(spec1, spec2, games, rounds, amount_of_rows, seed, geometry)
+
+
+def _chunks(pairs, games, rounds, amount_of_rows, chunk_size, seed, geometry):
+    """
+    Splits games of every pair of players into chunks with their own seeds
+    """
+    chunk_index = 0
+    for spec1, spec2 in pairs:
+        for start in range(0, games, chunk_size):
+            amount = min(chunk_size, games - start)
+            yield (spec1, spec2, amount, rounds, amount_of_rows, _chunk_seed(seed, chunk_index), geometry)
+            chunk_index += 1
+
+
+def run_tournament(
+    specs,
+    games,
+    rounds=1,
+    amount_of_rows=10,
+    processes=None,
+    chunk_size=500,
+    seed=0,
+    geometry=STANDARD
+):
+    """
+    Plays given amount of games between every pair of players (round robin) across a process pool.
+    Every chunk of games seeds random with its own seed, so results depend only on seed and
+    chunk_size, not on the amount of processes. Returns merged TournamentResult
+    """
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise InvalidPlayersNamesError
+    pairs = list(combinations(specs, 2))
+    chunks = list(_chunks(pairs, games, rounds, amount_of_rows, chunk_size, seed, geometry))
+    result = TournamentResult(points=dict.fromkeys(names, 0), wins=dict.fromkeys(names, 0))
+    if processes == 1:
+        for chunk in chunks:
+            result.merge(_play_chunk(chunk))
+        return result
+    if geometry.has_table():
+        geometry.feedback_table()
+    with Pool(processes) as pool:
+        for chunk_result in pool.imap_unordered(_play_chunk, chunks):
+            result.merge(chunk_result)
+    return result
+
+
+def run_match(
+    spec1,
+    spec2,
+    games,
+    rounds=1,
+    amount_of_rows=10,
+    processes=None,
+    chunk_size=500,
+    seed=0,
+    geometry=STANDARD
+):
+    """
+    Plays given amount of games between two players across a process pool
+    """
+    return run_tournament([spec1, spec2], games, rounds, amount_of_rows, processes, chunk_size, seed, geometry)
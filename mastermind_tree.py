@@ -0,0 +1,269 @@
+import os
+import struct
+import sys
+import time
+from argparse import ArgumentParser
+from array import array
+from collections import Counter
+from operator import itemgetter
+from mastermind_book import BOOK_DIRECTORY
+from mastermind_codes import get_geometry
+
+
+TREE_MAGIC = b'MMTREE1\0'
+TREE_HEADER = struct.Struct('<8sBBxxI')
+NO_CHILD = 0xFFFFFFFF
+
+
+class InvalidTreeError(Exception):
+    def __init__(self, path):
+        super().__init__(f'File {path} is not a valid strategy tree')
+
+
+class TreeVerificationError(Exception):
+    def __init__(self, colors, amount_of_rows):
+        super().__init__(f'Strategy tree does not solve {",".join(colors)} within {amount_of_rows} rows')
+
+
+def tree_path(geometry, directory=None):
+    """
+    Returns default path of the strategy tree of given geometry
+    """
+    directory = BOOK_DIRECTORY if directory is None else directory
+    return os.path.join(directory, f'tree_{geometry.row_length}x{len(geometry.colors)}.bin')
+
+
+def _first_guesses(geometry):
+    """
+    Returns one code of every class of codes equivalent under permuting colors and positions
+    (colors are used in order, each in one run, runs get shorter), enough for the first guess
+    """
+    guesses = []
+    for code in range(geometry.codes_count):
+        digits = geometry.code_to_digits(code)
+        runs = [digits.count(color) for color in range(max(digits) + 1)]
+        if list(digits) == sorted(digits) and 0 not in runs and runs == sorted(runs, reverse=True):
+            guesses.append(code)
+    return guesses
+
+
+class _OptimalSearch:
+    """
+    Branch and bound search of the strategy minimizing the sum of guesses needed for every secret.
+    A secret in a set of n candidates needs at least 2 * n - 1 guesses in total (when n > 1),
+    which is the bound used to prune guesses
+    """
+    def __init__(self, geometry):
+        self.geometry = geometry
+        self.rows = [geometry.feedback_row(guess) for guess in range(geometry.codes_count)]
+        self.memo = {}
+
+    def best(self, candidates, guesses=None):
+        """
+        Returns (total amount of guesses, best guess) of tuple of candidates
+        """
+        amount = len(candidates)
+        if amount == 1:
+            return 1, candidates[0]
+        if amount == 2:
+            return 3, candidates[0]
+        if candidates in self.memo:
+            return self.memo[candidates]
+        solved = self.geometry.solved
+        options = self._options(candidates, range(len(self.rows)) if guesses is None else guesses)
+        best_total = None
+        best_guess = None
+        for bound, _, guess, column in options:
+            if best_total is not None and bound >= best_total:
+                break
+            partitions = {}
+            for code, guess_feedback in zip(candidates, column):
+                if guess_feedback != solved:
+                    partitions.setdefault(guess_feedback, []).append(code)
+            total = bound
+            for partition in sorted(partitions.values(), key=len, reverse=True):
+                total += self.best(tuple(partition))[0] - (2 * len(partition) - 1)
+                if best_total is not None and total >= best_total:
+                    break
+            else:
+                best_total = total
+                best_guess = guess
+        self.memo[candidates] = (best_total, best_guess)
+        return best_total, best_guess
+
+    def _options(self, candidates, guesses):
+        """
+        Returns list of (bound, not a candidate, guess, feedbacks of candidates) sorted from the most promising guess.
+        Guesses splitting candidates the same way as an earlier one are skipped
+        """
+        solved = self.geometry.solved
+        candidates_set = set(candidates)
+        gather = itemgetter(*candidates)
+        options = []
+        seen = set()
+        for guess in guesses:
+            column = bytes(gather(self.rows[guess]))
+            if column in seen:
+                continue
+            seen.add(column)
+            sizes = Counter(column)
+            if len(sizes) == 1 and solved not in sizes:
+                continue
+            bound = len(candidates) + sum(2 * size - 1 for feedback, size in sizes.items() if feedback != solved)
+            options.append((bound, guess not in candidates_set, guess, column))
+        options.sort()
+        return options
+
+
+class StrategyTree:
+    """
+    Class StrategyTree. Decision tree of guesses: every node has a guess and a child for every feedback
+    (NO_CHILD if the feedback is impossible or solves the code). Contains atributes:
+    :param geometry: geometry the tree was built for
+    :type geometry: Geometry
+    :param guesses: guess of every node (root is node 0)
+    :type guesses: array of int
+    :param children: child of every node for every feedback (row of len(geometry.feedbacks()) items per node)
+    :type children: array of int
+    """
+    _defaults = {}
+
+    def __init__(self, geometry, guesses, children):
+        self.geometry = geometry
+        self.guesses = guesses
+        self.children = children
+        feedbacks = geometry.feedbacks()
+        self._width = len(feedbacks)
+        self._slots = [None] * (max(feedbacks) + 1)
+        for slot, guess_feedback in enumerate(feedbacks):
+            self._slots[guess_feedback] = slot
+
+    def __len__(self):
+        return len(self.guesses)
+
+    def guess(self, node):
+        return self.guesses[node]
+
+    def child(self, node, guess_feedback):
+        """
+        Returns node reached from node after its guess got guess_feedback (None if there is none)
+        """
+        child = self.children[node * self._width + self._slots[guess_feedback]]
+        return None if child == NO_CHILD else child
+
+    @classmethod
+    def build(cls, geometry):
+        """
+        Computes strategy minimizing the expected amount of guesses (exact search, feasible for small geometries)
+        """
+        search = _OptimalSearch(geometry)
+        guesses = array('I')
+        children = array('I')
+        feedbacks = geometry.feedbacks()
+        width = len(feedbacks)
+        stack = [(tuple(range(geometry.codes_count)), None)]
+        while stack:
+            candidates, parent_slot = stack.pop()
+            node = len(guesses)
+            if parent_slot is not None:
+                children[parent_slot] = node
+            first_guesses = _first_guesses(geometry) if node == 0 else None
+            guess = search.best(candidates, first_guesses)[1]
+            guesses.append(guess)
+            children.extend([NO_CHILD] * width)
+            row = search.rows[guess]
+            partitions = {}
+            for code in candidates:
+                if row[code] != geometry.solved:
+                    partitions.setdefault(row[code], []).append(code)
+            for slot, guess_feedback in enumerate(feedbacks):
+                if guess_feedback in partitions:
+                    stack.append((tuple(partitions[guess_feedback]), node * width + slot))
+        return cls(geometry, guesses, children)
+
+    def save(self, path):
+        guesses = array('I', self.guesses)
+        children = array('I', self.children)
+        if sys.byteorder == 'big':
+            guesses.byteswap()
+            children.byteswap()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(TREE_HEADER.pack(TREE_MAGIC, self.geometry.row_length, len(self.geometry.colors), len(guesses)))
+            file.write(guesses.tobytes())
+            file.write(children.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < TREE_HEADER.size:
+            raise InvalidTreeError(path)
+        magic, row_length, amount_of_colors, count = TREE_HEADER.unpack_from(data)
+        geometry = get_geometry(row_length, amount_of_colors)
+        width = len(geometry.feedbacks())
+        if magic != TREE_MAGIC or len(data) != TREE_HEADER.size + count * (width + 1) * 4:
+            raise InvalidTreeError(path)
+        guesses = array('I', data[TREE_HEADER.size:TREE_HEADER.size + count * 4])
+        children = array('I', data[TREE_HEADER.size + count * 4:])
+        if sys.byteorder == 'big':
+            guesses.byteswap()
+            children.byteswap()
+        return cls(geometry, guesses, children)
+
+    @classmethod
+    def default(cls, geometry):
+        """
+        Returns shared tree of given geometry from BOOK_DIRECTORY (None if it was not built)
+        """
+        if geometry not in cls._defaults:
+            path = tree_path(geometry)
+            cls._defaults[geometry] = cls.load(path) if os.path.exists(path) else None
+        return cls._defaults[geometry]
+
+    def verify(self, amount_of_rows=10):
+        """
+        Plays the tree against every secret. Returns Counter of amounts of guesses needed,
+        raises TreeVerificationError if any secret is not solved within amount_of_rows
+        """
+        geometry = self.geometry
+        histogram = Counter()
+        for secret in range(geometry.codes_count):
+            node = 0
+            for turn in range(1, amount_of_rows + 1):
+                guess_feedback = geometry.feedback(secret, self.guesses[node])
+                if guess_feedback == geometry.solved:
+                    histogram[turn] += 1
+                    break
+                node = self.child(node, guess_feedback)
+                if node is None:
+                    break
+            else:
+                node = None
+            if node is None:
+                raise TreeVerificationError(geometry.code_to_colors(secret), amount_of_rows)
+        return histogram
+
+
+def main():
+    parser = ArgumentParser(description='Builds strategy tree minimizing the expected amount of guesses')
+    parser.add_argument('row_length', type=int, nargs='?', default=4)
+    parser.add_argument('amount_of_colors', type=int, nargs='?', default=4)
+    parser.add_argument('--rows', type=int, default=10, help='amount of rows the tree has to solve every code within')
+    parser.add_argument('--output', default=None)
+    arguments = parser.parse_args()
+    geometry = get_geometry(arguments.row_length, arguments.amount_of_colors)
+    start = time.perf_counter()
+    tree = StrategyTree.build(geometry)
+    histogram = tree.verify(arguments.rows)
+    path = arguments.output or tree_path(geometry)
+    tree.save(path)
+    average = sum(turns * count for turns, count in histogram.items()) / geometry.codes_count
+    print(f'Saved {len(tree)} nodes to {path} in {time.perf_counter() - start:.1f} s')
+    print(f'Average {average:.4f} guesses, worst case {max(histogram)}')
+
+
+if __name__ == '__main__':
+    main()
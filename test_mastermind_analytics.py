@@ -0,0 +1,61 @@
+import os
+import random
+from mastermind_classes import Game, Gamemode, Bot, BotSmart
+from mastermind_log import GameRecorder
+from mastermind_analytics import HeavyHitters, LogStats, analyze_log, analyze_logs, format_report
+
+
+def _record_games(path, amount, seed):
+    random.seed(seed)
+    with GameRecorder(path) as recorder:
+        for _ in range(amount):
+            game = Game(Gamemode.PVE_SMART, 1, recorder=recorder)
+            game.players_list = [Bot('Bot'), BotSmart('Bot Smart', game)]
+            game.play()
+
+
+def test_analyze_log(tmp_path):
+    path = os.path.join(tmp_path, 'games.log')
+    _record_games(path, 10, 1)
+    stats = analyze_log(path)
+    assert stats.games == 10
+    assert stats.turns == 20
+    assert sum(stats.guesses['BotSmart'].values()) == 10
+    assert stats.average_guesses('BotSmart') <= 5
+    assert sum(stats.guesses.get('Bot', {}).values()) + stats.unsolved['Bot'] == 10
+    assert sum(stats.points.values()) == 20
+    assert sum(stats.secret_turns.values()) == 20
+    geometry, colors, average, turns = stats.hardest_secrets(1)[0]
+    assert len(colors) == geometry.row_length and average >= 1
+    geometry, guesses, count = stats.common_openings(1)[0]
+    assert 2 <= count <= 10
+    assert len(guesses) == 2
+    assert 'BotSmart' in format_report(stats)
+
+
+def test_analyze_logs_merges_partial_results(tmp_path):
+    paths = [os.path.join(tmp_path, f'games{index}.log') for index in range(3)]
+    for index, path in enumerate(paths):
+        _record_games(path, 4, index)
+    merged = analyze_logs(paths, processes=2)
+    expected = LogStats()
+    for path in paths:
+        expected.merge(analyze_log(path))
+    assert merged.games == 12
+    assert merged.guesses == expected.guesses
+    assert merged.secret_cost == expected.secret_cost
+    assert merged.openings.counts == expected.openings.counts
+
+
+def test_heavy_hitters_bounded():
+    hitters = HeavyHitters(capacity=3)
+    for item in range(1000):
+        hitters.add(item)
+        hitters.add('common')
+    assert len(hitters.counts) <= 6
+    assert hitters.most_common(1)[0][0] == 'common'
+    other = HeavyHitters(capacity=3)
+    other.add('common', 10)
+    hitters.merge(other)
+    assert len(hitters.counts) <= 3
+    assert hitters.most_common(1)[0][0] == 'common'
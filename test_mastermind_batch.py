@@ -0,0 +1,61 @@
+import io
+import os
+import subprocess
+import sys
+from mastermind_batch import InvalidScriptError, play_script, read_script
+from pytest import raises
+
+
+SCRIPT = '''# player 2 guesses on the second row, player 1 never
+GAME 1 1
+red red blue blue
+green green green green
+red,red,blue,blue
+yellow yellow yellow yellow
+''' + 'red red red red\n' * 10
+
+
+def test_read_script():
+    games = list(read_script(io.StringIO(SCRIPT + 'GAME 3 2 5 6\n')))
+    assert [scripted.index for scripted in games] == [1, 2]
+    assert games[0].header == ['1', '1']
+    assert len(games[0].moves) == 14
+    assert list(games[0].moves)[2] == ['red', 'red', 'blue', 'blue']
+    assert games[1].header == ['3', '2', '5', '6'] and not games[1].moves
+    with raises(InvalidScriptError):
+        list(read_script(['red red red red']))
+
+
+def test_play_script():
+    output = io.StringIO()
+    errors = play_script(io.StringIO(SCRIPT), output)
+    assert errors == 0
+    assert output.getvalue() == '1 2 11 2 2,11\n'
+
+
+def test_play_script_errors():
+    script = SCRIPT + 'GAME 1 1\npurple red red red\nGAME 4 1\nGAME 1 1\nred red red red\nred red red red\nGAME 1 1 4\n'
+    output = io.StringIO()
+    assert play_script(io.StringIO(script), output) == 4
+    lines = output.getvalue().splitlines()
+    assert lines[0] == '1 2 11 2 2,11'
+    assert [line.split(' ', 2)[:2] for line in lines[1:]] == [['2', 'ERR'], ['3', 'ERR'], ['4', 'ERR'], ['5', 'ERR']]
+    assert 'no colors left' in lines[3]
+
+
+def test_bots_replayed_with_seed():
+    script = ('GAME 2 1\nred green blue yellow\n' + 'green green green green\n' * 10) * 20
+    first, second = io.StringIO(), io.StringIO()
+    play_script(io.StringIO(script), first, seed=5)
+    play_script(io.StringIO(script), second, seed=5)
+    assert first.getvalue() == second.getvalue()
+    assert 'ERR' not in first.getvalue()
+
+
+def test_main_batch_from_standard_input():
+    process = subprocess.run(
+        [sys.executable, 'mastermind_main.py', '--batch', '-'],
+        input=SCRIPT, capture_output=True, text=True, timeout=60, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    assert process.returncode == 0
+    assert process.stdout == '1 2 11 2 2,11\n'
@@ -0,0 +1,26 @@
+from mastermind_benchmark import compare, run_benchmarks, format_comparison
+
+
+def _results(**values):
+    return {'results': {
+        name: {'value': value, 'unit': 'x', 'higher_is_better': not name.startswith('latency')}
+        for name, value in values.items()
+    }}
+
+
+def test_compare_flags_regressions():
+    baseline = _results(scores=100.0, latency=1.0, games=10.0)
+    current = _results(scores=80.0, latency=1.05, games=12.0, new=1.0)
+    comparison = {name: (change, is_regression) for name, _, _, change, is_regression in compare(baseline, current, 0.1)}
+    assert comparison['scores'] == (-0.2, True)
+    assert comparison['latency'][1] is False
+    assert comparison['games'][1] is False
+    assert 'new' not in comparison
+    assert 'REGRESSION' in format_comparison(compare(baseline, current, 0.1))
+
+
+def test_run_benchmarks_selected():
+    results = run_benchmarks(names=['row_compare_pegs', 'bot_smart_guess_turn_2'], min_duration=0.01, repeats=1)
+    assert set(results['results']) == {'row_compare_pegs', 'bot_smart_guess_turn_2'}
+    assert results['results']['row_compare_pegs']['value'] > 0
+    assert results['results']['bot_smart_guess_turn_2']['higher_is_better'] is False
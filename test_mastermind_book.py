@@ -0,0 +1,48 @@
+from mastermind_book import OpeningBook, InvalidBookError, build_book, history_key
+from mastermind_classes import Game, Gamemode, BotSmart
+from mastermind_codes import STANDARD, get_geometry
+from mastermind_solver import consistent_codes, minimax_guess
+from pytest import raises
+
+
+def test_history_key():
+    assert history_key([]) == history_key([])
+    assert history_key([(1, 2)]) != history_key([(2, 1)])
+
+
+def test_build_and_load_book(tmp_path):
+    path = tmp_path / 'book.bin'
+    count = build_book(STANDARD, str(path), depth=2)
+    book = OpeningBook(str(path))
+    assert len(book) == count
+    assert book.geometry == STANDARD
+    assert book.depth == 2
+    first_guess = book.guess([])
+    assert first_guess == minimax_guess(range(STANDARD.codes_count))
+    secret = STANDARD.colors_to_code(['Blue', 'Green', 'Red', 'Yellow'])
+    history = [(first_guess, STANDARD.feedback(secret, first_guess))]
+    assert book.guess(history) == minimax_guess(consistent_codes(history))
+    assert book.guess([(0, 0)]) is None
+    assert book.guess(history + history) is None
+
+
+def test_invalid_book(tmp_path):
+    path = tmp_path / 'book.bin'
+    path.write_bytes(b'not a book')
+    with raises(InvalidBookError):
+        OpeningBook(str(path)).guess([])
+
+
+def test_bot_smart_consults_book(tmp_path, monkeypatch):
+    geometry = get_geometry(4, 5)
+    path = tmp_path / 'book.bin'
+    build_book(geometry, str(path), depth=2)
+    game = Game(Gamemode.PVE_SMART, 1, geometry=geometry)
+    bot = BotSmart('Bot Smart', game, book=OpeningBook(str(path)))
+    expected = bot.guess_pegs_colors()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('search should not run')
+
+    monkeypatch.setattr('mastermind_classes.minimax_guess', fail)
+    assert bot.guess_pegs_colors() == expected
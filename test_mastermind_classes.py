@@ -1,10 +1,17 @@
-from mastermind_classes import Row, Game, Player, Bot, BotSmart, Gamemode, Peg
+import os
+import subprocess
+import sys
+from mastermind_codes import ALL_COLORS
+from mastermind_solver import SolverCache, partition_sizes
+from mastermind_classes import Row, Game, Player, Bot, BotSmart, Gamemode, Peg, Strategy, TurnState, get_geometry
 from mastermind_classes import (
     InvalidPegColorError,
     InvalidAmountOfPegsError,
     InvalidRoundsError,
     InvalidGamemodeError,
-    InvalidKeyPegColorError
+    InvalidKeyPegColorError,
+    IncorrectPlayerError,
+    InvalidTurnStateError
 )
 from pytest import raises
 
@@ -209,3 +216,264 @@ def test_is_guessed_false():
     game.rows_list[0].set_pegs(['Red', 'Red', 'Red', 'Red'])
     game.coded_row.set_pegs(['Green', 'Red', 'Red', 'Red'])
     assert game.is_guessed(game.rows_list[0]) is False
+
+
+def test_row_feedback():
+    row = Row()
+    row._set_key_pegs(['WHITE', 'CYAN', 'CYAN', 'BLACK'])
+    assert row.feedback == 1 * 5 + 2
+
+
+def test_bot_smart_minimax_guesses_code():
+    game = Game(Gamemode.PVE_SMART, 1)
+    bot = game.players_list[1]
+    assert bot.strategy == Strategy.MINIMAX
+    game.coded_row.set_pegs(['Blue', 'Yellow', 'Red', 'Green'])
+    for row in game.rows_list:
+        row.set_pegs(bot.guess_pegs_colors())
+        row.compare_pegs(game.coded_row)
+        if game.is_guessed(row):
+            break
+    assert game.is_guessed(row)
+    assert game.rows_list.index(row) < 5
+
+
+def test_bot_smart_simple_strategy():
+    game = Game(Gamemode.PVE_SMART, 1)
+    bot = BotSmart('Bot Smart', game, Strategy.SIMPLE)
+    assert bot.guess_pegs_colors() == ['RED'] * 4
+
+
+def test_game_candidates_narrowed_by_compare_pegs():
+    game = Game(Gamemode.PVP, 1)
+    game.coded_row.set_pegs(['Blue', 'Yellow', 'Red', 'Green'])
+    game.rows_list[0].set_pegs(['Red', 'Red', 'Red', 'Red'])
+    game.rows_list[0].compare_pegs(game.coded_row)
+    assert len(game.candidates) < 4 ** 4
+    assert game.coded_row.code in game.candidates
+    game.new_board()
+    assert len(game.candidates) == 4 ** 4
+
+
+def test_play_turn_headless():
+    game = Game(Gamemode.PVE_SMART, 1)
+    player, bot = game.players_list
+    result = game.play_turn(player, bot, get_code=lambda chosing_player: ['Red', 'Blue', 'Blue', 'Green'])
+    assert result.guessed is True
+    assert result.code == ['RED', 'BLUE', 'BLUE', 'GREEN']
+    assert result.guesses[-1] == result.code
+    assert result.key_colors[-1] == ['WHITE'] * 4
+    assert len(result.guesses) == len(result.key_colors) == result.points
+    assert player.points == result.points
+
+
+def test_play_turn_headless_not_guessed():
+    game = Game(Gamemode.PVP, 1)
+    player1, player2 = game.players_list
+    result = game.play_turn(
+        player1,
+        player2,
+        get_code=lambda player: ['Red'] * 4,
+        get_guess=lambda player: ['Blue'] * 4
+    )
+    assert result.guessed is False
+    assert len(result.guesses) == game.amount_of_rows
+    assert result.points == game.amount_of_rows + 1
+
+
+def test_play_turn_incorrect_player():
+    game = Game(Gamemode.PVE, 1)
+    with raises(IncorrectPlayerError):
+        game.play_turn(Bot('Bot'), game.players_list[0])
+
+
+def test_turn_state_machine():
+    game = Game(Gamemode.PVP, 1, amount_of_rows=3)
+    player1, player2 = game.players_list
+    with raises(InvalidTurnStateError):
+        game.set_code(['Red'] * 4)
+    assert game.start_turn() == TurnState.CODE
+    assert game.turn.chosing_player is player1
+    with raises(InvalidTurnStateError):
+        game.submit_guess(['Red'] * 4)
+    with raises(InvalidPegColorError):
+        game.set_code(['Purple'] * 4)
+    assert game.state == TurnState.CODE
+    assert game.set_code(['Red', 'Red', 'Blue', 'Blue']) == TurnState.GUESS
+    assert game.current_row is None
+    assert game.submit_guess(['Blue', 'Blue', 'Red', 'Red']) == TurnState.GUESS
+    assert game.current_row.key_colors == ['CYAN'] * 4
+    assert game.submit_guess(['Red', 'Red', 'Blue', 'Blue']) == TurnState.TURN_OVER
+    assert game.turn.guessed is True
+    assert player1.points == game.turn.points == 2
+    game.start_turn()
+    assert game.turn.chosing_player is player2
+    game.set_code(['Green'] * 4)
+    states = [game.submit_guess(['Red'] * 4) for _ in range(3)]
+    assert states == [TurnState.GUESS, TurnState.GUESS, TurnState.GAME_OVER]
+    assert player2.points == 4
+
+
+def test_start_turn_during_turn():
+    game = Game(Gamemode.PVP, 1)
+    game.start_turn()
+    with raises(InvalidTurnStateError):
+        game.start_turn()
+    game.set_code(['Red', 'Red', 'Blue', 'Blue'])
+    game.submit_guess(['Red'] * 4)
+    with raises(InvalidTurnStateError):
+        game.start_turn()
+    assert game.state == TurnState.GUESS
+    assert game.turn.guesses == [['RED'] * 4]
+
+
+def test_play_bots_headless():
+    game = Game(Gamemode.PVE_SMART, 3)
+    game.players_list = [Bot('Bot'), BotSmart('Bot Smart', game)]
+    turns = []
+    result = game.play(on_turn=turns.append)
+    assert len(result.turns) == 6
+    assert turns == result.turns
+    bot, bot_smart = game.players_list
+    assert result.points == {'Bot': bot.points, 'Bot Smart': bot_smart.points}
+    assert bot.points == sum(turn.points for turn in result.turns if turn.chosing_player is bot)
+    assert result.winner == game.winner()
+
+
+def test_game_geometry():
+    geometry = get_geometry(5, 8)
+    game = Game(Gamemode.PVP, 1, geometry=geometry)
+    assert game.geometry == geometry
+    assert all(row.geometry == geometry for row in game.rows_list)
+    assert game.rows_list[0].colors == ['BLACK'] * 5
+    assert len(game.candidates) == 8 ** 5
+    with raises(InvalidAmountOfPegsError):
+        game.rows_list[0].set_pegs(['Red'] * 4)
+    game.rows_list[0].set_pegs(['Red', 'Orange', 'Lime', 'Gold', 'Magenta'])
+    assert game.rows_list[0].colors == ['RED', 'ORANGE', 'LIME', 'GOLD', 'MAGENTA']
+
+
+def test_row_color_outside_geometry():
+    with raises(InvalidPegColorError):
+        Row(['Red', 'Red', 'Red', 'Orange'])
+
+
+def test_bot_smart_large_geometry():
+    game = Game(Gamemode.PVE_SMART, 1, geometry=get_geometry(5, 8))
+    player, bot = game.players_list
+    result = game.play_turn(player, bot, get_code=lambda chosing_player: ['Gold', 'Red', 'Lime', 'Red', 'Blue'])
+    assert result.guessed is True
+    assert len(result.guesses) <= 8
+
+
+def test_rows_share_game_board_buffer():
+    game = Game(Gamemode.PVP, 1)
+    game.rows_list[1].set_pegs(['Red', 'Green', 'Yellow', 'Blue'])
+    assert not hasattr(game.rows_list[1], '__dict__')
+    assert not hasattr(game, '__dict__')
+    assert game.rows_list[1]._buffer is game._board
+    assert game.rows_list[0].colors == ['BLACK'] * 4
+    assert game.rows_list[2].colors == ['BLACK'] * 4
+    assert game.rows_list[1].colors == ['RED', 'GREEN', 'YELLOW', 'BLUE']
+
+
+def test_new_board_resets_rows_in_place():
+    game = Game(Gamemode.PVP, 1)
+    rows = list(game.rows_list)
+    game.coded_row.set_pegs(['Red', 'Red', 'Blue', 'Blue'])
+    game.rows_list[0].set_pegs(['Red', 'Blue', 'Red', 'Blue'])
+    game.rows_list[0].compare_pegs(game.coded_row)
+    game.new_board()
+    assert game.rows_list == rows
+    assert game.rows_list[0].code is None
+    assert game.rows_list[0].key_colors == ['BLACK'] * 4
+    assert game.rows_list[0].feedback == 0
+    assert game.coded_row.colors == ['RED', 'RED', 'BLUE', 'BLUE']
+
+
+def test_core_imports_only_standard_library():
+    code = 'import sys, mastermind_tournament; print(" ".join(sorted(sys.modules)))'
+    directory = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=directory)
+    modules = process.stdout.split()
+    assert 'colorama' not in modules
+    assert 'strenum' not in modules
+    assert 'mastermind_render' not in modules
+
+
+def test_core_import_defers_solver_extras():
+    code = 'import sys, mastermind_classes; print(" ".join(sorted(sys.modules)))'
+    directory = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=directory)
+    modules = process.stdout.split()
+    for module in ['mastermind_book', 'mastermind_tree', 'mastermind_hardness', 'mastermind_symmetry']:
+        assert module not in modules
+    assert 'dataclasses' not in modules
+    assert 'argparse' not in modules
+
+
+def test_peg_values_match_colors():
+    assert [peg.name for peg in Peg][1:len(ALL_COLORS) + 1] == ALL_COLORS
+    assert Row(['Red', 'Blue', 'Red', 'Blue']).pegs == [Peg.RED, Peg.BLUE, Peg.RED, Peg.BLUE]
+
+
+def test_bot_smart_entropy_guesses_code():
+    game = Game(Gamemode.PVE_SMART, 1)
+    bot = BotSmart('Bot Smart', game, Strategy.ENTROPY, budget=1)
+    game.players_list = [Bot('Bot'), bot]
+    result = game.play_turn(game.players_list[0], bot, get_code=lambda player: ['Blue', 'Yellow', 'Red', 'Green'])
+    assert result.guessed
+    assert len(result.guesses) <= 6
+
+
+def test_bot_smart_guesses_cached_across_games():
+    cache = SolverCache()
+    guesses = []
+    for _ in range(2):
+        game = Game(Gamemode.PVE_SMART, 1)
+        bot = BotSmart('Bot Smart', game, cache=cache)
+        game.players_list[1] = bot
+        game.play_turn(game.players_list[0], bot, get_code=lambda player: ['Blue', 'Yellow', 'Red', 'Green'])
+        guesses.append(game.turn.guesses)
+    assert guesses[0] == guesses[1]
+    assert cache.misses == len(cache) == len(guesses[0])
+    assert cache.hits == len(guesses[1])
+
+
+def test_bot_smart_symmetric_boards_share_cached_guess():
+    cache = SolverCache()
+    geometry = get_geometry()
+    guess = geometry.colors_to_code(['Red', 'Red', 'Green', 'Blue'])
+    symmetric_guess = geometry.colors_to_code(['Yellow', 'Blue', 'Green', 'Green'])
+    partitions = []
+    for history_guess in (guess, symmetric_guess):
+        game = Game(Gamemode.PVE_SMART, 1)
+        bot = BotSmart('Bot Smart', game, cache=cache)
+        game.candidates.narrow(history_guess, geometry.pack_feedback(1, 1))
+        colors = bot.guess_pegs_colors()
+        partitions.append(sorted(partition_sizes(geometry.colors_to_code(colors), game.candidates.codes).values()))
+    assert cache.misses == cache.hits == 1
+    assert partitions[0] == partitions[1]
+
+
+class _FixedBook:
+    def __init__(self, path, geometry, guess):
+        self.path = path
+        self.geometry = geometry
+        self._guess = guess
+
+    def guess(self, history):
+        return self._guess
+
+
+def test_bot_smart_custom_book_not_served_default_guess():
+    cache = SolverCache()
+    geometry = get_geometry()
+    book_guess = geometry.colors_to_code(['Green', 'Green', 'Blue', 'Red'])
+    colors = []
+    for book in (None, _FixedBook('custom.bin', geometry, book_guess)):
+        game = Game(Gamemode.PVE_SMART, 1)
+        colors.append(BotSmart('Bot Smart', game, book=book, cache=cache).guess_pegs_colors())
+    assert colors[0] != colors[1]
+    assert colors[1] == geometry.code_to_colors(book_guess)
+    assert cache.misses == len(cache) == 2
@@ -0,0 +1,201 @@
+import pickle
+import random
+import sys
+import tracemalloc
+from threading import Thread
+from array import array
+from mastermind_codes import (
+    Geometry,
+    InvalidGeometryError,
+    InvalidBatchLengthError,
+    get_geometry,
+    _score_digits,
+    CODES_COUNT,
+    MAX_CODES,
+    SOLVED,
+    colors_to_code,
+    code_to_colors,
+    pack_feedback,
+    unpack_feedback,
+    feedback,
+    feedback_table,
+    feedback_to_key_colors,
+    score_guess,
+    score_pairs
+)
+from mastermind_classes import Row
+from pytest import raises
+
+
+def test_colors_to_code_and_back():
+    for code in range(CODES_COUNT):
+        assert colors_to_code(code_to_colors(code)) == code
+
+
+def test_colors_to_code_case_insensitive():
+    assert colors_to_code(['red', 'Green', 'YELLOW', 'blue']) == colors_to_code(['RED', 'GREEN', 'YELLOW', 'BLUE'])
+
+
+def test_pack_feedback():
+    assert unpack_feedback(pack_feedback(2, 1)) == (2, 1)
+    assert unpack_feedback(SOLVED) == (4, 0)
+
+
+def test_feedback_to_key_colors():
+    assert feedback_to_key_colors(pack_feedback(1, 2)) == ['WHITE', 'CYAN', 'CYAN', 'BLACK']
+
+
+def test_feedback_table_size():
+    assert len(feedback_table()) == CODES_COUNT * CODES_COUNT
+
+
+def test_feedback_1_1():
+    secret = colors_to_code(['Red', 'Yellow', 'Red', 'Red'])
+    guess = colors_to_code(['Red', 'Blue', 'Yellow', 'Blue'])
+    assert unpack_feedback(feedback(secret, guess)) == (1, 1)
+
+
+def test_feedback_symmetric():
+    for secret in range(0, CODES_COUNT, 7):
+        for guess in range(0, CODES_COUNT, 5):
+            assert feedback(secret, guess) == feedback(guess, secret)
+
+
+def test_row_compare_pegs_uses_table():
+    row1 = Row(['Red', 'Blue', 'Yellow', 'Green'])
+    row2 = Row(['Blue', 'Yellow', 'Green', 'Red'])
+    assert row1.code is not None
+    assert row1._compare_pegs(row2) == ['CYAN'] * 4
+
+
+def test_row_code_partial_row():
+    row = Row()
+    row._set_peg(0, 'Red')
+    assert row.code is None
+    assert row._compare_pegs(Row()) == ['WHITE'] * 3 + ['BLACK']
+
+
+def test_geometry_shape():
+    geometry = get_geometry(5, 8)
+    assert geometry.row_length == 5
+    assert len(geometry.colors) == 8
+    assert geometry.codes_count == 8 ** 5
+    assert geometry is get_geometry(5, 8)
+    assert not geometry.has_table()
+
+
+def test_geometry_invalid():
+    with raises(InvalidGeometryError):
+        Geometry(0, 4)
+    with raises(InvalidGeometryError):
+        Geometry(4, 11)
+    with raises(InvalidGeometryError):
+        Geometry(7, 7)
+    assert Geometry(6, 9).codes_count == MAX_CODES
+
+
+def test_geometry_pickle_shares_instance():
+    geometry = get_geometry(6, 9)
+    assert pickle.loads(pickle.dumps(geometry)) is geometry
+
+
+def test_geometry_codes_and_feedback():
+    geometry = get_geometry(6, 9)
+    colors = ['Magenta', 'Red', 'Sky', 'Gold', 'Red', 'Blue']
+    code = geometry.colors_to_code(colors)
+    assert geometry.code_to_colors(code) == [color.upper() for color in colors]
+    guess = geometry.colors_to_code(['Red', 'Magenta', 'Sky', 'Lime', 'Lime', 'Red'])
+    assert geometry.unpack_feedback(geometry.feedback(code, guess)) == (1, 3)
+
+
+def test_batch_score_matches_direct_scoring():
+    generator = random.Random(3)
+    for geometry in [get_geometry(4, 6), get_geometry(5, 8), get_geometry(3, 10), get_geometry(8, 2)]:
+        codes = generator.sample(range(geometry.codes_count), min(200, geometry.codes_count))
+        batch = geometry.batch(codes)
+        for guess in generator.sample(range(geometry.codes_count), 10):
+            guess_digits = geometry.code_to_digits(guess)
+            expected = [_score_digits(geometry, geometry.code_to_digits(code), guess_digits) for code in codes]
+            assert list(batch.score(guess)) == expected
+
+
+def test_small_batch_of_largest_geometry():
+    geometry = Geometry(6, 9)
+    codes = [0, 17, 4096, 99999, geometry.codes_count - 1]
+    guess = geometry.codes_count // 3
+    tracemalloc.start()
+    white, cyan = score_guess(guess, codes, geometry)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert geometry._columns is None
+    assert peak < 100000
+    guess_digits = geometry.code_to_digits(guess)
+    expected = [_score_digits(geometry, geometry.code_to_digits(code), guess_digits) for code in codes]
+    assert [geometry.pack_feedback(*pair) for pair in zip(white, cyan)] == expected
+
+
+def test_batches_built_by_threads():
+    geometry = Geometry(6, 8)
+    generator = random.Random(9)
+    codes = generator.sample(range(geometry.codes_count), 100)
+    guess = generator.randrange(geometry.codes_count)
+    guess_digits = geometry.code_to_digits(guess)
+    expected = bytes(_score_digits(geometry, geometry.code_to_digits(code), guess_digits) for code in codes)
+    results = []
+
+    def score():
+        for _ in range(20):
+            results.append(geometry.batch(codes).score(guess))
+    threads = [Thread(target=geometry._full_columns)] + [Thread(target=score) for _ in range(4)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(0.000001)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert len(results) == 80
+    assert all(result == expected for result in results)
+
+
+def test_feedback_row_large_geometry():
+    geometry = get_geometry(5, 8)
+    guess = geometry.colors_to_code(['Red', 'Red', 'Green', 'Blue', 'Orange'])
+    row = geometry.feedback_row(guess)
+    assert len(row) == geometry.codes_count
+    assert row[guess] == geometry.solved
+    assert all(row[code] == geometry.feedback(code, guess) for code in range(0, geometry.codes_count, 997))
+
+
+def _row_key_counts(geometry, guess, code):
+    key_colors = Row(geometry.code_to_colors(guess), geometry=geometry)._compare_pegs(
+        Row(geometry.code_to_colors(code), geometry=geometry)
+    )
+    return key_colors.count('WHITE'), key_colors.count('CYAN')
+
+
+def test_score_guess_matches_row_compare_pegs():
+    generator = random.Random(5)
+    for geometry in [get_geometry(), get_geometry(5, 8), get_geometry(8, 5)]:
+        codes = array('I', generator.sample(range(geometry.codes_count), min(300, geometry.codes_count)))
+        guess = generator.randrange(geometry.codes_count)
+        white, cyan = score_guess(guess, codes, geometry)
+        assert len(white) == len(cyan) == len(codes)
+        assert list(zip(white, cyan)) == [_row_key_counts(geometry, guess, code) for code in codes]
+
+
+def test_score_pairs_matches_row_compare_pegs():
+    generator = random.Random(6)
+    for geometry in [get_geometry(), get_geometry(6, 9), get_geometry(8, 5), get_geometry(1, 2)]:
+        guesses = array('I', (generator.randrange(geometry.codes_count) for _ in range(300)))
+        codes = array('I', (generator.randrange(geometry.codes_count) for _ in range(300)))
+        white, cyan = score_pairs(guesses, codes, geometry)
+        expected = [_row_key_counts(geometry, guess, code) for guess, code in zip(guesses, codes)]
+        assert list(zip(white, cyan)) == expected
+
+
+def test_score_pairs_different_lengths():
+    with raises(InvalidBatchLengthError):
+        score_pairs([1, 2], [3])
@@ -0,0 +1,49 @@
+from collections import Counter
+from mastermind_classes import Bot, BotSmart, Strategy
+from mastermind_codes import get_geometry
+from mastermind_evaluator import Evaluation, evaluate, is_deterministic
+from mastermind_hardness import guesses_to_solve
+from mastermind_tournament import PlayerSpec
+
+
+GEOMETRY = get_geometry(3, 4)
+
+
+def test_evaluation_add_and_merge():
+    evaluation = Evaluation(amount_of_rows=5)
+    evaluation.add(3, 2)
+    evaluation.add(None)
+    other = Evaluation(amount_of_rows=5)
+    other.add(4)
+    evaluation.merge(other)
+    assert evaluation.secrets == 4
+    assert evaluation.guesses == Counter({3: 2, 4: 1})
+    assert evaluation.unsolved == 1
+    assert evaluation.points == Counter({3: 2, 4: 1, 6: 1})
+    assert evaluation.average == 10 / 3
+    assert evaluation.worst_case == 4
+    assert evaluation.average_points == 4
+
+
+def test_minimax_evaluation_matches_every_game():
+    spec = PlayerSpec(BotSmart, 'Minimax', strategy=Strategy.MINIMAX)
+    assert is_deterministic(spec)
+    evaluation = evaluate(spec, GEOMETRY, processes=1)
+    assert evaluation.secrets == GEOMETRY.codes_count
+    assert evaluation.guesses == Counter(guesses_to_solve(GEOMETRY, 'minimax'))
+    assert evaluation.points == evaluation.guesses
+
+
+def test_parallel_evaluation_matches_sequential():
+    spec = PlayerSpec(BotSmart, 'Entropy', strategy=Strategy.ENTROPY)
+    assert evaluate(spec, GEOMETRY, processes=2) == evaluate(spec, GEOMETRY, processes=1)
+
+
+def test_random_bot_plays_every_secret():
+    spec = PlayerSpec(Bot, 'Bot')
+    assert not is_deterministic(spec)
+    evaluation = evaluate(spec, GEOMETRY, amount_of_rows=4, processes=1, chunk_size=10, seed=1)
+    assert evaluation.secrets == GEOMETRY.codes_count
+    assert sum(evaluation.guesses.values()) + evaluation.unsolved == GEOMETRY.codes_count
+    assert evaluation.points[5] == evaluation.unsolved
+    assert evaluation == evaluate(spec, GEOMETRY, amount_of_rows=4, processes=2, chunk_size=10, seed=1)
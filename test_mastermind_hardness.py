@@ -0,0 +1,57 @@
+from mastermind_classes import Game, Gamemode, Player, BotSmart, Codemaker
+from mastermind_codes import get_geometry
+from mastermind_hardness import (
+    HardnessIndex,
+    InvalidHardnessIndexError,
+    UnknownStrategyError,
+    build_hardness_index,
+    guesses_to_solve
+)
+from mastermind_tree import StrategyTree
+from pytest import raises
+
+
+GEOMETRY = get_geometry(3, 4)
+
+
+def test_guesses_to_solve_matches_games():
+    counts = guesses_to_solve(GEOMETRY, 'minimax')
+    assert len(counts) == GEOMETRY.codes_count
+    for secret in range(0, GEOMETRY.codes_count, 7):
+        game = Game(Gamemode.PVE_SMART, 1, geometry=GEOMETRY)
+        player, bot = game.players_list
+        result = game.play_turn(player, bot, get_code=lambda player: GEOMETRY.code_to_colors(secret))
+        assert len(result.guesses) == counts[secret]
+
+
+def test_tree_guesses_to_solve_matches_verify():
+    tree = StrategyTree.build(GEOMETRY)
+    counts = guesses_to_solve(GEOMETRY, 'tree', tree=tree)
+    histogram = tree.verify()
+    assert all(counts.count(turns) == amount for turns, amount in histogram.items())
+    with raises(UnknownStrategyError):
+        guesses_to_solve(GEOMETRY, 'simple')
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'hardness.bin')
+    hardest = build_hardness_index(GEOMETRY, path, 'entropy')
+    index = HardnessIndex(path)
+    assert index.geometry == GEOMETRY
+    assert index.strategy == 'entropy'
+    assert all(index.guesses(code) == hardest for code in index.hardest)
+    assert index.choose() in index.hardest
+    (tmp_path / 'broken.bin').write_bytes(b'MMHARD1\0broken')
+    with raises(InvalidHardnessIndexError):
+        HardnessIndex(str(tmp_path / 'broken.bin')).guesses(0)
+
+
+def test_adversarial_bot_picks_hardest_codes(tmp_path):
+    path = str(tmp_path / 'hardness.bin')
+    build_hardness_index(GEOMETRY, path, 'minimax')
+    index = HardnessIndex(path)
+    game = Game(Gamemode.PVE_SMART, 1, geometry=GEOMETRY)
+    bot = BotSmart('Bot Smart', game, codemaker=Codemaker.ADVERSARIAL, hardness=index)
+    game.players_list = [Player('Player 1', GEOMETRY), bot]
+    for _ in range(20):
+        assert GEOMETRY.colors_to_code(bot.code_pegs_colors()) in index.hardest
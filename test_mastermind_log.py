@@ -0,0 +1,50 @@
+import os
+import random
+from mastermind_classes import Game, Gamemode, Bot, BotSmart
+from mastermind_log import GameRecorder, Record, RECORD, read_records, read_games, player_kind_name
+
+
+def test_recorder_records_every_move(tmp_path):
+    path = os.path.join(tmp_path, 'games.log')
+    random.seed(4)
+    with GameRecorder(path) as recorder:
+        game = Game(Gamemode.PVE_SMART, 1, recorder=recorder)
+        _, bot = game.players_list
+        game.players_list = [Bot('Bot'), bot]
+        result = game.play()
+    records = list(read_records(path))
+    assert records[0] == (Record.GAME, 10, 4 << 8 | 4)
+    guesses = sum(len(turn.guesses) for turn in result.turns)
+    assert len(records) == 1 + 2 * 3 + 2 * guesses
+    assert os.path.getsize(path) == len(records) * RECORD.size
+    [game_log] = read_games(path)
+    assert game_log.geometry == game.geometry
+    assert len(game_log.turns) == 2
+    for turn, turn_result in zip(game_log.turns, result.turns):
+        assert [player_kind_name(kind) for kind in turn.kinds] == ['Bot', 'BotSmart']
+        assert turn.code == game.geometry.colors_to_code(turn_result.code)
+        assert turn.guesses == [game.geometry.colors_to_code(colors) for colors in turn_result.guesses]
+        assert len(turn.feedbacks) == len(turn.guesses)
+        assert turn.points == turn_result.points
+    assert game_log.turns[0].codemaker == 0
+    assert game_log.turns[1].codebreaker == 0
+
+
+def test_read_games_streams_many_games(tmp_path):
+    path = os.path.join(tmp_path, 'games.log')
+    random.seed(5)
+    with GameRecorder(path) as recorder:
+        for _ in range(20):
+            game = Game(Gamemode.PVE, 2, recorder=recorder)
+            game.players_list = [Bot('Bot 1'), Bot('Bot 2')]
+            game.play()
+    games = read_games(path, records_per_read=7)
+    assert next(games).turns[0].kinds == (1, 1)
+    assert sum(1 for _ in games) == 19
+
+
+def test_game_without_recorder():
+    game = Game(Gamemode.PVE_SMART, 1)
+    game.players_list = [Bot('Bot'), BotSmart('Bot Smart', game)]
+    game.play()
+    assert game.recorder is None
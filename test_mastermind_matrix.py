@@ -0,0 +1,116 @@
+import random
+import sys
+from collections import Counter
+from mastermind_classes import Row
+from mastermind_codes import get_geometry
+from mastermind_matrix import FeedbackMatrix, InvalidMatrixError, main
+from mastermind_solver import minimax_guess, partition_sizes
+from pytest import raises
+
+
+def _row_feedback(geometry, guess, code):
+    key_colors = Row(geometry.code_to_colors(guess), geometry=geometry)._compare_pegs(
+        Row(geometry.code_to_colors(code), geometry=geometry)
+    )
+    return geometry.pack_feedback(key_colors.count('WHITE'), key_colors.count('CYAN'))
+
+
+def test_rows_match_row_compare_pegs(tmp_path):
+    geometry = get_geometry(3, 5)
+    with FeedbackMatrix(geometry, str(tmp_path / 'matrix.bin'), tile_rows=7) as matrix:
+        assert matrix.tiles_count == 18
+        for guess in [0, 6, 7, 64, geometry.codes_count - 1]:
+            row = matrix.row(guess)
+            assert list(row) == [_row_feedback(geometry, guess, code) for code in range(geometry.codes_count)]
+        assert len(matrix.missing_tiles()) == 14
+
+
+def test_tiles_reused_across_runs(tmp_path):
+    geometry = get_geometry(3, 4)
+    path = str(tmp_path / 'matrix.bin')
+    with FeedbackMatrix(geometry, path, tile_rows=5) as matrix:
+        assert matrix.build(range(3), processes=1) == 3
+        rows = [matrix.row(guess) for guess in range(15)]
+    with FeedbackMatrix(geometry, path, tile_rows=16) as matrix:
+        assert matrix.tile_rows == 5
+        assert matrix.missing_tiles() == list(range(3, 13))
+        assert [matrix.row(guess) for guess in range(15)] == rows
+        assert matrix.build(range(3)) == 0
+
+
+def test_parallel_build_matches_sequential(tmp_path):
+    geometry = get_geometry(4, 3)
+    with FeedbackMatrix(geometry, str(tmp_path / 'parallel.bin'), tile_rows=4) as parallel:
+        assert parallel.build(processes=2) == parallel.tiles_count
+    with FeedbackMatrix(geometry, str(tmp_path / 'parallel.bin')) as parallel:
+        assert not parallel.missing_tiles()
+        with FeedbackMatrix(geometry, str(tmp_path / 'sequential.bin'), tile_rows=4) as sequential:
+            sequential.build(processes=1)
+            for guess in range(geometry.codes_count):
+                assert parallel.row(guess) == sequential.row(guess) == geometry.feedback_row(guess)
+
+
+def test_attached_matrix_serves_full_rows(tmp_path):
+    geometry = get_geometry(5, 5)
+    assert not geometry.has_table()
+    generator = random.Random(4)
+    guesses = generator.sample(range(geometry.codes_count), 5)
+    expected = [geometry.feedback_row(guess) for guess in guesses]
+    with FeedbackMatrix(geometry, str(tmp_path / 'matrix.bin'), tile_rows=100).attach() as matrix:
+        assert [geometry.feedback_row(guess) for guess in guesses] == expected
+        assert len(matrix.missing_tiles()) == matrix.tiles_count - len({guess // 100 for guess in guesses})
+        codes = generator.sample(range(geometry.codes_count), 50)
+        assert geometry.batch(codes).score(guesses[0]) == bytes(expected[0][code] for code in codes)
+    assert geometry._matrix is None
+
+
+def test_invalid_matrix(tmp_path):
+    (tmp_path / 'broken.bin').write_bytes(b'MMFEED1\0broken')
+    with raises(InvalidMatrixError):
+        FeedbackMatrix(get_geometry(3, 4), str(tmp_path / 'broken.bin'))
+    FeedbackMatrix(get_geometry(3, 4), str(tmp_path / 'matrix.bin')).close()
+    with raises(InvalidMatrixError):
+        FeedbackMatrix(get_geometry(4, 3), str(tmp_path / 'matrix.bin'))
+    (tmp_path / 'empty.bin').write_bytes(bytes(100))
+    with raises(InvalidMatrixError):
+        FeedbackMatrix(get_geometry(3, 4), str(tmp_path / 'empty.bin'))
+
+
+def test_created_file_is_complete(tmp_path):
+    geometry = get_geometry(3, 4)
+    path = tmp_path / 'matrix.bin'
+    (tmp_path / 'matrix.bin.1.1.tmp').write_bytes(b'')
+    with FeedbackMatrix(geometry, str(path), tile_rows=8) as matrix:
+        assert matrix.tile_rows == 8
+        assert matrix.row(5) == geometry.feedback_row(5)
+    assert sorted(file.name for file in tmp_path.iterdir()) == ['matrix.bin', 'matrix.bin.1.1.tmp']
+    with FeedbackMatrix(geometry, str(path), tile_rows=4) as matrix:
+        assert matrix.tile_rows == 8
+        assert matrix.is_built(0)
+
+
+def test_solvers_read_large_matrix(tmp_path):
+    geometry = get_geometry(6, 8)
+    generator = random.Random(8)
+    codes = sorted(generator.sample(range(geometry.codes_count), 300))
+    guess = generator.randrange(geometry.codes_count)
+    with FeedbackMatrix(geometry, str(tmp_path / 'matrix.bin')).attach() as matrix:
+        assert matrix.tile_rows == 1 and matrix.tiles_count == geometry.codes_count
+        scores = geometry.batch(codes).score(guess)
+        assert list(scores) == [_row_feedback(geometry, guess, code) for code in codes]
+        assert matrix.missing_tiles() == [tile for tile in range(matrix.tiles_count) if tile != guess]
+        sizes = partition_sizes(guess, codes, geometry)
+        assert sizes == Counter(_row_feedback(geometry, guess, code) for code in codes)
+        chosen = minimax_guess(codes[:20], guesses=codes[:5], geometry=geometry)
+        assert len(matrix.missing_tiles()) == matrix.tiles_count - len({guess, *codes[:5]})
+    assert chosen == minimax_guess(codes[:20], guesses=codes[:5], geometry=geometry)
+
+
+def test_main_requires_amount_of_tiles(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / 'matrix.bin')
+    monkeypatch.setattr(sys, 'argv', ['mastermind_matrix.py', '3', '4', '--output', path])
+    with raises(SystemExit):
+        main()
+    monkeypatch.setattr(sys, 'argv', ['mastermind_matrix.py', '3', '4', '--output', path, '--tiles', '1'])
+    main()
+    assert '1 of 1 tiles' in capsys.readouterr().out
@@ -0,0 +1,87 @@
+import random
+import mastermind_interface
+from mastermind_classes import Game, Gamemode, Row, Bot, BotSmart, Strategy
+from mastermind_metrics import METRICS, Histogram, profile_game, profile_report
+from mastermind_solver import SolverCache
+
+
+def _play_bot_game(strategy=Strategy.MINIMAX):
+    game = Game(Gamemode.PVE_SMART, 1)
+    game.players_list = [Bot('Bot'), BotSmart('Bot Smart', game, strategy, cache=SolverCache(capacity=0))]
+    return game.play()
+
+
+def test_metrics_disabled_by_default():
+    compare_pegs = Row.compare_pegs
+    _play_bot_game()
+    assert not METRICS.enabled
+    assert Row.compare_pegs is compare_pegs
+    assert not hasattr(compare_pegs, '__wrapped__')
+
+
+def test_metrics_enabled():
+    compare_pegs = Row.compare_pegs
+    random.seed(2)
+    METRICS.reset()
+    METRICS.enable()
+    try:
+        assert Row.compare_pegs is not compare_pegs
+        result = _play_bot_game()
+    finally:
+        METRICS.disable()
+    assert Row.compare_pegs is compare_pegs
+    snapshot = METRICS.snapshot()
+    guesses = sum(len(turn.guesses) for turn in result.turns)
+    assert snapshot['timers']['Row.compare_pegs']['count'] == guesses
+    assert snapshot['timers']['BotSmart.guess_pegs_colors']['count'] == len(result.turns[0].guesses)
+    assert [span['name'] for span in snapshot['spans']] == ['Game.play_turn'] * 2
+    assert snapshot['counters']['candidates_pruned'] > 0
+    assert snapshot['counters']['scores_computed'] > 0
+    assert 'Row.compare_pegs' in METRICS.report()
+    METRICS.reset()
+
+
+def test_shuffle_retries_counted():
+    random.seed(3)
+    METRICS.reset()
+    METRICS.enable()
+    try:
+        for _ in range(5):
+            _play_bot_game(Strategy.SIMPLE)
+    finally:
+        METRICS.disable()
+    assert METRICS.counters['shuffle_retries'] > 0
+    METRICS.reset()
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for microseconds in [1, 2, 3, 100, 1000]:
+        histogram.add(microseconds / 1000000)
+    assert histogram.count == 5
+    assert histogram.percentile(50) == 4 / 1000000
+    assert histogram.percentile(100) == 0.001
+
+
+def test_profile_game():
+    with profile_game() as profiler:
+        _play_bot_game()
+    assert 'play_turn' in profile_report(profiler)
+
+
+def test_interface_turn_recorded(monkeypatch, capsys):
+    monkeypatch.setattr(mastermind_interface.time, 'sleep', lambda seconds: None)
+    game = Game(Gamemode.PVE_SMART, 1)
+    game.players_list = [Bot('Bot'), BotSmart('Bot Smart', game)]
+    METRICS.reset()
+    METRICS.enable()
+    try:
+        mastermind_interface.play_turn(game, *game.players_list)
+    finally:
+        METRICS.disable()
+    capsys.readouterr()
+    snapshot = METRICS.snapshot()
+    assert [span['name'] for span in snapshot['spans']] == ['Game.play_turn']
+    assert snapshot['timers']['Game.submit_guess']['count'] == len(game.turn.guesses)
+    assert snapshot['timers']['Game.start_turn']['count'] == 1
+    METRICS.reset()
@@ -0,0 +1,74 @@
+import os
+from io import StringIO
+from mastermind_render import BoardRenderer, CLEAR_SCREEN, render_row, move_to, clear
+from mastermind_classes import Game, Gamemode, Row
+from mastermind_codes import get_geometry
+
+
+TERMINAL = os.terminal_size((80, 40))
+
+
+def test_render_row_same_as_str():
+    row = Row(['Red', 'Blue', 'Green', 'Green'])
+    row._set_key_pegs(['WHITE', 'CYAN', 'BLACK', 'BLACK'])
+    assert render_row(tuple(row.pegs), tuple(row.key_pegs)) == str(row)
+
+
+def test_first_frame_draws_whole_board():
+    game = Game(Gamemode.PVP, 1)
+    frame = BoardRenderer(terminal_size=TERMINAL).render(game)
+    assert frame.startswith(CLEAR_SCREEN)
+    assert frame.count(str(Row())) == game.amount_of_rows
+
+
+def test_next_frame_draws_changed_rows_only():
+    game = Game(Gamemode.PVP, 1)
+    renderer = BoardRenderer(terminal_size=TERMINAL)
+    renderer.render(game)
+    assert str(Row()) not in renderer.render(game)
+    game.coded_row.set_pegs(['Red', 'Red', 'Blue', 'Blue'])
+    game.rows_list[0].set_pegs(['Red', 'Blue', 'Red', 'Blue'])
+    game.rows_list[0].compare_pegs(game.coded_row)
+    frame = renderer.render(game)
+    assert CLEAR_SCREEN not in frame
+    assert str(game.rows_list[0]) in frame
+    assert move_to((game.amount_of_rows - 1) * 3 + 1) in frame
+    assert str(Row()) not in frame
+
+
+def test_board_not_fitting_terminal_redrawn_whole():
+    game = Game(Gamemode.PVP, 1)
+    renderer = BoardRenderer(terminal_size=os.terminal_size((80, 24)))
+    renderer.render(game)
+    game.rows_list[0].set_pegs(['Red', 'Blue', 'Red', 'Blue'])
+    frame = renderer.render(game)
+    assert frame.startswith(CLEAR_SCREEN)
+    assert ';1H' not in frame[len(CLEAR_SCREEN):]
+    assert frame.count(str(Row())) == game.amount_of_rows - 1
+    wide = Game(Gamemode.PVP, 1, 4, get_geometry(8, 4))
+    renderer = BoardRenderer(terminal_size=TERMINAL)
+    assert not renderer.fits(wide)
+    assert renderer.fits(game)
+
+
+def test_invalidate_redraws_everything():
+    game = Game(Gamemode.PVP, 1)
+    renderer = BoardRenderer(terminal_size=TERMINAL)
+    renderer.render(game)
+    renderer.invalidate()
+    assert renderer.render(game).startswith(CLEAR_SCREEN)
+
+
+def test_draw_single_write():
+    class Stream(StringIO):
+        writes = 0
+
+        def write(self, text):
+            self.writes += 1
+            return super().write(text)
+
+    stream = Stream()
+    BoardRenderer(stream).draw(Game(Gamemode.PVP, 1))
+    assert stream.writes == 1
+    clear(stream)
+    assert stream.getvalue().endswith(CLEAR_SCREEN)
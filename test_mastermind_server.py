@@ -0,0 +1,124 @@
+import asyncio
+import random
+from mastermind_server import Client, start_server
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def _with_server(play, clients=1):
+    server = await start_server(port=0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        connected = [await Client.connect(port=port) for _ in range(clients)]
+        results = await asyncio.gather(*(play(client) for client in connected))
+        for client in connected:
+            await client.close()
+    return results
+
+
+async def _play_until_end(client, generator, row_length=4, colors=('red', 'green', 'blue', 'yellow')):
+    """
+    Answers every request with random colors, returns list of received lines
+    """
+    lines = []
+    while True:
+        words = await client.receive()
+        lines.append(words)
+        assert words and words[0] != 'ERR'
+        if words[0] == 'END':
+            return lines
+        if words[0] in ('CODE', 'GUESS'):
+            await client.send(*[generator.choice(colors) for _ in range(row_length)])
+
+
+def test_session_pve_smart():
+    async def play(client):
+        assert await client.receive() == ['HELLO', 'MASTERMIND']
+        await client.send('NEW', 3, 1)
+        return await _play_until_end(client, random.Random(1))
+
+    lines, = run(_with_server(play))
+    turns = [words for words in lines if words[0] == 'TURN']
+    assert [words[1:3] for words in turns] == [['1', '2'], ['2', '1']]
+    assert turns[0][3] == 'WON'
+    assert lines[-2][0] == 'POINTS'
+    assert lines[-1][0] == 'END'
+
+
+def test_session_errors():
+    async def play(client):
+        await client.receive()
+        await client.send('HELLO')
+        unknown = await client.receive()
+        await client.send('NEW', 3, 11)
+        rounds = await client.receive()
+        await client.send('NEW', 1, 1)
+        await client.receive()
+        await client.send('red', 'red')
+        amount = await client.receive()
+        assert await client.receive() == ['CODE', '1']
+        await client.send('QUIT')
+        closed = await client.receive()
+        return unknown, rounds, amount, closed
+
+    (unknown, rounds, amount, closed), = run(_with_server(play))
+    assert unknown[0] == rounds[0] == amount[0] == 'ERR'
+    assert closed == []
+
+
+def test_many_concurrent_sessions():
+    async def play(client):
+        await client.receive()
+        await client.send('NEW', 2, 1, 5, 6)
+        return await _play_until_end(client, random.Random(id(client)), 5, ('red', 'magenta', 'orange'))
+
+    results = run(_with_server(play, clients=100))
+    assert all(lines[-1][0] == 'END' for lines in results)
+
+
+def test_session_protocol_errors():
+    async def play(client):
+        await client.receive()
+        await client.send('NEW', 1, 1, 6, 9)
+        too_large = await client.receive()
+        client.writer.write(b'\xff\xfe\n')
+        await client.send('NEW', 1, 1)
+        invalid = await client.receive()
+        assert await client.receive() == ['CODE', '1']
+        client.writer.write(b'red ' * 20000 + b'\n')
+        await client.writer.drain()
+        too_long = await client.receive()
+        await client.send('QUIT')
+        return too_large, invalid, too_long
+
+    (too_large, invalid, too_long), = run(_with_server(play))
+    assert too_large[0] == invalid[0] == too_long[0] == 'ERR'
+    assert 'at most' in ' '.join(too_large)
+    assert 'UTF-8' in ' '.join(invalid)
+    assert 'long' in ' '.join(too_long)
+
+
+def test_prompt_repeated_after_invalid_line():
+    async def play(client):
+        await client.receive()
+        await client.send('NEW', 1, 1)
+        assert await client.receive() == ['CODE', '1']
+        await client.send('red', 'red', 'blue', 'blue')
+        assert await client.receive() == ['GUESS', '2', '1']
+        client.writer.write(b'red ' * 20000 + b'\n')
+        await client.writer.drain()
+        lines = [await client.receive(), await client.receive()]
+        client.writer.write(b'\xff\n')
+        await client.writer.drain()
+        lines += [await client.receive(), await client.receive()]
+        await client.send('red', 'red', 'blue', 'blue')
+        lines.append(await client.receive())
+        await client.send('QUIT')
+        return lines
+
+    lines, = run(_with_server(play))
+    assert [words[0] for words in lines] == ['ERR', 'GUESS', 'ERR', 'GUESS', 'ROW']
+    assert lines[1] == lines[3] == ['GUESS', '2', '1']
+    assert lines[4] == ['ROW', '1', 'RED,RED,BLUE,BLUE', '4', '0']
@@ -0,0 +1,178 @@
+from types import SimpleNamespace
+from threading import Thread
+import mastermind_solver
+from mastermind_solver import (
+    CandidateSet,
+    GuessScorer,
+    SolverCache,
+    consistent_codes,
+    entropy_guess,
+    filter_candidates,
+    history_key,
+    minimax_guess,
+    partition_sizes,
+    score_candidates
+)
+from mastermind_codes import CODES_COUNT, SOLVED, colors_to_code, feedback, get_geometry
+
+
+def test_score_candidates_all_codes():
+    guess = colors_to_code(['Red', 'Red', 'Green', 'Green'])
+    scores = score_candidates(guess, range(CODES_COUNT))
+    assert list(scores) == [feedback(code, guess) for code in range(CODES_COUNT)]
+
+
+def test_score_candidates_subset():
+    guess = colors_to_code(['Red', 'Blue', 'Green', 'Green'])
+    candidates = [3, 17, 200]
+    assert list(score_candidates(guess, candidates)) == [feedback(code, guess) for code in candidates]
+    assert list(score_candidates(guess, [5])) == [feedback(5, guess)]
+
+
+def test_partition_sizes_sum():
+    guess = colors_to_code(['Red', 'Red', 'Green', 'Yellow'])
+    assert sum(partition_sizes(guess, range(CODES_COUNT)).values()) == CODES_COUNT
+
+
+def test_filter_candidates():
+    secret = colors_to_code(['Blue', 'Green', 'Red', 'Red'])
+    guess = colors_to_code(['Red', 'Red', 'Green', 'Yellow'])
+    candidates = filter_candidates(range(CODES_COUNT), guess, feedback(secret, guess))
+    assert secret in candidates
+    assert all(feedback(code, guess) == feedback(secret, guess) for code in candidates)
+
+
+def test_consistent_codes_no_history():
+    assert consistent_codes([]) == list(range(CODES_COUNT))
+
+
+def test_minimax_guess_single_candidate():
+    assert minimax_guess([42]) == 42
+
+
+def test_minimax_solves_every_secret():
+    for secret in range(CODES_COUNT):
+        history = []
+        for _ in range(5):
+            guess = minimax_guess(consistent_codes(history))
+            if feedback(secret, guess) == SOLVED:
+                break
+            history.append((guess, feedback(secret, guess)))
+        else:
+            assert False, f'secret {secret} not solved'
+
+
+def test_entropy_solves_every_secret():
+    for secret in range(CODES_COUNT):
+        history = []
+        for _ in range(6):
+            guess = entropy_guess(consistent_codes(history))
+            if feedback(secret, guess) == SOLVED:
+                break
+            history.append((guess, feedback(secret, guess)))
+        else:
+            assert False, f'secret {secret} not solved'
+
+
+def test_entropy_guess_respects_budget(monkeypatch):
+    geometry = get_geometry(6, 9)
+    calls = []
+    entropy_key = mastermind_solver._entropy_key
+
+    def counted(*args):
+        calls.append(args[1])
+        return entropy_key(*args)
+    clock = iter(range(1000))
+    monkeypatch.setattr(mastermind_solver, '_entropy_key', counted)
+    monkeypatch.setattr(mastermind_solver, 'time', SimpleNamespace(time=lambda: next(clock)))
+    guess = entropy_guess(range(geometry.codes_count), geometry=geometry, budget=2.5)
+    assert len(calls) == 3
+    assert guess in calls
+
+
+def test_guess_scorer_matches_local_scoring():
+    geometry = get_geometry(5, 8)
+    candidates = consistent_codes([(geometry.colors_to_code(['Red', 'Red', 'Green', 'Blue', 'Orange']), 6)], geometry)
+    with GuessScorer(processes=2, chunk_size=50) as scorer:
+        assert entropy_guess(candidates, geometry=geometry, scorer=scorer) == entropy_guess(candidates, geometry=geometry)
+        assert entropy_guess(range(geometry.codes_count), geometry=geometry, scorer=scorer) == entropy_guess(
+            range(geometry.codes_count), geometry=geometry
+        )
+
+
+def test_candidate_set_narrow():
+    candidates = CandidateSet()
+    assert len(candidates) == CODES_COUNT
+    secret = colors_to_code(['Blue', 'Green', 'Red', 'Red'])
+    guess = colors_to_code(['Red', 'Red', 'Green', 'Yellow'])
+    removed = candidates.narrow(guess, feedback(secret, guess))
+    assert removed == CODES_COUNT - len(candidates)
+    assert secret in candidates
+    assert list(candidates) == consistent_codes(candidates.history)
+
+
+def test_candidate_set_record_is_lazy(monkeypatch):
+    calls = []
+    filter_candidates = mastermind_solver.filter_candidates
+
+    def counted(*args):
+        calls.append(args)
+        return filter_candidates(*args)
+    monkeypatch.setattr(mastermind_solver, 'filter_candidates', counted)
+    candidates = CandidateSet()
+    secret = colors_to_code(['Blue', 'Green', 'Red', 'Red'])
+    guesses = [colors_to_code(['Red', 'Red', 'Green', 'Yellow']), colors_to_code(['Blue', 'Blue', 'Red', 'Green'])]
+    for guess in guesses:
+        candidates.record(guess, feedback(secret, guess))
+    assert not calls
+    assert len(candidates.history) == 2
+    codes = list(candidates)
+    assert secret in candidates and len(calls) == 2
+    assert codes == consistent_codes(candidates.history)
+
+
+def test_candidate_set_reset():
+    candidates = CandidateSet()
+    candidates.narrow(0, SOLVED)
+    assert list(candidates) == [0]
+    candidates.reset()
+    assert len(candidates) == CODES_COUNT
+    assert candidates.history == []
+
+
+def test_history_key_ignores_order_of_rows():
+    geometry = get_geometry()
+    assert history_key('MINIMAX', geometry, [(5, 1), (20, 3)]) == history_key('MINIMAX', geometry, [(20, 3), (5, 1)])
+    assert history_key('MINIMAX', geometry, [(5, 1)]) != history_key('ENTROPY', geometry, [(5, 1)])
+    assert history_key('MINIMAX', geometry, [(5, 1)]) != history_key('MINIMAX', get_geometry(5, 8), [(5, 1)])
+
+
+def test_solver_cache_evicts_least_recently_used():
+    cache = SolverCache(capacity=2)
+    assert cache.guess('a', lambda: 1) == 1
+    assert cache.guess('b', lambda: 2) == 2
+    assert cache.guess('a', lambda: 0) == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.stats() == {'size': 2, 'capacity': 2, 'hits': 2, 'misses': 3, 'evictions': 1}
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0
+
+
+def test_solver_cache_shared_by_threads():
+    cache = SolverCache(capacity=50)
+
+    def work(offset):
+        for index in range(2000):
+            key = (index + offset) % 100
+            assert cache.guess(key, lambda: key * 2) == key * 2
+
+    threads = [Thread(target=work, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 50
+    assert cache.hits + cache.misses == 16000
+    assert cache.misses >= cache.evictions + len(cache)
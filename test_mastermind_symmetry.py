@@ -0,0 +1,65 @@
+import random
+from mastermind_codes import get_geometry
+from mastermind_solver import consistent_codes, entropy_guess, minimax_guess
+from mastermind_symmetry import Transform, canonicalize, prune_symmetric_guesses
+
+
+GEOMETRY = get_geometry(4, 6)
+
+
+def _random_transform(generator, geometry):
+    positions = list(range(geometry.row_length))
+    colors = list(range(len(geometry.colors)))
+    generator.shuffle(positions)
+    generator.shuffle(colors)
+    return Transform(geometry, positions, colors)
+
+
+def _random_history(generator, geometry, length):
+    secret = generator.randrange(geometry.codes_count)
+    guesses = [generator.randrange(geometry.codes_count) for _ in range(length)]
+    return [(guess, geometry.feedback(secret, guess)) for guess in guesses]
+
+
+def test_transform_keeps_feedback():
+    generator = random.Random(1)
+    transform = _random_transform(generator, GEOMETRY)
+    for _ in range(200):
+        secret, guess = generator.randrange(GEOMETRY.codes_count), generator.randrange(GEOMETRY.codes_count)
+        assert GEOMETRY.feedback(transform.apply(secret), transform.apply(guess)) == GEOMETRY.feedback(secret, guess)
+        assert transform.invert(transform.apply(guess)) == guess
+
+
+def test_symmetric_histories_share_canonical_history():
+    generator = random.Random(2)
+    for length in range(4):
+        history = _random_history(generator, GEOMETRY, length)
+        canonical, transform = canonicalize(history, GEOMETRY)
+        assert [(transform.apply(guess), guess_feedback) for guess, guess_feedback in history] == canonical
+        symmetric = _random_transform(generator, GEOMETRY)
+        moved = [(symmetric.apply(guess), guess_feedback) for guess, guess_feedback in history]
+        assert canonicalize(moved, GEOMETRY)[0] == canonical
+
+
+def test_first_guesses_pruned_to_classes():
+    guesses = prune_symmetric_guesses(range(GEOMETRY.codes_count), [], GEOMETRY)
+    assert [GEOMETRY.code_to_colors(guess) for guess in guesses] == [
+        ['RED', 'RED', 'RED', 'RED'],
+        ['RED', 'RED', 'RED', 'GREEN'],
+        ['RED', 'RED', 'GREEN', 'GREEN'],
+        ['RED', 'RED', 'GREEN', 'YELLOW'],
+        ['RED', 'GREEN', 'YELLOW', 'BLUE']
+    ]
+
+
+def test_pruning_keeps_chosen_guess():
+    generator = random.Random(3)
+    for _ in range(10):
+        history = _random_history(generator, GEOMETRY, generator.randrange(3))
+        candidates = consistent_codes(history, GEOMETRY)
+        assert minimax_guess(candidates, geometry=GEOMETRY, history=history) == minimax_guess(
+            candidates, geometry=GEOMETRY
+        )
+        assert entropy_guess(candidates, geometry=GEOMETRY, history=history) == entropy_guess(
+            candidates, geometry=GEOMETRY
+        )
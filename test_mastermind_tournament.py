@@ -0,0 +1,58 @@
+from mastermind_tournament import (
+    PlayerSpec,
+    TournamentResult,
+    InvalidPlayersNamesError,
+    play_games,
+    run_match,
+    run_tournament
+)
+from mastermind_classes import Bot, BotSmart, Game, Gamemode
+from mastermind_codes import get_geometry
+from pytest import raises
+
+
+def test_player_spec_create():
+    game = Game(Gamemode.PVE, 1)
+    bot_smart = PlayerSpec(BotSmart, 'Smart').create(game)
+    assert type(bot_smart) == BotSmart
+    assert type(PlayerSpec(Bot, 'Bot').create(game)) == Bot
+
+
+def test_play_games():
+    result = play_games(PlayerSpec(Bot, 'A'), PlayerSpec(BotSmart, 'B'), 20, seed=1)
+    assert result.games == 20
+    assert sum(result.wins.values()) + result.ties == 20
+    assert result.wins['B'] > result.wins['A']
+
+
+def test_play_games_same_names():
+    with raises(InvalidPlayersNamesError):
+        play_games(PlayerSpec(Bot, 'A'), PlayerSpec(Bot, 'A'), 1)
+
+
+def test_result_merge():
+    result = TournamentResult(2, {'A': 3, 'B': 4}, {'A': 1, 'B': 0}, 1)
+    result.merge(TournamentResult(1, {'A': 2, 'B': 5}, {'A': 0, 'B': 1}, 0))
+    assert result == TournamentResult(3, {'A': 5, 'B': 9}, {'A': 1, 'B': 1}, 1)
+
+
+def test_run_match_deterministic():
+    specs = (PlayerSpec(Bot, 'A'), PlayerSpec(Bot, 'B'))
+    result1 = run_match(*specs, 40, processes=1, chunk_size=10, seed=5)
+    result2 = run_match(*specs, 40, processes=2, chunk_size=10, seed=5)
+    assert result1 == result2
+    assert result1.games == 40
+
+
+def test_run_tournament_round_robin():
+    specs = [PlayerSpec(Bot, 'A'), PlayerSpec(Bot, 'B'), PlayerSpec(BotSmart, 'C')]
+    result = run_tournament(specs, 10, processes=2, chunk_size=5)
+    assert result.games == 30
+    assert result.ranking()[0] == 'C'
+
+
+def test_run_match_geometry():
+    specs = (PlayerSpec(Bot, 'A'), PlayerSpec(BotSmart, 'B'))
+    result = run_match(*specs, 4, processes=2, chunk_size=2, geometry=get_geometry(5, 6))
+    assert result.games == 4
+    assert result.wins['B'] >= result.wins['A']
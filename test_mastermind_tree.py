@@ -0,0 +1,75 @@
+from mastermind_classes import Game, Gamemode, Bot, BotSmart, Strategy
+from mastermind_codes import get_geometry
+from mastermind_solver import minimax_guess
+from mastermind_tree import StrategyTree, InvalidTreeError, TreeVerificationError, _first_guesses
+from pytest import raises
+
+
+GEOMETRY = get_geometry(3, 4)
+
+
+def _average(histogram):
+    return sum(turns * count for turns, count in histogram.items()) / sum(histogram.values())
+
+
+def test_first_guesses():
+    assert [get_geometry().code_to_colors(code) for code in _first_guesses(get_geometry())] == [
+        ['RED', 'RED', 'RED', 'RED'],
+        ['RED', 'RED', 'RED', 'GREEN'],
+        ['RED', 'RED', 'GREEN', 'GREEN'],
+        ['RED', 'RED', 'GREEN', 'YELLOW'],
+        ['RED', 'GREEN', 'YELLOW', 'BLUE']
+    ]
+
+
+def test_tree_solves_every_code():
+    tree = StrategyTree.build(GEOMETRY)
+    histogram = tree.verify(amount_of_rows=10)
+    assert sum(histogram.values()) == GEOMETRY.codes_count
+    assert max(histogram) <= 4
+    with raises(TreeVerificationError):
+        tree.verify(amount_of_rows=2)
+
+
+def test_tree_not_worse_than_minimax():
+    histogram = StrategyTree.build(GEOMETRY).verify()
+    minimax = []
+    for secret in range(GEOMETRY.codes_count):
+        candidates = range(GEOMETRY.codes_count)
+        for turn in range(1, 11):
+            guess = minimax_guess(candidates, geometry=GEOMETRY)
+            guess_feedback = GEOMETRY.feedback(secret, guess)
+            if guess_feedback == GEOMETRY.solved:
+                minimax.append(turn)
+                break
+            candidates = [code for code in candidates if GEOMETRY.feedback(code, guess) == guess_feedback]
+    assert _average(histogram) <= sum(minimax) / len(minimax)
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'tree.bin')
+    tree = StrategyTree.build(GEOMETRY)
+    tree.save(path)
+    loaded = StrategyTree.load(path)
+    assert loaded.geometry == GEOMETRY
+    assert loaded.guesses == tree.guesses
+    assert loaded.children == tree.children
+    (tmp_path / 'broken.bin').write_bytes(b'MMTREE1\0broken')
+    with raises(InvalidTreeError):
+        StrategyTree.load(str(tmp_path / 'broken.bin'))
+
+
+def test_bot_smart_walks_tree(monkeypatch):
+    tree = StrategyTree.build(GEOMETRY)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('search should not run')
+
+    monkeypatch.setattr('mastermind_classes.minimax_guess', fail)
+    for secret in range(0, GEOMETRY.codes_count, 5):
+        game = Game(Gamemode.PVE_SMART, 1, geometry=GEOMETRY)
+        bot = BotSmart('Bot Smart', game, Strategy.TREE, tree=tree)
+        game.players_list = [Bot('Bot', GEOMETRY), bot]
+        result = game.play_turn(game.players_list[0], bot, get_code=lambda player: GEOMETRY.code_to_colors(secret))
+        assert result.guessed
+        assert len(result.guesses) <= 4